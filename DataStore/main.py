@@ -0,0 +1,82 @@
+import argparse
+import os
+from typing import Any, Dict, List, cast
+
+from Fun.data.columnar import ColumnarStore, data_source_entries
+from Fun.utils import colors, pretty
+
+
+def args_parse() -> Dict[str, Any]:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--operations",
+        metavar="",
+        nargs="*",
+        default=["convert", "verify"],
+        choices=["convert", "verify"],
+        help="operations",
+    )
+
+    parser.add_argument(
+        "--symbols",
+        metavar="",
+        nargs="*",
+        type=str,
+        help="symbols, every symbol under data_source when omitted",
+    )
+
+    args = vars(parser.parse_args())
+
+    assert args.get("operations") is not None
+
+    pretty.color_print(
+        colors.PAPER_ORANGE_300,
+        f"operations input: {', '.join(cast(List[str], args.get('operations')))}",
+    )
+
+    pretty.color_print(colors.PAPER_ORANGE_300, f"symbols input: {args.get('symbols')}")
+
+    return args
+
+
+if __name__ == "__main__":
+
+    args = args_parse()
+
+    ops = args.get("operations")
+    assert ops is not None
+    assert len(ops) != 0
+
+    symbols = args.get("symbols")
+    if symbols is not None:
+        symbols = [s.lower() for s in symbols]
+
+    root = os.path.join(cast(str, os.getenv("HOME")), "Documents", "data_source")
+
+    store = ColumnarStore()
+
+    failed = 0
+    for source, symbol, frequency in data_source_entries(root):
+        if symbols is not None and symbol.lower() not in symbols:
+            continue
+
+        name = f"{type(source).__name__}: {symbol.upper()} ({frequency})"
+
+        try:
+            if "convert" in ops:
+                pretty.color_print(colors.PAPER_LIGHT_BLUE_300, f"converting {name}")
+                store.convert(source, symbol, frequency)
+
+            if "verify" in ops:
+                if store.verify(source, symbol, frequency):
+                    pretty.color_print(colors.PAPER_LIGHT_GREEN_300, f"verified {name}")
+                else:
+                    failed += 1
+
+        except (FileNotFoundError, ValueError, KeyError) as err:
+            failed += 1
+            pretty.color_print(colors.PAPER_RED_400, f"{name}: {err}")
+
+    if failed > 0:
+        pretty.color_print(colors.PAPER_RED_400, f"{failed} symbols failed")
@@ -3,12 +3,16 @@ import re
 from datetime import datetime
 from typing import Iterable, NewType, Optional
 
+from Fun.data.barchart import BarchartContract
+from Fun.data.source import DAILY
+from Fun.futures.catalog import ContractCatalog
 from Fun.futures.contract import (
     ALL_CONTRACT_MONTHS,
     CONTRACT_MONTHS,
     EVEN_CONTRACT_MONTHS,
     FINANCIAL_CONTRACT_MONTHS,
 )
+from Fun.futures.prebuild import prebuild
 from Fun.utils import colors, pretty
 
 from Download.processor import Processor
@@ -159,6 +163,8 @@ class BarchartFuturesProcessor(Processor):
             )
 
     def check(self) -> None:
+        catalog = ContractCatalog(root=self._tar)
+
         months: CONTRACT_MONTHS
         for symbol in self._symbols:
             if symbol == "cl":
@@ -168,17 +174,50 @@ class BarchartFuturesProcessor(Processor):
             else:
                 months = FINANCIAL_CONTRACT_MONTHS
 
+            existing = set(
+                catalog.between(
+                    BarchartContract(),
+                    symbol,
+                    DAILY,
+                    datetime(self._start, 1, 1),
+                    datetime(self._end, 12, 1),
+                )
+            )
+
             for y in range(self._start, self._end + 1):
                 for m in months:
                     code = f"{symbol}{m}{y % 100:02}"
 
                     tar = os.path.join(self._tar, "continuous", code[:2], f"{code}.csv")
 
-                    if not os.path.exists(tar):
+                    if code not in existing:
                         pretty.color_print(
                             colors.PAPER_PINK_300, f"missing files: {tar}"
                         )
 
+    def prebuild(self) -> None:
+        # the links of the charts of the day built ahead of the first chart,
+        # every symbol in a process of its own
+        reports = prebuild(self._symbols)
+
+        failed = 0
+        for report in reports:
+            color = colors.PAPER_LIGHT_GREEN_300
+            if len(report.failed) > 0:
+                color = colors.PAPER_AMBER_300
+                failed += 1
+
+            pretty.color_print(
+                color,
+                f"prebuilt {report.symbol.upper()} in {report.seconds:.2f}s, "
+                f"{report.contracts} contracts, "
+                f"{report.quote_hits} cache hits, {report.quote_stores} stored, "
+                f"failed frequencies: {report.failed}",
+            )
+
+        if failed > 0:
+            pretty.color_print(colors.PAPER_RED_400, f"{failed} symbols failed")
+
 
 class BarchartStocksProcessor(Processor):
     def __init__(
@@ -18,7 +18,7 @@ def args_parse() -> Dict[str, Any]:
         metavar="",
         nargs="*",
         default=["download", "rename"],
-        choices=["download", "rename", "check"],
+        choices=["download", "rename", "check", "prebuild"],
         help="operations",
     )
 
@@ -88,3 +88,5 @@ if __name__ == "__main__":
             p.rename()
         if "check" in ops:
             p.check()
+        if "prebuild" in ops:
+            p.prebuild()
@@ -49,3 +49,7 @@ class Processor(metaclass=ABCMeta):
     @abstractmethod
     def check(self) -> None:
         raise NotImplementedError
+
+    def prebuild(self) -> None:
+        # nothing is read ahead of the charts unless a processor says so
+        return
@@ -12,7 +12,7 @@ from Fun.chart.cache import QuotesCache
 from Fun.chart.setting import Setting
 from Fun.chart.static import TradingChart
 from Fun.chart.theme import MagicalTheme, Theme
-from Fun.data.barchart import Barchart
+from Fun.data import registry
 from Fun.data.source import (
     DAILY,
     FREQUENCY,
@@ -21,11 +21,6 @@ from Fun.data.source import (
     INTRADAY_60MINUTES,
     MONTHLY,
     WEEKLY,
-    CoinAPI,
-    DataSource,
-    InvestingCom,
-    StockCharts,
-    Yahoo,
 )
 from Fun.futures.continuous import ContinuousContract
 from Fun.plotter.advance_decline import AdvanceDeclineLine
@@ -49,6 +44,10 @@ from Fun.plotter.study import NoteMarker, StudyZone, read_notes
 from Fun.plotter.volatility import VolatilityRealBodyContraction, VolatilitySummary
 from Fun.plotter.volume import Volume
 from Fun.plotter.zone import VolatilityZone
+from Fun.utils import timing
+
+# the bars an intraday link reads on both sides of the range of the chart
+_INTRADAY_PADDING = timedelta(days=14)
 
 
 class CandleSticksPreset:
@@ -200,194 +199,55 @@ class CandleSticksPreset:
 
         return exstime, exetime
 
+    def _intraday(self) -> bool:
+        return self._frequency in (
+            INTRADAY_15MINUTES,
+            INTRADAY_30MINUTES,
+            INTRADAY_60MINUTES,
+        )
+
     def _read_chart_data(self) -> QuotesCache:
         print("network")
 
-        src: Optional[DataSource] = None
-
-        if self._symbol in (
-            # "vix",
-            # "vxn",
-            "ovx",
-            "gvz",
-        ):
-            src = Yahoo()
-
-        elif self._symbol in ("rut", "sml", "dji"):
-            src = Yahoo()
-
-        elif self._symbol in (
-            # "vstx",
-            "jniv",
-            "vhsi",
-            "vxfxi",
-            "nk400",
-        ):
-            src = InvestingCom()
-
-        elif self._symbol in (
-            # "usd",
-            "vix",
-            "vxn",
-            "vstx",
-            "dxy",
-            "jpyusd",
-            "usdjpy",
-            "eurusd",
-            "gbpusd",
-            "chfusd",
-            "usdchf",
-            "audusd",
-            "cadusd",
-            "usdcad",
-            "nzdusd",
-            "eurjpy",
-            "eurgbp",
-            "euraud",
-            "eurcad",
-            "eurchf",
-            "gbpjpy",
-            "audjpy",
-            "cadjpy",
-            "nzdjpy",
-        ):
-            src = Barchart()
-
-        elif self._symbol in (
-            "btcusd",
-            "ethusd",
-            "ltcusd",
-            "xrpusd",
-            "bchusd",
-            "usdcusd",
-        ):
-            src = CoinAPI()
-
-        elif self._symbol in (
-            "linkusd",
-            "adausd",
-            "dotusd",
-            "xlmusd",
-            "eosusd",
-            "trxusd",
-            "uniusd",
-        ):
-            src = CoinAPI()
-
-        elif self._symbol in ("vle", "rvx", "tyvix"):
-            src = StockCharts()
-
-        elif self._symbol in (
-            "spx",
-            "ndx",
-            "compq",
-            "nya",
-            "nikk",
-            "ezu",
-            "eem",
-            "hsi",
-            "fxi",
-            "ndxew",
-        ):
-            src = Yahoo()
-
-        elif self._symbol in (
-            "spxew",
-            "smlew",
-            "midew",
-            "topix",
-        ):
-            src = Barchart()
-
-        elif self._symbol in (
-            "icsh",
-            "jpst",
-            "gsy",
-            "near",
-            "shv",
-            "flot",
-            "hylb",
-            "ushy",
-            "faln",
-            "shyg",
-            "hyg",
-            "sjnk",
-            "jnk",
-            "bkln",
-            "srln",
-            "emb",
-            "pcy",
-            "emhy",
-            "lqd",
-            "mbb",
-            "mub",
-            "igsb",
-            "igib",
-            "shy",
-            "iei",
-            "ief",
-            "tlh",
-            "tlt",
-            "govt",
-            "iyr",
-            "reet",
-            "rem",
-        ):
-            # src = AlphaVantage()
-            src = Yahoo()
-
-        elif self._symbol in (
-            "pff",
-            "pgx",
-            "pgf",
-            "hdv",
-            "dvy",
-            "dvye",
-            "idv",
-            "spyd",
-            "sphd",
-            "schd",
-            "vym",
-            "sdy",
-            "dgro",
-        ):
-            src = Yahoo()
-
-        elif self._symbol in (
-            "fedfunds",
-            "ustm1",
-            "ustm3",
-            "ustm6",
-            "usty2",
-            "usty5",
-            "usty10",
-            "usty30",
-        ):
-            src = Barchart()
-
-        df: pd.DataFrame
-        if src is None:
-            df = ContinuousContract().read(
-                start=self._exstime,
-                end=self._exetime,
-                symbol=self._symbol,
-                frequency=self._frequency,
-            )
-        else:
-            # if type(src) is not CoinAPI:
-            assert self._frequency in (DAILY, WEEKLY, MONTHLY)
+        entry = registry.lookup(self._symbol)
+
+        # the range the quotes read are trusted to cover
+        self._window = (self._exstime, self._exetime)
+
+        with timing.span("chart_data", symbol=self._symbol, frequency=self._frequency):
+            df: pd.DataFrame
+            if entry.source is None:
+                # an intraday chart only reads the contracts around its own
+                # range, with room for the bars on both sides of it
+                window = None
+                if self._intraday():
+                    window = (
+                        self._stime - _INTRADAY_PADDING,
+                        self._etime + _INTRADAY_PADDING,
+                    )
+                    self._window = (self._stime, window[1])
+
+                df = ContinuousContract().read(
+                    start=self._exstime,
+                    end=self._exetime,
+                    symbol=self._symbol,
+                    frequency=self._frequency,
+                    window=window,
+                )
+            else:
+                assert self._frequency in entry.frequencies
 
-            df = src.read(
-                start=self._exstime,
-                end=self._exetime,
-                symbol=self._symbol,
-                frequency=self._frequency,
-            )
+                df = registry.source(entry.source).read(
+                    start=self._exstime,
+                    end=self._exetime,
+                    symbol=self._symbol,
+                    frequency=self._frequency,
+                )
 
-        assert df is not None
+            assert df is not None
 
-        cache = QuotesCache(df, self._stime, self._etime, minimum_bars=130)
-        return cache
+            cache = QuotesCache(df, self._stime, self._etime, minimum_bars=130)
+            return cache
 
     def _read_note(self, dt: str) -> Optional[str]:
 
@@ -487,19 +347,19 @@ class CandleSticksPreset:
 
         stime, etime = self._time_range(dtime)
 
-        if (
-            stime <= self._exstime
-            or stime >= self._exetime
-            or etime <= self._exstime
-            or etime >= self._exetime
-        ):
-            self._stime = stime
-            self._etime = etime
-            self._exstime, self._exetime = self._extime_range()
-            self._cache = self._read_chart_data()
+        lower, upper = self._window
+
+        if stime <= lower or stime >= upper or etime <= lower or etime >= upper:
+            self._relink(stime, etime)
         else:
             self._cache.time_slice(stime, etime)
 
+    def _relink(self, stime: datetime, etime: datetime) -> None:
+        self._stime = stime
+        self._etime = etime
+        self._exstime, self._exetime = self._extime_range()
+        self._cache = self._read_chart_data()
+
     def stime(self) -> datetime:
         return cast(datetime, self._cache.stime().to_pydatetime())
 
@@ -513,9 +373,25 @@ class CandleSticksPreset:
         return cast(datetime, self._cache.exetime().to_pydatetime())
 
     def forward(self) -> bool:
+        if self._cache.forward():
+            return True
+
+        # an intraday link ends shortly after the range it was read for
+        if self._window[1] >= self._exetime:
+            return False
+
+        self._relink(self.stime(), self.etime())
         return self._cache.forward()
 
     def backward(self) -> bool:
+        if self._cache.backward():
+            return True
+
+        # an intraday link starts in front of the range it was read for
+        if self._window[0] <= self._exstime:
+            return False
+
+        self._relink(self.stime(), self.etime())
         return self._cache.backward()
 
     def make_controller(
@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta
+
+from Fun.chart.preset import CandleSticksPreset
+from Fun.data.source import INTRADAY_60MINUTES
+from Fun.futures.continuous import ContinuousContract
+from Fun.utils.testing import HomeTestCase, write_contracts
+
+TODAY = datetime.combine(datetime.now().date(), datetime.min.time())
+
+# quarterly es contracts from three years ago up to the one trading today
+EXPIRATIONS = {
+    f"es{m}{y % 100:02d}": f"{y}{n:02d}15"
+    for y in range(TODAY.year - 3, TODAY.year + 2)
+    for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+    if datetime(y, n, 15) <= datetime(TODAY.year + 1, TODAY.month, 1)
+}
+
+
+class TestIntradayPreset(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+        write_contracts(self._home.name, "es", EXPIRATIONS, periods=4800, minutes=60)
+
+        self._preset = CandleSticksPreset(TODAY, "es", INTRADAY_60MINUTES)
+
+    def _full(self):
+        return ContinuousContract().read(
+            start=self._preset._exstime,
+            end=self._preset._exetime,
+            symbol="es",
+            frequency=INTRADAY_60MINUTES,
+        )
+
+    def test_backward(self):
+        full = self._full()
+
+        first = self._preset.full_quotes().index[0]
+
+        # stepping back past the first bar linked for the initial range
+        stime = self._preset.stime()
+        while stime >= first:
+            self.assertTrue(self._preset.backward())
+
+            self.assertLess(self._preset.stime(), stime)
+            stime = self._preset.stime()
+
+        self.assertTrue(
+            self._preset.quotes().equals(full.loc[stime : self._preset.etime()])
+        )
+
+    def test_time_slice(self):
+        full = self._full()
+
+        # in front of the linked window, within the extended range
+        first = self._preset.full_quotes().index[0].to_pydatetime()
+
+        dtime = datetime.combine(first.date(), datetime.min.time())
+        dtime -= timedelta(days=30)
+        self.assertGreater(dtime, self._preset._exstime)
+
+        self._preset.time_slice(dtime)
+
+        self.assertEqual(
+            self._preset.etime(), full.loc[: dtime.replace(hour=16)].index[-1]
+        )
+        self.assertTrue(
+            self._preset.quotes().equals(
+                full.loc[self._preset.stime() : self._preset.etime()]
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from Fun.chart.setting import Setting
 from Fun.chart.theme import Theme
 from Fun.chart.ticker import StepTicker, Ticker, TimeTicker
 from Fun.plotter.plotter import Plotter
+from Fun.utils import timing
 from matplotlib import axes, figure
 
 matplotlib.use("agg")
@@ -109,40 +110,41 @@ class TradingChart(base.ChartFactory):
         interactive: bool = False,
     ) -> None:
 
-        fig, ax = plt.subplots(
-            figsize=self._figsize,
-            facecolor=self._theme.get_color("background"),
-            tight_layout=False,
-        )
+        with timing.span("render", plotters=len(plotters or [])):
+            fig, ax = plt.subplots(
+                figsize=self._figsize,
+                facecolor=self._theme.get_color("background"),
+                tight_layout=False,
+            )
 
-        ax.set_yscale(self._scale)
+            ax.set_yscale(self._scale)
 
-        self._setup_general(fig, ax)
-        self._setup_xticks(ax, TimeTicker(self._quotes))
-        self._setup_yticks(ax, StepTicker(*self.chart_yrange()))
+            self._setup_general(fig, ax)
+            self._setup_xticks(ax, TimeTicker(self._quotes))
+            self._setup_yticks(ax, StepTicker(*self.chart_yrange()))
 
-        self._figure = fig
-        self._ax = ax
+            self._figure = fig
+            self._ax = ax
 
-        ax.set_xlim(*self.chart_xrange())
-        ax.set_ylim(*self.chart_yrange())
+            ax.set_xlim(*self.chart_xrange())
+            ax.set_ylim(*self.chart_yrange())
 
-        if plotters is not None and len(plotters) > 0:
-            for p in plotters:
-                p.plot(ax)
+            if plotters is not None and len(plotters) > 0:
+                for p in plotters:
+                    p.plot(ax)
 
-        ax.autoscale_view()
+            ax.autoscale_view()
 
-        plt.tight_layout()
+            plt.tight_layout()
 
-        if interactive:
-            plt.show()
-        else:
-            assert output is not None
-            plt.savefig(
-                output,
-                dpi=100,
-                facecolor=self._theme.get_color("background"),
-            )
+            if interactive:
+                plt.show()
+            else:
+                assert output is not None
+                plt.savefig(
+                    output,
+                    dpi=100,
+                    facecolor=self._theme.get_color("background"),
+                )
 
-        plt.close(fig)
+            plt.close(fig)
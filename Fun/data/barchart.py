@@ -1,8 +1,13 @@
+import csv
+import io
 import os
 import re
 from datetime import datetime, timedelta
+from typing import Any, BinaryIO, List, Optional, Tuple
+
 import numpy as np
 import pandas as pd
+from Fun.data import intraday
 from Fun.data.source import (
     DAILY,
     FREQUENCY,
@@ -13,9 +18,19 @@ from Fun.data.source import (
     WEEKLY,
     DataSource,
 )
+from Fun.data.timestamp import TimestampFormat
 
 
 class BarchartOnDemand(DataSource):
+    _timestamp_formats = [
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}-\d{2}:\d{2}$",
+            "%Y-%m-%dT%H:%M:%S",
+            length=25,
+            width=19,
+        ),
+    ]
+
     def _url(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> str:
@@ -52,6 +67,11 @@ class BarchartOnDemand(DataSource):
 
         return datetime.strptime(m.group(1), r"%Y-%m-%dT%H:%M:%S")
 
+    def _source_files(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> Optional[List[str]]:
+        return None
+
     def _interval(self, freq: FREQUENCY) -> str:
         if freq == INTRADAY_60MINUTES:
             return "60"
@@ -79,6 +99,80 @@ class BarchartOnDemand(DataSource):
 
 
 class Barchart(DataSource):
+    _timestamp_columns = ("Time", "Date Time", "time")
+
+    # columns barchart exports that never make it into the quotes
+    _dropped_columns = (
+        # barchart historic
+        "Change",
+        "%Chg",
+        # barchart ondemand
+        "symbol",
+        "tradingDay",
+        # tradingview
+        "Volume MA",
+    )
+
+    _renamed_columns = {
+        # barchart historic
+        "Time": "timestamp",
+        "Open Int": "open interest",
+        "Last": "close",
+        # barchart interactive
+        "Date Time": "timestamp",
+        # barchart ondemand
+        "openInterest": "open interest",
+        # tradingview
+        "time": "timestamp",
+        "Volume": "volume",
+    }
+
+    _footer_pattern = re.compile(
+        r"""["']*\s*Downloaded\s*from\s*Barchart\.com\s*as\s*of\s*\d{2}-\d{2}-\d{4}\s*\d{2}:\d{2}[ap]m\s*C[SD]T["']*"""
+    )
+
+    # bytes read from either end of a file to find the header and the footer
+    _sniff_size = 4096
+
+    _timestamp_formats = [
+        # barchart historic
+        TimestampFormat(r"^\d{2}/\d{2}/\d{4}$", "%m/%d/%Y", length=10),
+        TimestampFormat(r"^\d{2}/\d{2}/\d{2}$", "%m/%d/%y", length=8),
+        # barchart historic hourly
+        TimestampFormat(
+            r"^\d{2}/\d{2}/\d{4}\s\d{2}:\d{2}$",
+            "%m/%d/%Y",
+            split=10,
+            time_fmt=" %H:%M",
+            length=16,
+        ),
+        # barchart interactive
+        TimestampFormat(r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d", length=10),
+        # barchart interactive hourly
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}$",
+            "%Y-%m-%d",
+            split=10,
+            time_fmt=" %H:%M:%S",
+            length=19,
+        ),
+        # barchart ondemand
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}-\d{2}:\d{2}$",
+            "%Y-%m-%dT%H:%M:%S",
+            length=25,
+            width=19,
+        ),
+        # tradingview
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:00Z$",
+            "%Y-%m-%dT%H:%M:%SZ",
+            length=20,
+            offset=timedelta(hours=-6),
+            normalize=True,
+        ),
+    ]
+
     def _timestamp_preprocessing(self, x: str) -> datetime:
 
         # barchart historic
@@ -116,60 +210,95 @@ class Barchart(DataSource):
     ) -> str:
         return os.path.join("barchart", f"{symbol}.csv")
 
-    def _read_data(
-        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
-    ) -> pd.DataFrame:
+    def _sniff(self, f: BinaryIO) -> Tuple[List[str], int, int]:
+        size = os.fstat(f.fileno()).st_size
 
-        # with open(self._localfile(self._url(start, end, symbol, DAILY)), "r") as f:
-        with open(self._localfile(self._url(start, end, symbol, frequency)), "r") as f:
-            content = f.readlines()
-
-        if (
-            # re.match(
-            # r"""["']*Symbol:\s*\w+\d*["']*,+["']*Study:\s*\w+["']*,""",
-            # content[0].strip(),
-            # )
-            # is not None
-            "Study:" in content[0].strip()
-            and "Symbol:" in content[0].strip()
-        ):
-            df = pd.read_csv(
-                self._localfile(self._url(start, end, symbol, DAILY)), header=1
-            )
-        else:
-            df = pd.read_csv(self._localfile(self._url(start, end, symbol, DAILY)))
+        head = b""
+        while head.count(b"\n") < 2 and len(head) < size:
+            chunk = f.read(self._sniff_size)
+            if len(chunk) == 0:
+                break
+            head += chunk
 
-        if (
-            re.match(
-                r"""["']*\s*Downloaded\s*from\s*Barchart\.com\s*as\s*of\s*\d{2}-\d{2}-\d{4}\s*\d{2}:\d{2}[ap]m\s*C[SD]T["']*""",
-                content[-1].strip(),
-            )
-            is not None
-        ):
-            df = df.drop(df.tail(1).index)
+        lines = head.decode("utf-8", errors="replace").splitlines()
+        if len(lines) == 0:
+            raise ValueError("empty barchart file")
 
-        df = df.fillna(0)
+        header = 0
+        if "Study:" in lines[0] and "Symbol:" in lines[0]:
+            header = 1
 
-        columns = df.columns
+        if len(lines) <= header:
+            raise ValueError("barchart file without column names")
 
-        # barchart historic
-        if "Change" in columns:
-            df = df.drop("Change", axis=1)
+        columns = [c.strip() for c in next(csv.reader([lines[header]]))]
 
-        if "%Chg" in columns:
-            df = df.drop("%Chg", axis=1)
+        f.seek(max(0, size - self._sniff_size))
+        tail = f.read()
 
-        # barchart ondemand
-        if "symbol" in columns:
-            df = df.drop("symbol", axis=1)
+        # the body ends right before the footer when there is one
+        stripped = tail.rstrip(b"\r\n")
+        begin = stripped.rfind(b"\n") + 1
+        last = stripped[begin:].decode("utf-8", errors="replace").strip()
 
-        if "tradingDay" in columns:
-            df = df.drop("tradingDay", axis=1)
+        limit = size
+        if self._footer_pattern.match(last) is not None:
+            limit = size - len(tail) + begin
 
-        if "Volume MA" in columns:
-            df = df.drop("Volume MA", axis=1)
+        f.seek(0)
 
-        return df
+        return columns, header, limit
+
+    def _read_data(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+
+        with open(self._localfile(self._url(start, end, symbol, frequency)), "rb") as f:
+            columns, header, limit = self._sniff(f)
+
+            usecols = [
+                i for i, c in enumerate(columns) if c not in self._dropped_columns
+            ]
+
+            dtype = {}
+            for i in usecols:
+                if columns[i] in self._timestamp_columns:
+                    dtype[columns[i]] = str
+                else:
+                    dtype[columns[i]] = np.float64
+
+            # the file is parsed once, the reader stops in front of the footer
+            body = io.BufferedReader(_BoundedReader(f, limit))
+
+            try:
+                df = self._read_csv(
+                    body,
+                    start,
+                    end,
+                    self._timestamp_columns,
+                    header=header,
+                    usecols=usecols,
+                    dtype=dtype,
+                )
+            except ValueError:
+                # values that are not numbers, let the parser infer the types
+                f.seek(0)
+                body = io.BufferedReader(_BoundedReader(f, limit))
+
+                df = self._read_csv(
+                    body,
+                    start,
+                    end,
+                    self._timestamp_columns,
+                    header=header,
+                    usecols=usecols,
+                )
+
+        df = df.fillna(0)
+
+        return df.rename(
+            columns={c: self._renamed_columns.get(c, c.lower()) for c in df.columns}
+        )
 
     def _additional_processing(self, df: pd.DataFrame) -> pd.DataFrame:
 
@@ -180,36 +309,31 @@ class Barchart(DataSource):
         return df
 
     def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        cols = {k: k.lower() for k in df.columns}
-
-        columns = df.columns
+        # columns are already renamed while reading
+        return df
 
-        # barchart historic
-        if "Time" in columns:
-            cols["Time"] = "timestamp"
 
-        if "Open Int" in columns:
-            cols["Open Int"] = "open interest"
+class _BoundedReader(io.RawIOBase):
+    def __init__(self, raw: BinaryIO, limit: int) -> None:
+        self._raw = raw
+        self._remaining = limit
 
-        if "Last" in columns:
-            cols["Last"] = "close"
+    def readable(self) -> bool:
+        return True
 
-        # barchart interactive
-        if "Date Time" in columns:
-            cols["Date Time"] = "timestamp"
+    def readinto(self, b: Any) -> int:
+        if self._remaining <= 0:
+            return 0
 
-        # barchart ondemand
-        if "openInterest" in columns:
-            cols["openInterest"] = "open interest"
+        view = memoryview(b)[: self._remaining]
+        n = self._raw.readinto(view)
 
-        # tradingview
-        if "time" in columns:
-            cols["time"] = "timestamp"
+        if n is None:
+            return 0
 
-        if "Volume" in columns:
-            cols["Volume"] = "volume"
+        self._remaining -= n
 
-        return df.rename(columns=cols)
+        return n
 
 
 class BarchartContract(Barchart):
@@ -251,7 +375,60 @@ class BarchartContract(Barchart):
         # raise ValueError("invalid frequency")
 
 
-class BarchartContract60Minutes(Barchart):
+class BarchartContractAggregated(Barchart):
+    # size of the bars in minutes
+    _minutes = 0
+
+    def _finer_sources(self) -> List[Tuple[Barchart, FREQUENCY]]:
+        return []
+
+    def _finest(
+        self, start: datetime, end: datetime, symbol: str
+    ) -> Optional[Tuple[Barchart, FREQUENCY]]:
+        for src, frequency in self._finer_sources():
+            try:
+                src._localfile(src._url(start, end, symbol, frequency))
+            except FileNotFoundError:
+                continue
+
+            return src, frequency
+
+        return None
+
+    def _source_files(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> Optional[List[str]]:
+        finest = self._finest(start, end, symbol)
+        if finest is None:
+            return super()._source_files(start, end, symbol, frequency)
+
+        src, finer = finest
+        return src._source_files(start, end, symbol, finer)
+
+    def _read_quotes(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+        finest = self._finest(start, end, symbol)
+        if finest is None:
+            return super()._read_quotes(start, end, symbol, frequency)
+
+        # bars are built from the finest series on disk, the directory of
+        # this bar size is only read when nothing finer was downloaded
+        src, finer = finest
+        df = src._read_quotes(start, end, symbol, finer)
+
+        return intraday.aggregate(df, self._minutes)
+
+
+class BarchartContract60Minutes(BarchartContractAggregated):
+    _minutes = 60
+
+    def _finer_sources(self) -> List[Tuple[Barchart, FREQUENCY]]:
+        return [
+            (BarchartContract15Minutes(), INTRADAY_15MINUTES),
+            (BarchartContract30Minutes(), INTRADAY_30MINUTES),
+        ]
+
     def _url(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> str:
@@ -263,7 +440,12 @@ class BarchartContract60Minutes(Barchart):
         )
 
 
-class BarchartContract30Minutes(Barchart):
+class BarchartContract30Minutes(BarchartContractAggregated):
+    _minutes = 30
+
+    def _finer_sources(self) -> List[Tuple[Barchart, FREQUENCY]]:
+        return [(BarchartContract15Minutes(), INTRADAY_15MINUTES)]
+
     def _url(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> str:
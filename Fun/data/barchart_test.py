@@ -0,0 +1,96 @@
+import os
+import unittest
+from datetime import datetime
+
+import numpy as np
+from Fun.data.barchart import Barchart
+from Fun.data.source import DAILY, EARLIEST, LATEST
+from Fun.utils.testing import HomeTestCase, parameterized, random_quotes, write_barchart
+
+
+class TestBarchart(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self._quotes = random_quotes(periods=3000)
+        self._root = os.path.join(
+            self._home.name, "Documents", "data_source", "barchart"
+        )
+
+    def _historic(self, header: bool):
+        # barchart historic files are written newest first
+        path = write_barchart(
+            self._home.name, "barchart", "es", self._quotes.iloc[::-1]
+        )
+
+        if header:
+            with open(path, "r") as f:
+                content = f.read()
+
+            with open(path, "w") as f:
+                f.write('"Symbol: ES","Study: Time Series"\n')
+                f.write(content)
+
+    def _tradingview(self):
+        os.makedirs(self._root, exist_ok=True)
+
+        with open(os.path.join(self._root, "es.csv"), "w") as f:
+            f.write("time,open,high,low,close,Volume,Volume MA\n")
+
+            for t, row in self._quotes.iterrows():
+                f.write(
+                    f"{t.strftime('%Y-%m-%d')}T08:00:00Z,"
+                    f"{row['open']},{row['high']},{row['low']},{row['close']},"
+                    f"{int(row['volume'])},\n"
+                )
+
+    @parameterized(
+        [
+            {"layout": "historic", "start": EARLIEST, "end": LATEST},
+            {"layout": "historic", "start": datetime(2003, 1, 1), "end": LATEST},
+            {"layout": "header", "start": EARLIEST, "end": LATEST},
+            {
+                "layout": "header",
+                "start": datetime(2003, 1, 1),
+                "end": datetime(2004, 1, 1),
+            },
+            {"layout": "tradingview", "start": EARLIEST, "end": LATEST},
+        ]
+    )
+    def test_layout(self, layout, start, end):
+        if layout == "tradingview":
+            self._tradingview()
+        else:
+            self._historic(header=layout == "header")
+
+        df = Barchart().read(start, end, "es", DAILY, use_cache=False)
+
+        self.assertListEqual(
+            list(df.columns),
+            ["open", "high", "low", "close", "volume", "open interest"],
+        )
+
+        wstart, wend = Barchart()._window(start, end, DAILY)
+        expected = self._quotes.loc[wstart:wend]
+
+        self.assertTrue(df.index.equals(expected.index))
+        self.assertTrue(
+            np.array_equal(
+                df.loc[:, ["open", "high", "low", "close", "volume"]].values,
+                expected.loc[:, ["open", "high", "low", "close", "volume"]].values,
+            )
+        )
+
+        if layout == "tradingview":
+            self.assertTrue((df.loc[:, "open interest"] == 0).all())
+        else:
+            self.assertTrue(
+                np.array_equal(
+                    df.loc[:, "open interest"].values,
+                    expected.loc[:, "open interest"].values,
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,314 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from Fun.utils import colors, pretty
+
+# bump whenever the normalized frame produced by DataSource.read changes shape
+CACHE_VERSION = 1
+
+
+def file_signature(paths: List[str]) -> str:
+    entries: List[Tuple[str, int, int]] = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        else:
+            stat = os.stat(path)
+            entries.append((path, stat.st_mtime_ns, stat.st_size))
+
+    entries.sort()
+
+    m = hashlib.sha1(f"version={CACHE_VERSION}".encode("utf-8"))
+    for path, mtime, size in entries:
+        m.update(f"{path}|{mtime}|{size}\n".encode("utf-8"))
+
+    return m.hexdigest()
+
+
+class TailState(NamedTuple):
+    path: str
+    # end of the last complete line, everything after it is parsed again
+    offset: int
+    checksum: str
+    # the newest timestamp parsed and whether it came from a final line
+    # without its newline
+    last: str
+    partial: bool
+
+
+def line_end(path: str, blocksize: int = 64 * 1024) -> int:
+    # position right after the last newline of the file
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+
+        while position > 0:
+            size = min(blocksize, position)
+            position -= size
+
+            f.seek(position)
+            newline = f.read(size).rfind(b"\n")
+            if newline >= 0:
+                return position + newline + 1
+
+    return 0
+
+
+def prefix_checksums(
+    path: str, offsets: List[int], blocksize: int = 1024 * 1024
+) -> List[str]:
+    # checksums of the first n bytes for every n in offsets, all from a single
+    # pass over the file
+    m = hashlib.sha1()
+    checksums: Dict[int, str] = {}
+
+    position = 0
+    pending = sorted(set(offsets))
+
+    with open(path, "rb") as f:
+        for offset in pending:
+            while position < offset:
+                block = f.read(min(blocksize, offset - position))
+                if not block:
+                    raise ValueError(f"{path} is shorter than {offset} bytes")
+
+                m.update(block)
+                position += len(block)
+
+            checksums[offset] = m.hexdigest()
+
+    return [checksums[offset] for offset in offsets]
+
+
+class FrameCache:
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        capacity: int = 1024 * 1024 * 1024,
+        name: str = "quotes",
+    ) -> None:
+        assert capacity >= 0
+
+        self._root = root
+        self._capacity = capacity
+        self._name = name
+
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def root(self) -> str:
+        if self._root is not None:
+            return self._root
+
+        home = os.getenv("HOME")
+        assert home is not None
+
+        return os.path.join(home, "Documents", "data_cache", self._name)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root(), f"{key}.npz")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def load(
+        self,
+        key: str,
+        signature: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[pd.DataFrame]:
+        path = self._path(key)
+
+        if self._capacity == 0 or not os.path.exists(path):
+            self._count("_misses")
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["signature"]) != signature:
+                    self._count("_misses")
+                    return None
+
+                df = self._frame(data, start, end)
+        except (OSError, ValueError, KeyError) as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300, f"dropping unreadable cache {path}: {err}"
+            )
+            self._remove(path)
+            self._count("_misses")
+            return None
+
+        # the modification time doubles as the last use time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._count("_hits")
+
+        return df
+
+    def _frame(
+        self,
+        data: np.lib.npyio.NpzFile,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        columns = [str(c) for c in data["columns"]]
+
+        # the index is stored sorted, the requested range maps to a pair of
+        # offsets shared by every column
+        times = data["index"]
+
+        lo = 0
+        hi = len(times)
+        if start is not None:
+            lo = int(np.searchsorted(times, np.datetime64(start), "left"))
+        if end is not None:
+            hi = int(np.searchsorted(times, np.datetime64(end), "right"))
+
+        index = pd.DatetimeIndex(times[lo:hi], name=str(data["name"]) or None)
+
+        return pd.DataFrame(
+            {c: data[f"c{i}"][lo:hi] for i, c in enumerate(columns)},
+            index=index,
+            columns=columns,
+        )
+
+    def load_tail(self, key: str) -> Optional[Tuple[pd.DataFrame, TailState]]:
+        # the frame of an incremental entry whatever its signature, the caller
+        # decides from the tail state whether the file only grew since
+        path = self._path(key)
+
+        if self._capacity == 0 or not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if "tail" not in data.files:
+                    return None
+
+                tail = TailState(**json.loads(str(data["tail"])))
+                df = self._frame(data)
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300, f"dropping unreadable cache {path}: {err}"
+            )
+            self._remove(path)
+            return None
+
+        return df, tail
+
+    def store(
+        self,
+        key: str,
+        signature: str,
+        df: pd.DataFrame,
+        tail: Optional[TailState] = None,
+    ) -> None:
+        if self._capacity == 0:
+            return
+
+        path = self._path(key)
+
+        arrays = {
+            "signature": np.array(signature),
+            "name": np.array(df.index.name or ""),
+            "index": df.index.values.astype("datetime64[ns]"),
+            "columns": np.array([str(c) for c in df.columns]),
+        }
+
+        if tail is not None:
+            arrays["tail"] = np.array(json.dumps(tail._asdict()))
+
+        for i, c in enumerate(df.columns):
+            arrays[f"c{i}"] = df.loc[:, c].values
+
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+
+            os.replace(tmp, path)
+        except OSError as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300, f"unable to write cache {path}: {err}"
+            )
+            self._remove(tmp)
+            return
+
+        self._count("_stores")
+
+        self._evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        root = self.root()
+
+        entries = []
+        total = 0
+
+        with os.scandir(root) as it:
+            for entry in it:
+                if not entry.is_file() or not entry.name.endswith(".npz"):
+                    continue
+
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self._capacity:
+            return
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total <= self._capacity:
+                break
+
+            self._remove(path)
+            total -= size
+
+            self._count("_evictions")
+
+    def clear(self) -> None:
+        root = self.root()
+        if not os.path.exists(root):
+            return
+
+        for f in os.listdir(root):
+            if f.endswith(".npz"):
+                self._remove(os.path.join(root, f))
+
+    def statistic(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "evictions": self._evictions,
+            }
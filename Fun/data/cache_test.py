@@ -0,0 +1,188 @@
+import os
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from Fun.data.cache import FrameCache, line_end, prefix_checksums
+from Fun.data.source import DAILY, WEEKLY, DataSource, StockCharts, Yahoo
+from Fun.utils.testing import (
+    HomeTestCase,
+    parameterized,
+    random_quotes,
+    write_stockcharts,
+    write_yahoo,
+)
+
+
+class TestFrameCache(HomeTestCase):
+    _start = datetime(1900, 1, 1)
+    _end = datetime(2100, 1, 1)
+
+    def setUp(self):
+        super().setUp()
+
+        self._cache = DataSource._cache
+
+        self._path = write_yahoo(self._home.name, "spx", random_quotes())
+
+    def test_hit(self):
+        src = Yahoo()
+
+        for frequency in (DAILY, WEEKLY):
+            parsed = src.read(self._start, self._end, "spx", frequency)
+            cached = src.read(self._start, self._end, "spx", frequency)
+
+            self.assertTrue(parsed.equals(cached))
+            self.assertEqual(parsed.index.name, cached.index.name)
+            self.assertListEqual(list(parsed.columns), list(cached.columns))
+
+        # the weekly frame is built from the daily rows already in the cache
+        statistic = self._cache.statistic()
+        self.assertEqual(statistic["hits"], 3)
+        self.assertEqual(statistic["misses"], 2)
+        self.assertEqual(statistic["stores"], 2)
+
+        # one entry for the daily rows and one for the weekly frame
+        self.assertEqual(len(os.listdir(self._cache.root())), 2)
+
+    def test_invalidate(self):
+        src = Yahoo()
+
+        src.read(self._start, self._end, "spx", DAILY)
+
+        write_yahoo(self._home.name, "spx", random_quotes(periods=1200, seed=1))
+        stat = os.stat(self._path)
+        os.utime(self._path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        df = src.read(self._start, self._end, "spx", DAILY)
+
+        self.assertEqual(len(df), 1200)
+        self.assertEqual(self._cache.statistic()["hits"], 0)
+
+    def test_disabled(self):
+        src = Yahoo()
+
+        src.read(self._start, self._end, "spx", DAILY, use_cache=False)
+        src.read(self._start, self._end, "spx", DAILY, use_cache=False)
+
+        statistic = self._cache.statistic()
+        self.assertEqual(statistic["hits"], 0)
+        self.assertEqual(statistic["misses"], 0)
+        self.assertFalse(os.path.exists(self._cache.root()))
+
+    def test_eviction(self):
+        src = Yahoo()
+
+        src.read(self._start, self._end, "spx", DAILY)
+        size = os.path.getsize(
+            os.path.join(self._cache.root(), os.listdir(self._cache.root())[0])
+        )
+
+        DataSource._cache = FrameCache(capacity=size)
+
+        src.read(self._start, self._end, "spx", WEEKLY)
+
+        self.assertEqual(len(os.listdir(self._cache.root())), 1)
+        self.assertEqual(DataSource._cache.statistic()["evictions"], 1)
+
+
+class TestTailIngestion(HomeTestCase):
+    _start = datetime(1900, 1, 1)
+    _end = datetime(2100, 1, 1)
+
+    def setUp(self):
+        super().setUp()
+
+        self._quotes = random_quotes(periods=1010)
+
+    def _write(self, source, df, newline=True):
+        if isinstance(source, Yahoo):
+            path = write_yahoo(self._home.name, "spx", df)
+        else:
+            path = write_stockcharts(self._home.name, "spx", df)
+
+        if not newline:
+            with open(path, "rb+") as f:
+                f.truncate(os.path.getsize(path) - 1)
+
+        # a renamed download always carries a new modification time
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        return path
+
+    def _read(self, source, frequency):
+        with mock.patch.object(
+            type(source),
+            "_read_data",
+            autospec=True,
+            side_effect=type(source)._read_data,
+        ) as read_data:
+            df = source.read(self._start, self._end, "spx", frequency)
+
+        expected = source.read(
+            self._start, self._end, "spx", frequency, use_cache=False
+        )
+        self.assertTrue(df.equals(expected))
+
+        return read_data.call_count
+
+    @parameterized(
+        [
+            {"source": Yahoo(), "newline": True},
+            {"source": Yahoo(), "newline": False},
+            {"source": StockCharts(), "newline": True},
+            {"source": StockCharts(), "newline": False},
+        ]
+    )
+    def test_append(self, source, newline):
+        self._write(source, self._quotes.iloc[:1000], newline=newline)
+        self.assertEqual(self._read(source, DAILY), 1)
+
+        for n in (1003, 1010):
+            self._write(source, self._quotes.iloc[:n], newline=newline)
+
+            # only the new tail is parsed, for every frequency
+            self.assertEqual(self._read(source, DAILY), 0)
+            self.assertEqual(self._read(source, WEEKLY), 0)
+
+        # the same file once more, nothing to parse at all
+        self._write(source, self._quotes, newline=newline)
+        self.assertEqual(self._read(source, DAILY), 0)
+
+    @parameterized([{"source": Yahoo()}, {"source": StockCharts()}])
+    def test_modified_prefix(self, source):
+        self._write(source, self._quotes.iloc[:1000])
+        self._read(source, DAILY)
+
+        quotes = self._quotes.copy()
+        quotes.iloc[10, 0] += 1.0
+
+        self._write(source, quotes)
+        self.assertEqual(self._read(source, DAILY), 1)
+
+    def test_shrunk(self):
+        self._write(Yahoo(), self._quotes)
+        self._read(Yahoo(), DAILY)
+
+        self._write(Yahoo(), self._quotes.iloc[:900])
+        self.assertEqual(self._read(Yahoo(), DAILY), 1)
+
+    def test_prefix(self):
+        path = os.path.join(self._home.name, "prefix")
+        with open(path, "wb") as f:
+            f.write(b"a,b\n1,2\n3,4")
+
+        self.assertEqual(line_end(path), 8)
+        self.assertEqual(line_end(path, blocksize=3), 8)
+
+        checksums = prefix_checksums(path, [8, 0, 4], blocksize=3)
+        self.assertEqual(len(set(checksums)), 3)
+        self.assertEqual(checksums, prefix_checksums(path, [8, 0, 4]))
+
+        with self.assertRaises(ValueError):
+            prefix_checksums(path, [100])
+
+
+if __name__ == "__main__":
+    unittest.main()
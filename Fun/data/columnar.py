@@ -0,0 +1,350 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from Fun.data.barchart import (
+    Barchart,
+    BarchartContract,
+    BarchartContract15Minutes,
+    BarchartContract30Minutes,
+    BarchartContract60Minutes,
+)
+from Fun.data.cache import file_signature
+from Fun.data.source import (
+    DAILY,
+    EARLIEST,
+    FREQUENCY,
+    INTRADAY_15MINUTES,
+    INTRADAY_30MINUTES,
+    INTRADAY_60MINUTES,
+    LATEST,
+    MONTHLY,
+    WEEKLY,
+    CoinAPI,
+    CryptoData,
+    DataSource,
+    InvestingCom,
+    StockCharts,
+    Yahoo,
+    apply_dtype_policy,
+    daily_to_monthly,
+    daily_to_weekly,
+)
+from Fun.utils import colors, pretty
+
+
+def native_frequency(frequency: FREQUENCY) -> FREQUENCY:
+    if frequency in (WEEKLY, MONTHLY):
+        return DAILY
+
+    return frequency
+
+
+class ColumnarStore:
+    def __init__(self, root: Optional[str] = None) -> None:
+        self._root = root
+
+        self._lock = threading.Lock()
+        self._metas: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def root(self) -> str:
+        if self._root is not None:
+            return self._root
+
+        home = os.getenv("HOME")
+        assert home is not None
+
+        return os.path.join(home, "Documents", "data_store")
+
+    def path(self, source: DataSource, symbol: str, frequency: FREQUENCY) -> str:
+        return os.path.join(
+            self.root(),
+            type(source).__name__.lower(),
+            f"{symbol}_{native_frequency(frequency)}",
+        )
+
+    def convert(self, source: DataSource, symbol: str, frequency: FREQUENCY) -> str:
+        frequency = native_frequency(frequency)
+
+        files = source.source_files(symbol, frequency)
+        assert files is not None
+
+        signature = file_signature(files)
+
+        # grown source files only have their new rows parsed on the way in
+        df = source.read(EARLIEST, LATEST, symbol, frequency)
+
+        path = self.path(source, symbol, frequency)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        old = f"{path}.{os.getpid()}.old"
+
+        os.makedirs(tmp, exist_ok=True)
+
+        # rows are stored column major so a frame over the mapped file is a
+        # single block without any copy
+        np.save(
+            os.path.join(tmp, "timestamp.npy"),
+            df.index.values.astype("datetime64[ns]").view(np.int64),
+        )
+        np.save(
+            os.path.join(tmp, "values.npy"),
+            np.ascontiguousarray(df.values.astype(np.float64).T),
+        )
+
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "source": type(source).__name__,
+                    "symbol": symbol,
+                    "frequency": int(frequency),
+                    "rows": len(df),
+                    "columns": [str(c) for c in df.columns],
+                    "name": df.index.name,
+                    "signature": signature,
+                },
+                f,
+                indent=2,
+            )
+
+        if os.path.exists(path):
+            os.replace(path, old)
+
+        os.replace(tmp, path)
+
+        if os.path.exists(old):
+            shutil.rmtree(old, ignore_errors=True)
+
+        with self._lock:
+            self._metas.pop(path, None)
+
+        return path
+
+    def _meta(self, path: str) -> Optional[Dict[str, Any]]:
+        meta_path = os.path.join(path, "meta.json")
+
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            cached = self._metas.get(path)
+
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+
+        with self._lock:
+            self._metas[path] = (mtime, meta)
+
+        return meta
+
+    def load(
+        self,
+        source: DataSource,
+        symbol: str,
+        frequency: FREQUENCY,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        signature: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        path = self.path(source, symbol, frequency)
+
+        meta = self._meta(path)
+        if meta is None:
+            return None
+
+        if signature is not None and signature != meta["signature"]:
+            return None
+
+        # every frame gets its own copy on write mapping, clean pages stay
+        # shared through the page cache with every other process reading the
+        # same symbol while in place edits only ever touch private pages
+        times = np.load(os.path.join(path, "timestamp.npy"), mmap_mode="c")
+        values = np.load(os.path.join(path, "values.npy"), mmap_mode="c")
+
+        lo = 0
+        hi = len(times)
+        if start is not None:
+            lo = int(
+                np.searchsorted(times, np.datetime64(start, "ns").astype(np.int64))
+            )
+        if end is not None:
+            hi = int(
+                np.searchsorted(
+                    times, np.datetime64(end, "ns").astype(np.int64), side="right"
+                )
+            )
+
+        index = pd.DatetimeIndex(times[lo:hi].view("datetime64[ns]"), name=meta["name"])
+
+        return pd.DataFrame(
+            values[:, lo:hi].T, index=index, columns=meta["columns"], copy=False
+        )
+
+    def verify(self, source: DataSource, symbol: str, frequency: FREQUENCY) -> bool:
+        stored = self.load(source, symbol, frequency)
+        if stored is None:
+            pretty.color_print(
+                colors.PAPER_RED_400, f"missing store for {symbol.upper()}"
+            )
+            return False
+
+        original = source.read(
+            EARLIEST, LATEST, symbol, native_frequency(frequency), use_cache=False
+        )
+
+        if not stored.index.equals(original.index):
+            pretty.color_print(
+                colors.PAPER_RED_400, f"timestamps differ for {symbol.upper()}"
+            )
+            return False
+
+        if list(stored.columns) != list(original.columns):
+            pretty.color_print(
+                colors.PAPER_RED_400, f"columns differ for {symbol.upper()}"
+            )
+            return False
+
+        if not np.array_equal(
+            stored.values, original.values.astype(np.float64), equal_nan=True
+        ):
+            pretty.color_print(
+                colors.PAPER_RED_400, f"quotes differ for {symbol.upper()}"
+            )
+            return False
+
+        return True
+
+
+class MemoryMapped(DataSource):
+    _store: ColumnarStore = ColumnarStore()
+
+    def __init__(self, source: DataSource, check_signature: bool = True) -> None:
+        assert not isinstance(source, MemoryMapped)
+
+        super().__init__(source.dtype_policy())
+
+        self._source = source
+        self._check_signature = check_signature
+
+    @classmethod
+    def store(cls) -> ColumnarStore:
+        return cls._store
+
+    def _timestamp_preprocessing(self, x: str) -> datetime:
+        return self._source._timestamp_preprocessing(x)
+
+    def _url(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> str:
+        return self._source._url(start, end, symbol, frequency)
+
+    def _read_data(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+        return self._source._read_data(start, end, symbol, frequency)
+
+    def read(
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        use_cache: bool = True,
+    ) -> pd.DataFrame:
+
+        native = native_frequency(frequency)
+
+        signature = None
+        if self._check_signature:
+            files = self._source.source_files(symbol, native, start=start, end=end)
+            if files is not None:
+                signature = file_signature(files)
+
+        wstart, wend = self._window(start, end, frequency)
+
+        # aggregated bars are built from every day in the bin, the last bin
+        # may end after the requested end
+        df = self._store.load(
+            self._source,
+            symbol,
+            native,
+            start=wstart,
+            end=wend if native == frequency else None,
+            signature=signature,
+        )
+
+        if df is None:
+            pretty.color_print(
+                colors.PAPER_AMBER_300,
+                f"{symbol.upper()} is not in the columnar store or is outdated, "
+                "reading the original file instead",
+            )
+            return self._source.read(start, end, symbol, frequency, use_cache=use_cache)
+
+        if frequency == WEEKLY:
+            df = daily_to_weekly(df).dropna()
+        elif frequency == MONTHLY:
+            df = daily_to_monthly(df).dropna()
+
+        return apply_dtype_policy(df.loc[wstart:wend], self._dtype_policy)
+
+
+def data_source_entries(
+    root: str,
+) -> Iterator[Tuple[DataSource, str, FREQUENCY]]:
+    flat = {
+        "yahoo": Yahoo(),
+        "barchart": Barchart(),
+        "stockcharts": StockCharts(),
+        "investing.com": InvestingCom(),
+        "cryptodata": CryptoData(),
+    }
+
+    for directory, source in flat.items():
+        path = os.path.join(root, directory)
+        if not os.path.isdir(path):
+            continue
+
+        for f in sorted(os.listdir(path)):
+            if os.path.isfile(os.path.join(path, f)):
+                yield source, os.path.splitext(f)[0], DAILY
+
+    intraday = {
+        "15m": INTRADAY_15MINUTES,
+        "30m": INTRADAY_30MINUTES,
+        "60m": INTRADAY_60MINUTES,
+    }
+
+    path = os.path.join(root, "coinapi")
+    if os.path.isdir(path):
+        for d in sorted(os.listdir(path)):
+            symbol, _, suffix = d.partition("@")
+            yield CoinAPI(), symbol, intraday.get(suffix, DAILY)
+
+    contracts = {
+        "": BarchartContract(),
+        "15m": BarchartContract15Minutes(),
+        "30m": BarchartContract30Minutes(),
+        "60m": BarchartContract60Minutes(),
+    }
+
+    path = os.path.join(root, "continuous")
+    if os.path.isdir(path):
+        for d in sorted(os.listdir(path)):
+            _, _, suffix = d.partition("@")
+            if suffix not in contracts:
+                continue
+
+            source: Barchart = contracts[suffix]
+
+            for f in sorted(os.listdir(os.path.join(path, d))):
+                yield source, os.path.splitext(f)[0], intraday.get(suffix, DAILY)
@@ -0,0 +1,102 @@
+import os
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+from Fun.data.barchart import Barchart
+from Fun.data.columnar import ColumnarStore, MemoryMapped, data_source_entries
+from Fun.data.source import DAILY, MONTHLY, WEEKLY, Yahoo
+from Fun.utils.testing import (
+    HomeTestCase,
+    parameterized,
+    random_quotes,
+    write_barchart,
+    write_yahoo,
+)
+
+
+class TestColumnarStore(HomeTestCase):
+    _cache_capacity = 0
+
+    def setUp(self):
+        super().setUp()
+
+        self._patch(mock.patch.object(MemoryMapped, "_store", ColumnarStore()))
+
+        write_yahoo(self._home.name, "spx", random_quotes())
+        write_barchart(self._home.name, "barchart", "vix", random_quotes(seed=1))
+
+    @parameterized(
+        [
+            {"source": Yahoo(), "symbol": "spx", "frequency": DAILY},
+            {"source": Yahoo(), "symbol": "spx", "frequency": WEEKLY},
+            {"source": Yahoo(), "symbol": "spx", "frequency": MONTHLY},
+            {"source": Barchart(), "symbol": "vix", "frequency": DAILY},
+            {"source": Barchart(), "symbol": "vix", "frequency": WEEKLY},
+        ]
+    )
+    def test_read(self, source, symbol, frequency):
+        MemoryMapped.store().convert(source, symbol, frequency)
+        self.assertTrue(MemoryMapped.store().verify(source, symbol, frequency))
+
+        start = datetime(2001, 3, 7)
+        end = datetime(2002, 11, 20)
+
+        expected = source.read(start, end, symbol, frequency)
+        mapped = MemoryMapped(source).read(start, end, symbol, frequency)
+
+        self.assertTrue(expected.index.equals(mapped.index))
+        self.assertListEqual(list(expected.columns), list(mapped.columns))
+        self.assertTrue(np.array_equal(expected.values, mapped.values, equal_nan=True))
+
+    def test_zero_copy(self):
+        MemoryMapped.store().convert(Yahoo(), "spx", DAILY)
+
+        df = MemoryMapped(Yahoo()).read(
+            datetime(2001, 1, 1), datetime(2002, 1, 1), "spx", DAILY
+        )
+
+        base = df.values
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+
+        self.assertIsInstance(base, np.memmap)
+
+        # modifying a frame never reaches the file other readers map
+        df.loc[:, "close"] = 0.0
+
+        df = MemoryMapped(Yahoo()).read(
+            datetime(2001, 1, 1), datetime(2002, 1, 1), "spx", DAILY
+        )
+        self.assertTrue((df.loc[:, "close"] != 0.0).all())
+
+    def test_outdated(self):
+        MemoryMapped.store().convert(Yahoo(), "spx", DAILY)
+
+        path = write_yahoo(self._home.name, "spx", random_quotes(periods=1200))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        df = MemoryMapped(Yahoo()).read(
+            datetime(1900, 1, 1), datetime(2100, 1, 1), "spx", DAILY
+        )
+        self.assertEqual(len(df), 1200)
+
+        self.assertFalse(MemoryMapped.store().verify(Yahoo(), "spx", DAILY))
+
+    def test_entries(self):
+        root = os.path.join(self._home.name, "Documents", "data_source")
+
+        entries = [
+            (type(s).__name__, symbol, frequency)
+            for s, symbol, frequency in data_source_entries(root)
+        ]
+
+        self.assertListEqual(
+            entries, [("Yahoo", "spx", DAILY), ("Barchart", "vix", DAILY)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,27 @@ from datetime import datetime
 
 import pandas as pd
 from Fun.data.barchart import Barchart
-from Fun.data.source import FREQUENCY
+from Fun.data.source import EARLIEST, FREQUENCY
 
 
 class BarchartCumulativeSum(Barchart):
     def read(
-        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        use_cache: bool = True,
     ) -> pd.DataFrame:
+        # the running sum starts with the file, not with the window asked for
         df = super(BarchartCumulativeSum, self).read(
-            start=start, end=end, symbol=symbol, frequency=frequency
+            start=EARLIEST,
+            end=end,
+            symbol=symbol,
+            frequency=frequency,
+            use_cache=use_cache,
         )
-        return df.cumsum()
+
+        wstart, _ = self._window(start, end, frequency)
+
+        return df.cumsum().loc[wstart:]
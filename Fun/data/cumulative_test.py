@@ -0,0 +1,37 @@
+import unittest
+from datetime import datetime
+
+from Fun.data.barchart import Barchart
+from Fun.data.cumulative import BarchartCumulativeSum
+from Fun.data.source import DAILY, EARLIEST, LATEST, WEEKLY
+from Fun.utils.testing import HomeTestCase, parameterized, random_quotes, write_barchart
+
+
+class TestBarchartCumulativeSum(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # barchart historic files are written newest first
+        write_barchart(
+            self._home.name, "barchart", "addn", random_quotes(periods=3000)[::-1]
+        )
+
+    @parameterized([{"frequency": DAILY}, {"frequency": WEEKLY}])
+    def test_start(self, frequency):
+        src = BarchartCumulativeSum()
+
+        end = datetime(2010, 1, 1)
+
+        early = src.read(datetime(2000, 1, 3), end, "addn", frequency)
+        late = src.read(datetime(2006, 1, 3), end, "addn", frequency)
+
+        # the level of a date does not depend on where the read starts
+        self.assertLess(early.index[0], late.index[0])
+        self.assertTrue(late.equals(early.loc[late.index[0] :]))
+
+        full = Barchart().read(EARLIEST, LATEST, "addn", frequency).cumsum()
+        self.assertTrue(late.equals(full.loc[late.index[0] : late.index[-1]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
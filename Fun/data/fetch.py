@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from Fun.utils import colors, pretty
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# query parameters holding credentials, never part of a cache key
+SECRETS = ("apikey",)
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    # seconds since the epoch of the last time the server confirmed the body
+    fetched: float
+
+
+def cache_key(url: str) -> str:
+    parts = urlsplit(url)
+
+    queries = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SECRETS
+    )
+
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(queries), ""))
+
+
+class Fetcher:
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        timeout: Tuple[float, float] = (5.0, 60.0),
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool: int = 8,
+    ) -> None:
+        self._root = root
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._pool = pool
+
+        # sessions are not shared between threads, every thread keeps its own
+        # pool of keep alive connections
+        self._local = threading.local()
+
+        self._lock = threading.Lock()
+
+        self._downloads = 0
+        self._revalidated = 0
+        self._fresh = 0
+        self._stale = 0
+
+    def root(self) -> str:
+        if self._root is not None:
+            return self._root
+
+        home = os.getenv("HOME")
+        assert home is not None
+
+        return os.path.join(home, "Documents", "data_cache", "http")
+
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            return session
+
+        retry = Retry(
+            total=self._retries,
+            backoff_factor=self._backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+
+        adapter = HTTPAdapter(
+            pool_connections=self._pool, pool_maxsize=self._pool, max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        self._local.session = session
+
+        return session
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        digest = hashlib.sha1(cache_key(url).encode("utf-8")).hexdigest()
+        path = os.path.join(self.root(), digest)
+
+        return f"{path}.json", f"{path}.body"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def cached(self, url: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(url)
+
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+
+            with open(body_path, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("size") != len(content):
+            return None
+
+        return CachedResponse(
+            content, meta.get("etag"), meta.get("last_modified"), meta["fetched"]
+        )
+
+    def _write(self, path: str, data: bytes) -> None:
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(tmp, "wb") as f:
+            f.write(data)
+
+        os.replace(tmp, path)
+
+    def store(
+        self,
+        url: str,
+        content: Optional[bytes],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        # without any content only the meta of the cached body is refreshed
+        meta_path, body_path = self._paths(url)
+
+        meta = {
+            "url": cache_key(url),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched": time.time(),
+            "size": len(content) if content is not None else size,
+        }
+
+        try:
+            os.makedirs(self.root(), exist_ok=True)
+
+            # the body goes first, a meta file never describes a partial body
+            if content is not None:
+                self._write(body_path, content)
+
+            self._write(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+        except OSError as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300, f"unable to cache {cache_key(url)}: {err}"
+            )
+
+    def fetch(self, url: str, max_age: Optional[float] = None) -> bytes:
+        cached = self.cached(url)
+
+        if (
+            cached is not None
+            and max_age is not None
+            and time.time() - cached.fetched <= max_age
+        ):
+            self._count("_fresh")
+            return cached.content
+
+        headers: Dict[str, Any] = {}
+        if cached is not None:
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            resp = self.session().get(url, headers=headers, timeout=self._timeout)
+        except requests.RequestException as err:
+            if cached is None:
+                raise
+
+            pretty.color_print(
+                colors.PAPER_AMBER_300,
+                f"unable to reach {cache_key(url)}, using the cached response: "
+                f"{type(err).__name__}",
+            )
+
+            self._count("_stale")
+            return cached.content
+
+        if resp.status_code == 304 and cached is not None:
+            self.store(
+                url,
+                None,
+                cached.etag,
+                cached.last_modified,
+                size=len(cached.content),
+            )
+
+            self._count("_revalidated")
+            return cached.content
+
+        resp.raise_for_status()
+
+        self.store(
+            url,
+            resp.content,
+            resp.headers.get("ETag"),
+            resp.headers.get("Last-Modified"),
+        )
+
+        self._count("_downloads")
+        return resp.content
+
+    def statistic(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "downloads": self._downloads,
+                "revalidated": self._revalidated,
+                "fresh": self._fresh,
+                "stale": self._stale,
+            }
+
+
+_fetcher = Fetcher()
+
+
+def fetcher() -> Fetcher:
+    return _fetcher
+
+
+def fetch(url: str, max_age: Optional[float] = None) -> bytes:
+    return _fetcher.fetch(url, max_age=max_age)
@@ -0,0 +1,52 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pandas as pd
+import requests
+from Fun.data.cache import FrameCache
+from Fun.data.fetch import Fetcher
+from Fun.data.source import DataSource
+from Fun.utils import colors, pretty
+from Fun.utils.benchmark import compare
+from Fun.utils.testing import StandInServer, alphavantage_csv, random_quotes
+
+if __name__ == "__main__":
+    end = datetime.now() - timedelta(days=1)
+    start = pd.bdate_range(end=end, periods=8000)[0]
+
+    quotes = random_quotes(start=start.strftime("%Y%m%d"), periods=8000)
+
+    def fixture(path, params):
+        if params.get("outputsize") == "compact":
+            return alphavantage_csv(quotes.iloc[-100:])
+
+        return alphavantage_csv(quotes)
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {"HOME": home, "ALPHA_VANTAGE": "secret"}
+
+        with mock.patch.dict(os.environ, env), StandInServer(fixture) as server:
+            DataSource._cache = FrameCache(capacity=0)
+
+            url = server.url("/query?outputsize=full&apikey=secret")
+            fetcher = Fetcher()
+            fetcher.fetch(url)
+
+            compare(
+                "8000 rows, plain get against a revalidated pooled fetch",
+                lambda: requests.get(url).content,
+                lambda: fetcher.fetch(url),
+                repeat=20,
+            )
+
+            # on a real connection the transfer dominates, a compact update
+            # moves a tiny fraction of the bytes of a full response
+            full = len(fixture("/query", {"outputsize": "full"}))
+            compact = len(fixture("/query", {"outputsize": "compact"}))
+
+            pretty.color_print(
+                colors.PAPER_CYAN_300,
+                f"alpha vantage update: {compact} bytes instead of {full} bytes",
+            )
@@ -0,0 +1,155 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pandas as pd
+import requests
+from Fun.data import fetch
+from Fun.data.fetch import Fetcher, cache_key
+from Fun.data.source import DAILY, AlphaVantage
+from Fun.utils.testing import (
+    HomeTestCase,
+    StandInServer,
+    alphavantage_csv,
+    random_quotes,
+)
+
+
+class TestFetcher(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self._fixtures = {"/quotes.csv": b"a,b\n1,2\n"}
+
+    def _fixture(self, path, params):
+        return self._fixtures.get(path)
+
+    def test_cache_key(self):
+        self.assertEqual(
+            cache_key("https://a.com/q?symbol=spx&apikey=secret&datatype=csv"),
+            cache_key("https://a.com/q?apikey=other&datatype=csv&symbol=spx"),
+        )
+        self.assertNotIn("secret", cache_key("https://a.com/q?apikey=secret"))
+
+        self.assertNotEqual(
+            cache_key("https://a.com/q?symbol=spx"),
+            cache_key("https://a.com/q?symbol=ndx"),
+        )
+
+    def test_revalidate(self):
+        fetcher = Fetcher(backoff=0.0)
+
+        with StandInServer(self._fixture) as server:
+            url = server.url("/quotes.csv?apikey=secret")
+
+            self.assertEqual(fetcher.fetch(url), b"a,b\n1,2\n")
+            self.assertEqual(fetcher.fetch(url), b"a,b\n1,2\n")
+
+            self._fixtures["/quotes.csv"] = b"a,b\n1,2\n3,4\n"
+            self.assertEqual(fetcher.fetch(url), b"a,b\n1,2\n3,4\n")
+
+            # a fresh enough response never reaches the server
+            self.assertEqual(fetcher.fetch(url, max_age=60.0), b"a,b\n1,2\n3,4\n")
+
+            statuses = [status for _, _, status in server.requests()]
+
+        self.assertListEqual(statuses, [200, 304, 200])
+        self.assertDictEqual(
+            fetcher.statistic(),
+            {"downloads": 2, "revalidated": 1, "fresh": 1, "stale": 0},
+        )
+
+        for f in os.listdir(fetcher.root()):
+            with open(os.path.join(fetcher.root(), f), "rb") as fp:
+                self.assertNotIn(b"secret", fp.read())
+
+    def test_retry(self):
+        fetcher = Fetcher(backoff=0.0, retries=2)
+
+        with StandInServer(self._fixture, failures=2) as server:
+            self.assertEqual(fetcher.fetch(server.url("/quotes.csv")), b"a,b\n1,2\n")
+
+        with StandInServer(self._fixture, failures=3) as server:
+            with self.assertRaises(requests.RequestException):
+                fetcher.fetch(server.url("/missing.csv"))
+
+    def test_stale(self):
+        fetcher = Fetcher(backoff=0.0, retries=1)
+
+        with StandInServer(self._fixture) as server:
+            url = server.url("/quotes.csv")
+            fetcher.fetch(url)
+
+            server._failures = 2
+            self.assertEqual(fetcher.fetch(url), b"a,b\n1,2\n")
+
+        self.assertEqual(fetcher.statistic()["stale"], 1)
+
+    def test_not_found(self):
+        with StandInServer(self._fixture) as server:
+            with self.assertRaises(requests.HTTPError):
+                Fetcher().fetch(server.url("/missing.csv"))
+
+
+class TestAlphaVantage(HomeTestCase):
+    _environ = {"ALPHA_VANTAGE": "secret"}
+    _cache_capacity = 0
+
+    def setUp(self):
+        super().setUp()
+
+        self._patch(mock.patch.object(fetch, "_fetcher", Fetcher(backoff=0.0)))
+
+        end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start = pd.bdate_range(end=end - timedelta(days=7), periods=1000)[0]
+
+        self._quotes = random_quotes(start=start.strftime("%Y%m%d"), periods=1010)
+        self._available = 1000
+
+    def _fixture(self, path, params):
+        df = self._quotes.iloc[: self._available]
+
+        if params["outputsize"] == "compact":
+            df = df.iloc[-100:]
+
+        return alphavantage_csv(df)
+
+    def _read(self, server):
+        with mock.patch.object(AlphaVantage, "_endpoint", server.url("/query")):
+            return AlphaVantage().read(
+                self._quotes.index[0], self._quotes.index[-1], "spy", DAILY
+            )
+
+    def test_compact(self):
+        with StandInServer(self._fixture) as server:
+            df = self._read(server)
+            self.assertEqual(len(df), 1000)
+
+            self._available = 1010
+            df = self._read(server)
+
+            sizes = [params["outputsize"] for _, params, _ in server.requests()]
+
+        self.assertListEqual(sizes, ["full", "compact"])
+
+        self.assertEqual(len(df), 1010)
+        self.assertTrue(
+            (df.loc[:, "close"].values == self._quotes.loc[:, "close"].values).all()
+        )
+
+    def test_outdated(self):
+        self._quotes.index = self._quotes.index - timedelta(days=365)
+
+        with StandInServer(self._fixture) as server:
+            self._read(server)
+            self._read(server)
+
+            sizes = [params["outputsize"] for _, params, _ in server.requests()]
+
+        # a compact response would leave a gap behind the cached rows
+        self.assertListEqual(sizes, ["full", "full"])
+
+
+if __name__ == "__main__":
+    unittest.main()
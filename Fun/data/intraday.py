@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from Fun.data import resample
+
+# the hour futures sessions are split at, a bar never spans across it
+SESSION_SPLIT_HOUR = 16
+
+# open interest is a level rather than a flow, an intraday bar keeps the
+# latest reading instead of adding them up
+AGGREGATIONS = (
+    ("open", "first"),
+    ("high", "max"),
+    ("low", "min"),
+    ("close", "last"),
+    ("volume", "sum"),
+    ("open interest", "last"),
+)
+
+
+def bar_labels(
+    values: np.ndarray, minutes: int, split_hour: int = SESSION_SPLIT_HOUR
+) -> np.ndarray:
+    assert minutes > 0
+    assert (24 * 60) % minutes == 0
+
+    # the grid is anchored on the session split, with bars dividing a day
+    # evenly every label is also a multiple of the bar size on the clock,
+    # 15 and 45 minutes fall into 00 and 30 for 30 minutes bars
+    width = np.int64(minutes * 60 * 1000000000)
+    anchor = np.int64(split_hour * 60 * 60 * 1000000000)
+
+    ns = values.astype("datetime64[ns]").view(np.int64)
+
+    return (((ns - anchor) // width) * width + anchor).view("datetime64[ns]")
+
+
+def aggregate(
+    df: pd.DataFrame, minutes: int, split_hour: int = SESSION_SPLIT_HOUR
+) -> pd.DataFrame:
+    if len(df) == 0:
+        return df.loc[:, [c for c, _ in AGGREGATIONS if c in df.columns]]
+
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    labels = bar_labels(df.index.values, minutes, split_hour=split_hour)
+
+    # only bars with quotes are emitted, nothing trades between sessions
+    starts = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+    offsets = np.concatenate([[0], starts])
+
+    return resample.reduce(
+        df,
+        pd.DatetimeIndex(labels[offsets], name=df.index.name),
+        offsets,
+        aggregations=AGGREGATIONS,
+    )
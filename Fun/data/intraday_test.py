@@ -0,0 +1,147 @@
+import os
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from Fun.data import intraday
+from Fun.data.barchart import (
+    BarchartContract15Minutes,
+    BarchartContract30Minutes,
+    BarchartContract60Minutes,
+)
+from Fun.data.cache import FrameCache
+from Fun.data.source import (
+    EARLIEST,
+    INTRADAY_15MINUTES,
+    INTRADAY_30MINUTES,
+    INTRADAY_60MINUTES,
+    LATEST,
+    DataSource,
+)
+from Fun.utils.testing import HomeTestCase, parameterized, random_quotes, write_barchart
+
+
+def _session_quotes(minutes: int = 15) -> pd.DataFrame:
+    df = random_quotes(start="20201201", periods=6000, freq=f"{minutes}min")
+
+    # nothing trades between 16:00 and 17:00 and over the weekend
+    index = df.index
+    closed = (index.hour == 16) | (index.weekday == 5)
+    closed |= (index.weekday == 4) & (index.hour > 16)
+    closed |= (index.weekday == 6) & (index.hour < 17)
+
+    return df.loc[~closed]
+
+
+def _expected(df: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    agg = {
+        "open": "first",
+        "high": "max",
+        "low": "min",
+        "close": "last",
+        "volume": "sum",
+        "open interest": "last",
+    }
+
+    dfr = df.resample(f"{minutes}min", label="left", closed="left").agg(agg)
+
+    return dfr.dropna(subset=["open"])
+
+
+class TestIntraday(HomeTestCase):
+    def _write(self, minutes: int, df: pd.DataFrame) -> None:
+        write_barchart(
+            self._home.name,
+            os.path.join("continuous", f"es@{minutes}m"),
+            "esh21",
+            df.iloc[::-1],
+            intraday=True,
+        )
+
+    def test_labels(self):
+        values = pd.DatetimeIndex(
+            [
+                datetime(2021, 1, 4, 15, 45),
+                datetime(2021, 1, 4, 17, 0),
+                datetime(2021, 1, 4, 17, 15),
+                datetime(2021, 1, 4, 17, 30),
+                datetime(2021, 1, 4, 17, 45),
+            ]
+        ).values
+
+        # the same rules study.read_notes applies to note timestamps
+        self.assertListEqual(
+            list(pd.DatetimeIndex(intraday.bar_labels(values, 30)).minute),
+            [30, 0, 0, 30, 30],
+        )
+        self.assertListEqual(
+            list(pd.DatetimeIndex(intraday.bar_labels(values, 60)).minute),
+            [0, 0, 0, 0, 0],
+        )
+        self.assertListEqual(
+            list(pd.DatetimeIndex(intraday.bar_labels(values, 60)).hour),
+            [15, 17, 17, 17, 17],
+        )
+
+    @parameterized(
+        [
+            {"src": BarchartContract30Minutes(), "frequency": INTRADAY_30MINUTES},
+            {"src": BarchartContract60Minutes(), "frequency": INTRADAY_60MINUTES},
+        ]
+    )
+    def test_from_15minutes(self, src, frequency):
+        DataSource._cache = FrameCache()
+
+        quotes = _session_quotes()
+        self._write(15, quotes)
+
+        minutes = 30 if frequency == INTRADAY_30MINUTES else 60
+        expected = _expected(quotes, minutes)
+
+        for use_cache in (False, True, True):
+            df = src.read(EARLIEST, LATEST, "esh21", frequency, use_cache=use_cache)
+
+            self.assertTrue(df.index.equals(expected.index))
+            self.assertTrue(
+                np.array_equal(df.values, expected.loc[:, df.columns].values)
+            )
+
+        self.assertEqual(DataSource._cache.statistic()["hits"], 1)
+
+        # no bar ever spans the session split
+        self.assertFalse((df.index.hour == 16).any())
+
+    def test_finest(self):
+        quotes = _session_quotes(minutes=30)
+        self._write(30, quotes)
+
+        df = BarchartContract60Minutes().read(
+            EARLIEST, LATEST, "esh21", INTRADAY_60MINUTES, use_cache=False
+        )
+
+        self.assertTrue(df.index.equals(_expected(quotes, 60).index))
+
+        with self.assertRaises(FileNotFoundError):
+            BarchartContract15Minutes().read(
+                EARLIEST, LATEST, "esh21", INTRADAY_15MINUTES, use_cache=False
+            )
+
+    def test_own_directory(self):
+        quotes = _session_quotes(minutes=60)
+        self._write(60, quotes)
+
+        df = BarchartContract60Minutes().read(
+            EARLIEST, LATEST, "esh21", INTRADAY_60MINUTES, use_cache=False
+        )
+
+        self.assertTrue(df.index.equals(quotes.index))
+
+        with self.assertRaises(FileNotFoundError):
+            BarchartContract30Minutes().read(
+                EARLIEST, LATEST, "esh21", INTRADAY_30MINUTES, use_cache=False
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,313 @@
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from Fun.data.barchart import Barchart
+from Fun.data.cumulative import BarchartCumulativeSum
+from Fun.data.source import (
+    DAILY,
+    FREQUENCY,
+    INTRADAY_15MINUTES,
+    INTRADAY_30MINUTES,
+    INTRADAY_60MINUTES,
+    MONTHLY,
+    WEEKLY,
+    CoinAPI,
+    DataSource,
+    InvestingCom,
+    StockCharts,
+    Yahoo,
+)
+
+# every source of the catalog by name, instantiated on first use only
+SOURCES: Dict[str, Callable[[], DataSource]] = {
+    "yahoo": Yahoo,
+    "barchart": Barchart,
+    "investing.com": InvestingCom,
+    "stockcharts": StockCharts,
+    "coinapi": CoinAPI,
+    "cumulative": BarchartCumulativeSum,
+}
+
+FILE_FREQUENCIES = (DAILY, WEEKLY, MONTHLY)
+CONTRACT_FREQUENCIES = (
+    DAILY,
+    WEEKLY,
+    MONTHLY,
+    INTRADAY_60MINUTES,
+    INTRADAY_30MINUTES,
+    INTRADAY_15MINUTES,
+)
+
+
+class Companion(NamedTuple):
+    symbol: str
+    source: str
+
+
+class Breadth(NamedTuple):
+    # advance decline issues and advance decline volume
+    issues: str
+    volume: str
+    source: str = "cumulative"
+
+
+class SymbolEntry(NamedTuple):
+    symbol: str
+    # None for futures, read as a continuous contract
+    source: Optional[str]
+    frequencies: Tuple[FREQUENCY, ...]
+    volatility: Optional[Companion] = None
+    equal_weighted: Optional[Companion] = None
+    breadth: Optional[Breadth] = None
+
+
+# the source every chart symbol is read from, anything else is a futures symbol
+_CHART_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "yahoo": (
+        "ovx",
+        "gvz",
+        "rut",
+        "sml",
+        "dji",
+        "spx",
+        "ndx",
+        "compq",
+        "nya",
+        "nikk",
+        "ezu",
+        "eem",
+        "hsi",
+        "fxi",
+        "ndxew",
+        # bond and reit etfs, formerly read from alpha vantage
+        "icsh",
+        "jpst",
+        "gsy",
+        "near",
+        "shv",
+        "flot",
+        "hylb",
+        "ushy",
+        "faln",
+        "shyg",
+        "hyg",
+        "sjnk",
+        "jnk",
+        "bkln",
+        "srln",
+        "emb",
+        "pcy",
+        "emhy",
+        "lqd",
+        "mbb",
+        "mub",
+        "igsb",
+        "igib",
+        "shy",
+        "iei",
+        "ief",
+        "tlh",
+        "tlt",
+        "govt",
+        "iyr",
+        "reet",
+        "rem",
+        # dividend etfs
+        "pff",
+        "pgx",
+        "pgf",
+        "hdv",
+        "dvy",
+        "dvye",
+        "idv",
+        "spyd",
+        "sphd",
+        "schd",
+        "vym",
+        "sdy",
+        "dgro",
+    ),
+    "investing.com": (
+        "jniv",
+        "vhsi",
+        "vxfxi",
+        "nk400",
+    ),
+    "barchart": (
+        "vix",
+        "vxn",
+        "vstx",
+        "dxy",
+        "jpyusd",
+        "usdjpy",
+        "eurusd",
+        "gbpusd",
+        "chfusd",
+        "usdchf",
+        "audusd",
+        "cadusd",
+        "usdcad",
+        "nzdusd",
+        "eurjpy",
+        "eurgbp",
+        "euraud",
+        "eurcad",
+        "eurchf",
+        "gbpjpy",
+        "audjpy",
+        "cadjpy",
+        "nzdjpy",
+        "spxew",
+        "smlew",
+        "midew",
+        "topix",
+        "fedfunds",
+        "ustm1",
+        "ustm3",
+        "ustm6",
+        "usty2",
+        "usty5",
+        "usty10",
+        "usty30",
+    ),
+    "coinapi": (
+        "btcusd",
+        "ethusd",
+        "ltcusd",
+        "xrpusd",
+        "bchusd",
+        "usdcusd",
+        "linkusd",
+        "adausd",
+        "dotusd",
+        "xlmusd",
+        "eosusd",
+        "trxusd",
+        "uniusd",
+    ),
+    "stockcharts": (
+        "vle",
+        "rvx",
+        "tyvix",
+    ),
+}
+
+_VOLATILITY: Dict[Tuple[str, ...], Companion] = {
+    ("es", "spx"): Companion("vix", "yahoo"),
+    ("nq", "ndx"): Companion("vxn", "yahoo"),
+    ("rut", "qr", "sml", "vle"): Companion("rvx", "stockcharts"),
+    ("np", "nl", "no", "nikk"): Companion("jniv", "investing.com"),
+    ("fx", "ezu"): Companion("vstx", "investing.com"),
+    ("hsi",): Companion("vhsi", "investing.com"),
+    ("fxi",): Companion("vxfxi", "investing.com"),
+    ("cl",): Companion("ovx", "yahoo"),
+    ("gc",): Companion("gvz", "yahoo"),
+    ("zn", "zt", "zf", "zb", "ge"): Companion("vix", "yahoo"),
+    ("tj",): Companion("jniv", "yahoo"),
+    ("gg",): Companion("vstx", "yahoo"),
+}
+
+_EQUAL_WEIGHTED: Dict[Tuple[str, ...], Companion] = {
+    ("es", "spx"): Companion("spxew", "barchart"),
+    ("nq", "ndx"): Companion("ndxew", "yahoo"),
+    ("qr", "sml", "vle"): Companion("smlew", "barchart"),
+}
+
+_BREADTH: Dict[Tuple[str, ...], Breadth] = {
+    ("es", "spx", "spxew"): Breadth("addn", "avdn"),
+    ("nq", "ndx", "ndxew"): Breadth("addq", "avdq"),
+}
+
+
+def _build() -> Dict[str, SymbolEntry]:
+    sources: Dict[str, str] = {}
+    for name, symbols in _CHART_SOURCES.items():
+        assert name in SOURCES
+
+        for symbol in symbols:
+            assert symbol not in sources, f"{symbol} has more than one source"
+            sources[symbol] = name
+
+    companions: Dict[str, Dict[str, object]] = {}
+    for field, table in (
+        ("volatility", _VOLATILITY),
+        ("equal_weighted", _EQUAL_WEIGHTED),
+        ("breadth", _BREADTH),
+    ):
+        for symbols, companion in table.items():
+            assert companion.source in SOURCES
+
+            for symbol in symbols:
+                fields = companions.setdefault(symbol, {})
+                assert field not in fields, f"{symbol} has more than one {field}"
+                fields[field] = companion
+
+    catalog: Dict[str, SymbolEntry] = {}
+    for symbol in set(sources.keys()) | set(companions.keys()):
+        source = sources.get(symbol)
+
+        catalog[symbol] = SymbolEntry(  # type: ignore
+            symbol=symbol,
+            source=source,
+            frequencies=(
+                FILE_FREQUENCIES if source is not None else CONTRACT_FREQUENCIES
+            ),
+            **companions.get(symbol, {}),
+        )
+
+    return catalog
+
+
+_catalog = _build()
+
+_lock = threading.Lock()
+_instances: Dict[str, DataSource] = {}
+
+
+def lookup(symbol: str) -> SymbolEntry:
+    entry = _catalog.get(symbol)
+    if entry is not None:
+        return entry
+
+    return SymbolEntry(symbol=symbol, source=None, frequencies=CONTRACT_FREQUENCIES)
+
+
+def symbols() -> List[str]:
+    return sorted(_catalog.keys())
+
+
+def source(name: str) -> DataSource:
+    with _lock:
+        src = _instances.get(name)
+        if src is None:
+            src = SOURCES[name]()
+            _instances[name] = src
+
+        return src
+
+
+def chart_source(symbol: str) -> Optional[DataSource]:
+    name = lookup(symbol).source
+    if name is None:
+        return None
+
+    return source(name)
+
+
+def related(symbol: str) -> List[Tuple[DataSource, str]]:
+    # every other series a chart of the symbol might read, for prefetching
+    entry = lookup(symbol)
+
+    series: List[Tuple[str, str]] = []
+
+    if entry.volatility is not None:
+        series.append((entry.volatility.source, entry.volatility.symbol))
+
+    if entry.equal_weighted is not None:
+        series.append((entry.equal_weighted.source, entry.equal_weighted.symbol))
+
+    if entry.breadth is not None:
+        series.append((entry.breadth.source, entry.breadth.issues))
+        series.append((entry.breadth.source, entry.breadth.volume))
+
+    return [(source(name), s) for name, s in series]
@@ -0,0 +1,104 @@
+import unittest
+
+from Fun.data import registry
+from Fun.data.barchart import Barchart
+from Fun.data.cumulative import BarchartCumulativeSum
+from Fun.data.source import (
+    DAILY,
+    INTRADAY_15MINUTES,
+    CoinAPI,
+    InvestingCom,
+    StockCharts,
+    Yahoo,
+)
+from Fun.plotter.advance_decline import AdvanceDeclineSource
+from Fun.plotter.equal_weighted import EqualWeightedSource
+from Fun.plotter.volatility import VolatilitySource
+from Fun.utils.testing import parameterized
+
+
+class TestRegistry(unittest.TestCase):
+    @parameterized(
+        [
+            {"symbol": "spx", "source": Yahoo},
+            {"symbol": "rut", "source": Yahoo},
+            {"symbol": "tlt", "source": Yahoo},
+            {"symbol": "jniv", "source": InvestingCom},
+            {"symbol": "vix", "source": Barchart},
+            {"symbol": "usty10", "source": Barchart},
+            {"symbol": "btcusd", "source": CoinAPI},
+            {"symbol": "vle", "source": StockCharts},
+        ]
+    )
+    def test_chart_source(self, symbol, source):
+        src = registry.chart_source(symbol)
+
+        self.assertIs(type(src), source)
+        self.assertIs(src, registry.chart_source(symbol))
+
+        self.assertIn(DAILY, registry.lookup(symbol).frequencies)
+        self.assertNotIn(INTRADAY_15MINUTES, registry.lookup(symbol).frequencies)
+
+    def test_futures(self):
+        for symbol in ("es", "zn", "xx"):
+            entry = registry.lookup(symbol)
+
+            self.assertIsNone(entry.source)
+            self.assertIsNone(registry.chart_source(symbol))
+            self.assertIn(INTRADAY_15MINUTES, entry.frequencies)
+
+    @parameterized(
+        [
+            {"symbol": "es", "vix": "vix", "source": Yahoo},
+            {"symbol": "qr", "vix": "rvx", "source": StockCharts},
+            {"symbol": "nikk", "vix": "jniv", "source": InvestingCom},
+            {"symbol": "tj", "vix": "jniv", "source": Yahoo},
+            {"symbol": "gg", "vix": "vstx", "source": Yahoo},
+            {"symbol": "dxy", "vix": None, "source": Yahoo},
+        ]
+    )
+    def test_volatility(self, symbol, vix, source):
+        src = VolatilitySource(symbol)
+
+        self.assertEqual(src._vix_symbol, vix)
+        self.assertIs(type(src._src), source)
+
+    @parameterized(
+        [
+            {"symbol": "spx", "ew": "spxew", "source": Barchart},
+            {"symbol": "nq", "ew": "ndxew", "source": Yahoo},
+            {"symbol": "vle", "ew": "smlew", "source": Barchart},
+            {"symbol": "cl", "ew": None, "source": Barchart},
+        ]
+    )
+    def test_equal_weighted(self, symbol, ew, source):
+        src = EqualWeightedSource(symbol)
+
+        self.assertEqual(src._ew_symbol, ew)
+        self.assertIs(type(src._src), source)
+
+    def test_breadth(self):
+        self.assertEqual(AdvanceDeclineSource("spxew")._ad_symbol, "addn")
+        self.assertEqual(AdvanceDeclineSource("ndx", True)._ad_symbol, "avdq")
+        self.assertIsNone(AdvanceDeclineSource("gc")._ad_symbol)
+
+        self.assertIs(type(AdvanceDeclineSource("es")._src), BarchartCumulativeSum)
+
+    def test_related(self):
+        related = [(type(src), symbol) for src, symbol in registry.related("es")]
+
+        self.assertListEqual(
+            related,
+            [
+                (Yahoo, "vix"),
+                (Barchart, "spxew"),
+                (BarchartCumulativeSum, "addn"),
+                (BarchartCumulativeSum, "avdn"),
+            ],
+        )
+
+        self.assertListEqual(registry.related("xx"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,319 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# aggregation of every column a quotes frame can carry, in output order
+AGGREGATIONS = (
+    ("open", "first"),
+    ("high", "max"),
+    ("low", "min"),
+    ("close", "last"),
+    ("volume", "sum"),
+    ("open interest", "sum"),
+)
+
+WEEKLY_RULE = "W-MON"
+MONTHLY_RULE = "MS"
+
+
+def bin_labels(values: np.ndarray, rule: str) -> np.ndarray:
+    days = values.astype("datetime64[D]")
+
+    if rule == WEEKLY_RULE:
+        # 1970-01-01 is a thursday, monday is the fourth day after it
+        offsets = (days.view(np.int64) - 4) % 7
+        return (days - offsets.astype("timedelta64[D]")).astype("datetime64[ns]")
+    elif rule == MONTHLY_RULE:
+        return days.astype("datetime64[M]").astype("datetime64[ns]")
+    else:
+        raise ValueError(f"invalid rule: {rule}")
+
+
+class Bins(NamedTuple):
+    # the first timestamp of every bin, including bins without any row
+    labels: pd.DatetimeIndex
+    # position of the first row of every bin, bin i spans
+    # offsets[i]:offsets[i + 1] and the last bin runs to the end
+    offsets: np.ndarray
+
+
+def label_range(first: np.datetime64, last: np.datetime64, rule: str) -> np.ndarray:
+    # pd.date_range walks anchored offsets one python object at a time
+    if rule == WEEKLY_RULE:
+        days = np.arange(
+            first.astype("datetime64[D]"),
+            last.astype("datetime64[D]") + np.timedelta64(1, "D"),
+            np.timedelta64(7, "D"),
+        )
+        return days.astype("datetime64[ns]")
+    elif rule == MONTHLY_RULE:
+        months = np.arange(
+            first.astype("datetime64[M]"),
+            last.astype("datetime64[M]") + np.timedelta64(1, "M"),
+        )
+        return months.astype("datetime64[ns]")
+    else:
+        raise ValueError(f"invalid rule: {rule}")
+
+
+def bins(index: pd.DatetimeIndex, rule: str) -> Bins:
+    assert len(index) > 0
+
+    values = index.values
+    first, last = bin_labels(values[[0, -1]], rule)
+
+    labels = label_range(first, last, rule)
+
+    return Bins(
+        pd.DatetimeIndex(labels, name=index.name),
+        np.searchsorted(values, labels, side="left"),
+    )
+
+
+def _reduce(
+    values: np.ndarray, how: str, offsets: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    counts = ends - offsets
+    filled = counts > 0
+
+    out = np.full(len(offsets), 0.0 if how == "sum" else np.nan)
+    if not filled.any():
+        return out
+
+    starts = offsets[filled]
+
+    valid = ~np.isnan(values)
+
+    if how in ("first", "last"):
+        # position of the first and last valid value of every bin from the
+        # running count of valid values, no python level loop over bins
+        cumulative = np.cumsum(valid)
+        before = np.where(starts > 0, cumulative[starts - 1], 0)
+        after = cumulative[ends[filled] - 1]
+
+        if how == "first":
+            positions = np.searchsorted(cumulative, before + 1, side="left")
+        else:
+            positions = np.searchsorted(cumulative, after, side="left")
+
+        positions = np.minimum(positions, len(values) - 1)
+
+        reduced = np.where(after > before, values[positions], np.nan)
+    elif how == "sum":
+        reduced = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    elif how == "max":
+        reduced = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+        reduced[reduced == -np.inf] = np.nan
+    elif how == "min":
+        reduced = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+        reduced[reduced == np.inf] = np.nan
+    else:
+        raise ValueError(f"invalid aggregation: {how}")
+
+    out[filled] = reduced
+
+    return out
+
+
+def _restore_dtype(reduced: np.ndarray, how: str, dtype: np.dtype) -> np.ndarray:
+    # integer columns stay integers as long as no empty bin forces a nan in
+    if np.issubdtype(dtype, np.integer):
+        if how == "sum" or not np.isnan(reduced).any():
+            return reduced.astype(dtype)
+
+    return reduced
+
+
+def reduce(
+    df: pd.DataFrame,
+    labels: pd.DatetimeIndex,
+    offsets: np.ndarray,
+    aggregations: Tuple[Tuple[str, str], ...] = AGGREGATIONS,
+) -> pd.DataFrame:
+    # rows offsets[i]:offsets[i + 1] of a sorted frame make up the bar labels[i]
+    ends = np.append(offsets[1:], len(df))
+
+    data = {}
+    for c, how in aggregations:
+        if c not in df.columns:
+            continue
+
+        values = df.loc[:, c].values
+        data[c] = _restore_dtype(
+            _reduce(values.astype(np.float64), how, offsets, ends), how, values.dtype
+        )
+
+    return pd.DataFrame(data, index=labels)
+
+
+class _Entry(NamedTuple):
+    index: np.ndarray
+    values: Dict[str, np.ndarray]
+    bins: Bins
+    reduced: Dict[str, np.ndarray]
+
+
+class Resampler:
+    def __init__(self, capacity: int = 64) -> None:
+        assert capacity >= 0
+
+        self._capacity = capacity
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+
+    def _get(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def _put(self, key: Tuple[str, str], entry: _Entry) -> None:
+        if self._capacity == 0:
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _reusable(
+        self, entry: Optional[_Entry], index: np.ndarray, values: Dict[str, np.ndarray]
+    ) -> int:
+        # number of leading bins whose rows are exactly the cached rows, the
+        # last cached bin is always recomputed since it might have been partial
+        if entry is None or len(index) < len(entry.index):
+            return 0
+
+        if list(values.keys()) != list(entry.values.keys()):
+            return 0
+
+        complete = len(entry.bins.offsets) - 1
+        if complete <= 0:
+            return 0
+
+        rows = int(entry.bins.offsets[-1])
+
+        if not np.array_equal(index[: len(entry.index)], entry.index):
+            return 0
+
+        for c, v in values.items():
+            a = v[:rows]
+            b = entry.values[c][:rows]
+
+            # nan aware comparison only for columns actually holding a nan
+            if not np.array_equal(a, b) and not np.array_equal(a, b, equal_nan=True):
+                return 0
+
+        return complete
+
+    def aggregate(
+        self, df: pd.DataFrame, rule: str, key: Optional[str] = None
+    ) -> pd.DataFrame:
+        columns = [(c, how) for c, how in AGGREGATIONS if c in df.columns]
+
+        if len(df) == 0 or not df.index.is_monotonic_increasing:
+            dfg = df.groupby(pd.Grouper(freq=rule, label="left", closed="left"))
+            return dfg.agg(dict(columns))
+
+        index = df.index.values
+        values = {c: df.loc[:, c].values for c, _ in columns}
+
+        entry = None
+        if key is not None:
+            entry = self._get((key, rule))
+
+        reused = self._reusable(entry, index, values)
+
+        if reused > 0:
+            assert entry is not None
+
+            self._count("_hits")
+
+            # only the bins from the last cached one onward are located again
+            start = int(entry.bins.offsets[reused])
+            tail = bins(df.index[start:], rule)
+
+            result_bins = Bins(
+                pd.DatetimeIndex(
+                    label_range(
+                        entry.bins.labels.values[0], tail.labels.values[-1], rule
+                    ),
+                    name=df.index.name,
+                ),
+                np.concatenate([entry.bins.offsets[:reused], tail.offsets + start]),
+            )
+        else:
+            self._count("_misses")
+
+            result_bins = bins(df.index, rule)
+
+        offsets = result_bins.offsets[reused:]
+        ends = np.append(result_bins.offsets[reused + 1 :], len(index))
+
+        # rows in front of the first recomputed bin are never touched again
+        lo = int(offsets[0])
+
+        reduced: Dict[str, np.ndarray] = {}
+        for c, how in columns:
+            r = _reduce(values[c][lo:].astype(np.float64), how, offsets - lo, ends - lo)
+
+            if reused > 0:
+                assert entry is not None
+                r = np.concatenate([entry.reduced[c][:reused], r])
+
+            reduced[c] = r
+
+        if key is not None:
+            self._put(
+                (key, rule),
+                _Entry(
+                    index.copy(),
+                    {c: v.copy() for c, v in values.items()},
+                    result_bins,
+                    reduced,
+                ),
+            )
+
+        data = {
+            c: _restore_dtype(reduced[c], how, values[c].dtype) for c, how in columns
+        }
+
+        return pd.DataFrame(data, index=result_bins.labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def statistic(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._entries),
+            }
+
+
+_resampler = Resampler()
+
+
+def resampler() -> Resampler:
+    return _resampler
+
+
+def aggregate(df: pd.DataFrame, rule: str, key: Optional[str] = None) -> pd.DataFrame:
+    return _resampler.aggregate(df, rule, key=key)
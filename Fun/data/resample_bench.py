@@ -0,0 +1,37 @@
+import pandas as pd
+from Fun.data import resample
+from Fun.utils.benchmark import compare
+from Fun.utils.testing import random_quotes
+
+
+def grouper(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    agg = {
+        "open": "first",
+        "high": "max",
+        "low": "min",
+        "close": "last",
+        "volume": "sum",
+        "open interest": "sum",
+    }
+
+    return df.groupby(pd.Grouper(freq=rule, label="left", closed="left")).agg(agg)
+
+
+if __name__ == "__main__":
+    df = random_quotes(start="19900102", periods=8000)
+
+    for rule in (resample.WEEKLY_RULE, resample.MONTHLY_RULE):
+        compare(
+            f"{rule}, 8000 daily rows",
+            lambda: grouper(df, rule),
+            lambda: resample.Resampler().aggregate(df, rule),
+        )
+
+        resampler = resample.Resampler()
+        resampler.aggregate(df.iloc[:-1], rule, key="spx")
+
+        compare(
+            f"{rule}, one new daily row",
+            lambda: grouper(df, rule),
+            lambda: resampler.aggregate(df, rule, key="spx"),
+        )
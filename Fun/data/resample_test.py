@@ -0,0 +1,118 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from Fun.data import resample
+from Fun.utils.testing import parameterized, random_quotes
+
+
+def _grouper(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    # the aggregation every read used before the resampling engine
+    agg = {
+        "open": "first",
+        "high": "max",
+        "low": "min",
+        "close": "last",
+        "volume": "sum",
+    }
+
+    if "open interest" in df.columns:
+        agg["open interest"] = "sum"
+
+    dfg = df.groupby(pd.Grouper(freq=rule, label="left", closed="left"))
+
+    return dfg.agg(agg)
+
+
+def _random_frame(seed: int) -> pd.DataFrame:
+    rand = np.random.RandomState(seed)
+
+    start = pd.Timestamp("19950102") + pd.Timedelta(days=int(rand.randint(0, 4000)))
+    df = random_quotes(
+        start=start.strftime("%Y%m%d"),
+        periods=int(rand.randint(1, 1500)),
+        freq=str(rand.choice(["B", "D"])),
+        seed=seed,
+    )
+
+    # holidays and gaps long enough to leave whole weeks and months empty
+    df = df.loc[rand.uniform(size=len(df)) > rand.uniform(0.0, 0.6)]
+    if len(df) > 20 and rand.uniform() < 0.5:
+        gap = int(rand.randint(0, len(df) - 20))
+        df = df.drop(df.index[gap : gap + int(rand.randint(5, 20))])
+
+    if len(df) > 0 and rand.uniform() < 0.5:
+        mask = rand.uniform(size=df.shape) < 0.1
+        df = df.mask(mask)
+
+    if rand.uniform() < 0.3:
+        df = df.drop("open interest", axis=1)
+
+    if rand.uniform() < 0.3 and not df.loc[:, "volume"].isna().any():
+        df = df.astype({"volume": np.int64})
+
+    return df
+
+
+class TestResample(unittest.TestCase):
+    @parameterized(
+        [{"seed": seed, "rule": rule} for seed in range(60) for rule in ("W-MON", "MS")]
+    )
+    def test_grouper(self, seed, rule):
+        df = _random_frame(seed)
+
+        expected = _grouper(df, rule)
+        aggregated = resample.Resampler().aggregate(df, rule)
+
+        pd.testing.assert_frame_equal(
+            aggregated, expected, check_exact=True, check_freq=False
+        )
+
+    @parameterized(
+        [{"seed": seed, "rule": rule} for seed in range(20) for rule in ("W-MON", "MS")]
+    )
+    def test_incremental(self, seed, rule):
+        rand = np.random.RandomState(seed)
+
+        df = _random_frame(seed)
+        resampler = resample.Resampler()
+
+        # new daily bars arriving a few at a time
+        length = int(rand.randint(0, len(df) + 1))
+        while True:
+            part = df.iloc[:length]
+
+            aggregated = resampler.aggregate(part, rule, key="spx")
+            pd.testing.assert_frame_equal(
+                aggregated, _grouper(part, rule), check_exact=True, check_freq=False
+            )
+
+            if length >= len(df):
+                break
+
+            length = min(len(df), length + int(rand.randint(1, 30)))
+
+    def test_reuse(self):
+        df = random_quotes(periods=2000)
+        resampler = resample.Resampler()
+
+        resampler.aggregate(df.iloc[:1990], "W-MON", key="spx")
+        resampler.aggregate(df, "W-MON", key="spx")
+
+        self.assertEqual(resampler.statistic()["hits"], 1)
+
+        # revised history is never served from the previous aggregation
+        revised = df.copy()
+        revised.iloc[10, 0] += 1.0
+
+        pd.testing.assert_frame_equal(
+            resampler.aggregate(revised, "W-MON", key="spx"),
+            _grouper(revised, "W-MON"),
+            check_exact=True,
+            check_freq=False,
+        )
+        self.assertEqual(resampler.statistic()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+from datetime import datetime
+from typing import Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+from Fun.data.cache import file_signature
+from Fun.data.source import DTYPE_POLICY, EARLIEST, FREQUENCY, LATEST, DataSource
+from Fun.utils.lru import MemoryLRU
+
+
+def _frame_size(entry: Tuple[str, pd.DataFrame]) -> int:
+    return int(entry[1].memory_usage(index=True, deep=False).sum())
+
+
+class ReferenceStore:
+    def __init__(self, capacity: int = 256 * 1024 * 1024) -> None:
+        self._lru = MemoryLRU(capacity, sizeof=_frame_size)
+
+        self._lock = threading.Lock()
+        # the lock of every key being loaded with the number of its waiters
+        self._loading: Dict[Hashable, Tuple[threading.Lock, int]] = {}
+
+    def _key(
+        self, src: DataSource, symbol: str, frequency: FREQUENCY
+    ) -> Tuple[str, str, FREQUENCY, DTYPE_POLICY]:
+        # readers of the same series with another dtype policy never share
+        return (type(src).__name__.lower(), symbol, frequency, src.dtype_policy())
+
+    def _load(self, src: DataSource, symbol: str, frequency: FREQUENCY) -> pd.DataFrame:
+        # the whole history is kept for every key, so that every window of the
+        # overlays is a slice of the same frame
+        files = src.source_files(symbol, frequency)
+        if files is None:
+            # remote sources have nothing to invalidate against
+            return src.read(EARLIEST, LATEST, symbol, frequency)
+
+        key = self._key(src, symbol, frequency)
+        signature = file_signature(files)
+
+        entry = self._lru.get(key, valid=lambda e: e[0] == signature)
+        if entry is not None:
+            return entry[1]
+
+        with self._lock:
+            loading, waiters = self._loading.get(key, (threading.Lock(), 0))
+            self._loading[key] = (loading, waiters + 1)
+
+        # concurrent renders asking for the same series parse it only once
+        try:
+            with loading:
+                entry = self._lru.peek(key)
+                if entry is not None and entry[0] == signature:
+                    return entry[1]
+
+                df = src.read(EARLIEST, LATEST, symbol, frequency)
+                self._lru.put(key, (signature, df))
+        finally:
+            with self._lock:
+                loading, waiters = self._loading.pop(key)
+                if waiters > 1:
+                    self._loading[key] = (loading, waiters - 1)
+
+        return df
+
+    def read(
+        self,
+        src: DataSource,
+        symbol: str,
+        frequency: FREQUENCY,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        df = self._load(src, symbol, frequency)
+
+        # every caller gets its own frame, plotters normalize quotes in place
+        return df.loc[start:end].copy()
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def statistic(self) -> Dict[str, int]:
+        return self._lru.statistic()
+
+
+_store = ReferenceStore()
+
+
+def store() -> ReferenceStore:
+    return _store
+
+
+def read(
+    src: DataSource,
+    symbol: str,
+    frequency: FREQUENCY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> pd.DataFrame:
+    return _store.read(src, symbol, frequency, start=start, end=end)
@@ -0,0 +1,115 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+from Fun.data.shared import ReferenceStore
+from Fun.data.source import COMPACT, DAILY, EARLIEST, LATEST, WEEKLY, Yahoo
+from Fun.utils.testing import HomeTestCase, random_quotes, write_yahoo
+
+
+class TestReferenceStore(HomeTestCase):
+    _cache_capacity = 0
+
+    def setUp(self):
+        super().setUp()
+
+        self._path = write_yahoo(self._home.name, "vix", random_quotes())
+
+    def test_hit(self):
+        store = ReferenceStore()
+
+        start = datetime(2001, 1, 1)
+        end = datetime(2002, 1, 1)
+
+        with mock.patch.object(
+            Yahoo, "read", autospec=True, side_effect=Yahoo.read
+        ) as read:
+            for _ in range(3):
+                df = store.read(Yahoo(), "vix", DAILY, start=start, end=end)
+            store.read(Yahoo(), "vix", WEEKLY, start=start, end=end)
+
+            self.assertEqual(read.call_count, 2)
+
+        self.assertTrue(
+            df.equals(Yahoo().read(start, end, "vix", DAILY).loc[start:end])
+        )
+
+        statistic = store.statistic()
+        self.assertEqual(statistic["hits"], 2)
+        self.assertEqual(statistic["misses"], 2)
+
+    def test_dtype_policy(self):
+        store = ReferenceStore()
+
+        compact = store.read(Yahoo(dtype_policy=COMPACT), "vix", DAILY)
+        full = store.read(Yahoo(), "vix", DAILY)
+
+        # readers with another dtype policy never share an entry
+        self.assertTrue(
+            compact.equals(
+                Yahoo(dtype_policy=COMPACT).read(EARLIEST, LATEST, "vix", DAILY)
+            )
+        )
+        self.assertTrue(full.equals(Yahoo().read(EARLIEST, LATEST, "vix", DAILY)))
+        self.assertFalse(compact.dtypes.equals(full.dtypes))
+
+        self.assertEqual(store.statistic()["misses"], 2)
+
+    def test_isolation(self):
+        store = ReferenceStore()
+
+        df = store.read(Yahoo(), "vix", DAILY)
+        df -= df.min()
+        df.loc[:, "close"] /= 2.0
+
+        self.assertTrue(
+            store.read(Yahoo(), "vix", DAILY).equals(
+                Yahoo().read(datetime(1900, 1, 1), datetime(2100, 1, 1), "vix", DAILY)
+            )
+        )
+
+    def test_invalidate(self):
+        store = ReferenceStore()
+
+        store.read(Yahoo(), "vix", DAILY)
+
+        write_yahoo(self._home.name, "vix", random_quotes(periods=1200, seed=1))
+        stat = os.stat(self._path)
+        os.utime(self._path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(len(store.read(Yahoo(), "vix", DAILY)), 1200)
+        self.assertEqual(store.statistic()["misses"], 2)
+
+    def test_budget(self):
+        store = ReferenceStore(capacity=1)
+
+        store.read(Yahoo(), "vix", DAILY)
+        store.read(Yahoo(), "vix", DAILY)
+
+        self.assertEqual(store.statistic()["entries"], 0)
+        self.assertEqual(store.statistic()["hits"], 0)
+
+    def test_threads(self):
+        store = ReferenceStore()
+
+        with mock.patch.object(
+            Yahoo, "read", autospec=True, side_effect=Yahoo.read
+        ) as read:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                frames = list(
+                    executor.map(lambda _: store.read(Yahoo(), "vix", DAILY), range(16))
+                )
+
+            self.assertEqual(read.call_count, 1)
+
+        # no lock outlives the load it guarded
+        self.assertDictEqual(store._loading, {})
+
+        for df in frames:
+            self.assertTrue(df.equals(frames[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
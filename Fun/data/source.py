@@ -1,14 +1,36 @@
+import functools
 import io
 import os
 import re
+import threading
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import NewType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    NewType,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
-import requests
-from Fun.utils import colors, pretty
+from Fun.data import fetch, resample, timestamp
+from Fun.data.cache import (
+    FrameCache,
+    TailState,
+    file_signature,
+    line_end,
+    prefix_checksums,
+)
+from Fun.data.timestamp import TimestampFormat
+from Fun.utils import colors, pretty, timing
 
 FREQUENCY = NewType("FREQUENCY", int)
 
@@ -21,46 +43,84 @@ INTRADAY_60MINUTES = FREQUENCY(3)
 INTRADAY_30MINUTES = FREQUENCY(4)
 INTRADAY_15MINUTES = FREQUENCY(5)
 
+DTYPE_POLICY = NewType("DTYPE_POLICY", int)
 
-def daily_to_weekly(df: pd.DataFrame) -> pd.DataFrame:
-    agg = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }
+# every column as float64, the way quotes have always been returned
+FLOAT64 = DTYPE_POLICY(0)
+# float32 prices with integer volume and open interest, about half the memory
+COMPACT = DTYPE_POLICY(1)
 
-    if "open interest" in df.columns:
-        agg["open interest"] = "sum"
+# the widest range representable by pandas timestamps, reading between them
+# means reading everything
+EARLIEST = datetime(1678, 1, 1)
+LATEST = datetime(2262, 1, 1)
 
-    dfg = df.groupby(pd.Grouper(freq="W-MON", label="left", closed="left"))
 
-    df = dfg.agg(agg)
+def apply_dtype_policy(df: pd.DataFrame, policy: DTYPE_POLICY) -> pd.DataFrame:
+    assert policy in (FLOAT64, COMPACT)
 
-    return df
+    if policy == FLOAT64:
+        return df.astype(np.float64, copy=False)
 
+    dtypes = {}
+    for c in df.columns:
+        values = df.loc[:, c].values
+
+        if c not in ("volume", "open interest"):
+            dtypes[c] = np.float32
+        elif not np.array_equal(values, np.round(values)):
+            # fractional crypto volume stays a float
+            dtypes[c] = np.float32
+        elif len(values) == 0 or np.abs(values).max() <= np.iinfo(np.int32).max:
+            dtypes[c] = np.int32
+        else:
+            dtypes[c] = np.int64
+
+    return df.astype(dtypes, copy=False)
 
-def daily_to_monthly(df: pd.DataFrame) -> pd.DataFrame:
-    agg = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }
 
-    if "open interest" in df.columns:
-        agg["open interest"] = "sum"
+class ReadRequest(NamedTuple):
+    start: datetime
+    end: datetime
+    symbol: str
+    frequency: FREQUENCY
 
-    dfg = df.groupby(pd.Grouper(freq="MS", label="left", closed="left"))
 
-    df = dfg.agg(agg)
+def daily_to_weekly(df: pd.DataFrame, key: Optional[str] = None) -> pd.DataFrame:
+    return resample.aggregate(df, resample.WEEKLY_RULE, key=key)
 
-    return df
+
+def daily_to_monthly(df: pd.DataFrame, key: Optional[str] = None) -> pd.DataFrame:
+    return resample.aggregate(df, resample.MONTHLY_RULE, key=key)
 
 
 class DataSource(metaclass=ABCMeta):
+    _timestamp_formats: List[TimestampFormat] = []
+
+    _cache: FrameCache = FrameCache()
+
+    def __init__(self, dtype_policy: DTYPE_POLICY = FLOAT64) -> None:
+        assert dtype_policy in (FLOAT64, COMPACT)
+
+        self._dtype_policy = dtype_policy
+
+    @classmethod
+    def cache(cls) -> FrameCache:
+        return cls._cache
+
+    def dtype_policy(self) -> DTYPE_POLICY:
+        return self._dtype_policy
+
+    def source_files(
+        self,
+        symbol: str,
+        frequency: FREQUENCY,
+        start: datetime = EARLIEST,
+        end: datetime = LATEST,
+    ) -> Optional[List[str]]:
+        # the local files a read depends on, None for a remote source
+        return self._source_files(start, end, symbol, frequency)
+
     @abstractmethod
     def _timestamp_preprocessing(self, x: str) -> datetime:
         raise NotImplementedError
@@ -78,12 +138,8 @@ class DataSource(metaclass=ABCMeta):
         raise NotImplementedError
 
     def _datafeed(self, url: str) -> io.BytesIO:
-        resp = requests.get(url)
-        resp.raise_for_status()
-
-        data = io.BytesIO(resp.content)
-
-        return data
+        # pooled connections, retries and a revalidated response cache
+        return io.BytesIO(fetch.fetch(url))
 
     def _localfile(self, path: str) -> str:
 
@@ -97,6 +153,11 @@ class DataSource(metaclass=ABCMeta):
 
         return path
 
+    def _source_files(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> Optional[List[str]]:
+        return [self._localfile(self._url(start, end, symbol, frequency))]
+
     def _preload(self, freq: FREQUENCY) -> timedelta:
         preload = 30
 
@@ -115,6 +176,95 @@ class DataSource(metaclass=ABCMeta):
         else:
             raise ValueError(f"invalid frequency: {freq}")
 
+    def _window(
+        self, start: datetime, end: datetime, frequency: FREQUENCY
+    ) -> Tuple[datetime, datetime]:
+        preload = self._preload(frequency)
+
+        wstart = start - preload if start - EARLIEST > preload else EARLIEST
+        wend = min(end, LATEST)
+
+        # start on a bin boundary so the first aggregated bar is complete
+        if frequency == WEEKLY:
+            wstart = wstart - timedelta(days=wstart.weekday())
+        elif frequency == MONTHLY:
+            wstart = wstart.replace(day=1)
+
+        if frequency in (DAILY, WEEKLY, MONTHLY):
+            wstart = wstart.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        return max(wstart, EARLIEST), wend
+
+    def _chunk_bounds(
+        self, values: pd.Series
+    ) -> Optional[Tuple[datetime, datetime]]:
+        def first_valid(xs: List[Any]) -> Optional[datetime]:
+            for x in xs:
+                try:
+                    return self._timestamp_preprocessing(x)
+                except (ValueError, TypeError, AssertionError):
+                    continue
+
+            return None
+
+        head = first_valid(values.iloc[:3].tolist())
+        tail = first_valid(values.iloc[-3:].tolist()[::-1])
+
+        if head is None or tail is None:
+            return None
+
+        return head, tail
+
+    def _read_csv(
+        self,
+        src: Union[str, io.IOBase],
+        start: datetime,
+        end: datetime,
+        timestamp_columns: Tuple[str, ...],
+        chunksize: int = 8192,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        if start <= EARLIEST and end >= LATEST:
+            return pd.read_csv(src, **kwargs)
+
+        # quotes files are sorted either way, once a chunk has passed the
+        # requested window the rest of the file is never parsed
+        chunks = []
+        empty: Optional[pd.DataFrame] = None
+        ascending: Optional[bool] = None
+
+        for chunk in pd.read_csv(src, chunksize=chunksize, **kwargs):
+            if empty is None:
+                empty = chunk.iloc[0:0]
+
+            column = [c for c in timestamp_columns if c in chunk.columns]
+            bounds = self._chunk_bounds(chunk.loc[:, column[0]]) if column else None
+
+            if bounds is None:
+                chunks.append(chunk)
+                continue
+
+            first, last = bounds
+            if ascending is None:
+                ascending = first <= last
+
+            if ascending:
+                if last >= start:
+                    chunks.append(chunk)
+                if last > end:
+                    break
+            else:
+                if last <= end:
+                    chunks.append(chunk)
+                if last < start:
+                    break
+
+        if len(chunks) == 0:
+            assert empty is not None
+            return empty
+
+        return pd.concat(chunks)
+
     def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         cols = {k: k.lower() for k in df.columns}
         return df.rename(columns=cols)
@@ -123,7 +273,12 @@ class DataSource(metaclass=ABCMeta):
         return df
 
     def read(
-        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        use_cache: bool = True,
     ) -> pd.DataFrame:
 
         assert frequency in (
@@ -135,15 +290,95 @@ class DataSource(metaclass=ABCMeta):
             MONTHLY,
         )
 
-        df = self._read_data(start, end, symbol, frequency)
+        with timing.span(
+            "read", source=type(self).__name__, symbol=symbol, frequency=frequency
+        ):
+            wstart, wend = self._window(start, end, frequency)
 
-        df = self._rename_columns(df)
+            files = None
+            if use_cache:
+                files = self._source_files(start, end, symbol, frequency)
 
-        df.loc[:, "timestamp"] = (
-            df.loc[:, "timestamp"].apply(self._timestamp_preprocessing)
-            # .astype(np.datetime64)
+            if files is None:
+                df = self._read_quotes(wstart, wend, symbol, frequency)
+                return apply_dtype_policy(df.loc[wstart:wend], self._dtype_policy)
+
+            key = f"{type(self).__name__.lower()}_{symbol}_{frequency}"
+            signature = file_signature(files)
+
+            # the daily rows of an appendable file are kept once in the cache,
+            # along with the state of the file they came from
+            appendable = (
+                isinstance(self, AppendableSource)
+                and len(files) == 1
+                and frequency in (DAILY, WEEKLY, MONTHLY)
+            )
+            shared = appendable and frequency == DAILY
+
+            # the cache always holds the full precision frame
+            df = None
+            if not shared:
+                with timing.span("cache") as span:
+                    df = self._cache.load(key, signature, start=wstart, end=wend)
+                    span.set(hit=df is not None)
+
+            if df is None:
+                if appendable:
+                    assert isinstance(self, AppendableSource)
+                    df = self._finalize(
+                        self._ingest(files[0], symbol), symbol, frequency
+                    )
+                else:
+                    df = self._read_quotes(EARLIEST, LATEST, symbol, frequency)
+
+                if not shared:
+                    with timing.span("store"):
+                        self._cache.store(key, signature, df)
+
+                df = df.loc[wstart:wend]
+
+            return apply_dtype_policy(df, self._dtype_policy)
+
+    def read_many(
+        self,
+        requests: Iterable[ReadRequest],
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+        processes: bool = False,
+    ) -> Dict[ReadRequest, pd.DataFrame]:
+        frames = read_many(
+            [(self, r) for r in requests],
+            use_cache=use_cache,
+            max_workers=max_workers,
+            processes=processes,
         )
 
+        return {r: df for (_, r), df in frames.items()}
+
+    def _read_quotes(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+
+        with timing.span("read_data"):
+            df = self._read_data(start, end, symbol, frequency)
+
+        df = self._normalize(df, symbol, frequency)
+
+        return self._finalize(df, symbol, frequency)
+
+    def _normalize(
+        self, df: pd.DataFrame, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+
+        df = self._rename_columns(df)
+
+        with timing.span("timestamp"):
+            df["timestamp"] = timestamp.parse(
+                df.loc[:, "timestamp"],
+                self._timestamp_formats,
+                self._timestamp_preprocessing,
+            )
+
         df = self._additional_processing(df)
 
         df = df.set_index("timestamp")
@@ -161,35 +396,233 @@ class DataSource(metaclass=ABCMeta):
                 )
                 df = df.drop(df.loc[unusual].index)
 
-        df = df.sort_index()
+        return df.sort_index()
 
-        if frequency == WEEKLY:
-            df = daily_to_weekly(df)
-        elif frequency == MONTHLY:
-            df = daily_to_monthly(df)
+    def _finalize(
+        self, df: pd.DataFrame, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+
+        key = f"{type(self).__name__.lower()}_{symbol}"
+
+        if frequency in (WEEKLY, MONTHLY):
+            with timing.span("resample"):
+                if frequency == WEEKLY:
+                    df = daily_to_weekly(df, key=key)
+                else:
+                    df = daily_to_monthly(df, key=key)
+
+        with timing.span("nan"):
+            length = len(df)
+
+            na = df.isna().any(axis=1)
+            if na.any():
+                pretty.color_print(
+                    colors.PAPER_AMBER_300,
+                    f"dropping {len(df.loc[na])} rows containing nan from {symbol.upper()}",
+                )
+
+                dropped_length = len(df.loc[na])
+
+                df = df.dropna()
+
+                assert length == len(df) + dropped_length
+
+        return df.astype(np.float)
+
+
+class AppendableSource(DataSource):
+    # files only ever grow by new rows at the end, the first lines of the
+    # file hold the column names
+    _header_lines: int = 1
+
+    @abstractmethod
+    def _read_file(
+        self, src: Union[str, io.IOBase], start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def _ingest(self, path: str, symbol: str) -> pd.DataFrame:
+        # the parsed daily rows of an appendable file are kept along with the
+        # state of the file they came from, a grown file only has its new tail
+        # parsed as long as everything in front of it is unchanged
+        key = f"{type(self).__name__.lower()}_{symbol}_raw"
+
+        signature = file_signature([path])
+
+        df = self._cache.load(key, signature)
+        if df is not None:
+            return df
+
+        offset = line_end(path)
+        checksum = None
+
+        cached = self._cache.load_tail(key)
+        if cached is not None:
+            previous, tail = cached
+
+            if tail.path != path:
+                reason = f"moved from {tail.path}"
+            elif tail.offset > offset:
+                reason = "shrank"
+            else:
+                before, checksum = prefix_checksums(path, [tail.offset, offset])
+                if before == tail.checksum:
+                    df = self._append_tail(path, previous, tail, symbol)
+                    reason = "has new rows unable to append"
+                else:
+                    reason = "changed in front of its new rows"
+
+            if df is None:
+                pretty.color_print(
+                    colors.PAPER_AMBER_300,
+                    f"{symbol.upper()} {reason}, parsing the whole file again",
+                )
+
+        if df is None:
+            with timing.span("read_data"):
+                df = self._read_data(EARLIEST, LATEST, symbol, DAILY)
+
+            df = self._normalize(df, symbol, DAILY)
+
+        if checksum is None:
+            (checksum,) = prefix_checksums(path, [offset])
+
+        self._cache.store(
+            key,
+            signature,
+            df,
+            tail=TailState(
+                path=path,
+                offset=offset,
+                checksum=checksum,
+                last=df.index[-1].isoformat() if len(df) > 0 else "",
+                partial=offset < os.path.getsize(path),
+            ),
+        )
+
+        return df
+
+    def _append_tail(
+        self, path: str, previous: pd.DataFrame, tail: TailState, symbol: str
+    ) -> Optional[pd.DataFrame]:
+        if tail.last == "":
+            return None
+
+        with open(path, "rb") as f:
+            header = b"".join(f.readline() for _ in range(self._header_lines))
+            if f.tell() > tail.offset:
+                return None
+
+            f.seek(tail.offset)
+            content = f.read()
+
+        # a final line without its newline is always parsed again
+        last = pd.Timestamp(tail.last)
+        kept = previous.loc[previous.index < last] if tail.partial else previous
+
+        if content.strip() == b"":
+            return kept
 
-        length = len(df)
+        with timing.span("read_tail", size=len(content)):
+            df = self._read_file(io.BytesIO(header + content), EARLIEST, LATEST)
 
-        na = df.isna().any(axis=1)
-        if na.any():
+        df = self._normalize(df, symbol, DAILY)
+
+        if len(df) == 0:
+            return kept
+
+        if list(df.columns) != list(previous.columns):
+            return None
+
+        if not df.index.is_monotonic_increasing:
+            return None
+
+        if tail.partial and df.index[0] != last:
+            return None
+
+        if not tail.partial and df.index[0] <= last:
+            return None
+
+        return pd.concat([kept, df])
+
+
+def _read_request(
+    source: DataSource, request: ReadRequest, use_cache: bool
+) -> pd.DataFrame:
+    return source.read(
+        request.start,
+        request.end,
+        request.symbol,
+        request.frequency,
+        use_cache=use_cache,
+    )
+
+
+def read_many(
+    requests: Iterable[Tuple[DataSource, ReadRequest]],
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+    processes: bool = False,
+) -> Dict[Tuple[DataSource, ReadRequest], pd.DataFrame]:
+    # a read without its file is reported with its symbol and left out of the
+    # result, any other error of a read is raised to the caller instead of
+    # being reported, so that a broken file never passes for a missing one
+    requests = list(dict.fromkeys(requests))
+    if len(requests) == 0:
+        return {}
+
+    frames: Dict[Tuple[DataSource, ReadRequest], pd.DataFrame] = {}
+
+    def collect(
+        source: DataSource, request: ReadRequest, read: Callable[[], pd.DataFrame]
+    ) -> None:
+        try:
+            frames[(source, request)] = read()
+        except FileNotFoundError as err:
             pretty.color_print(
-                colors.PAPER_AMBER_300,
-                f"dropping {len(df.loc[na])} rows containing nan from {symbol.upper()}",
+                colors.PAPER_RED_400,
+                f"unable to read {request.symbol.upper()} "
+                f"from {type(source).__name__}: {err}",
             )
 
-            dropped_length = len(df.loc[na])
+    # the reads run one after another unless asked for worker processes,
+    # threads gain nothing over the parsing holding the interpreter lock
+    if not processes:
+        for s, r in requests:
+            collect(s, r, functools.partial(_read_request, s, r, use_cache))
 
-            df = df.dropna()
+        return frames
 
-            assert length == len(df) + dropped_length
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (s, r, executor.submit(_read_request, s, r, use_cache)) for s, r in requests
+        ]
 
-        return df.astype(np.float)
+        for source, request, future in futures:
+            collect(source, request, future.result)
+
+    return frames
 
 
 class AlphaVantage(DataSource):
+    _timestamp_formats = [
+        TimestampFormat(r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d", length=10),
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", "%Y-%m-%d %H:%M:%S", length=19
+        ),
+    ]
+
+    _endpoint = r"https://www.alphavantage.co/query"
+
+    # a compact response only carries the latest 100 bars
+    _compact_window = timedelta(days=100)
+
     def _url(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> str:
+        return self._query(symbol, frequency, "full")
+
+    def _query(self, symbol: str, frequency: FREQUENCY, outputsize: str) -> str:
 
         if not re.match(r"^[a-zA-Z]+$", symbol):
             raise ValueError(f"invalid symbol: {symbol}")
@@ -197,18 +630,16 @@ class AlphaVantage(DataSource):
         if os.getenv("ALPHA_VANTAGE") is None:
             raise ValueError("empty ALPHA_VANTAGE environment variable")
 
-        root = r"https://www.alphavantage.co/query"
-
         queries = [
             f"apikey={os.getenv('ALPHA_VANTAGE', '')}",
             f"symbol={symbol}",
             f"function={self._frequency(frequency)}",
             "interval=60min",
-            "outputsize=full",
+            f"outputsize={outputsize}",
             "datatype=csv",
         ]
 
-        url = f"{root}?{'&'.join(queries)}"
+        url = f"{self._endpoint}?{'&'.join(queries)}"
         return url
 
     def _timestamp_preprocessing(self, x: str) -> datetime:
@@ -219,6 +650,11 @@ class AlphaVantage(DataSource):
         else:
             return datetime.strptime(x, "%Y-%m-%d %H:%M:%S")
 
+    def _source_files(
+        self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
+    ) -> Optional[List[str]]:
+        return None
+
     def _frequency(self, freq: FREQUENCY) -> str:
         if freq == INTRADAY_60MINUTES:
             return "TIME_SERIES_INTRADAY"
@@ -234,11 +670,54 @@ class AlphaVantage(DataSource):
     def _read_data(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> pd.DataFrame:
-        df = pd.read_csv(self._datafeed(self._url(start, end, symbol, DAILY)))
+        url = self._url(start, end, symbol, DAILY)
+
+        cached = fetch.fetcher().cached(url)
+        if cached is not None:
+            df = self._update(url, cached.content, symbol)
+            if df is not None:
+                return df
+
+        df = pd.read_csv(self._datafeed(url))
+        return df
+
+    def _update(self, url: str, content: bytes, symbol: str) -> Optional[pd.DataFrame]:
+        # a recent full response only needs the latest bars on top of it
+        previous = pd.read_csv(io.BytesIO(content))
+        if len(previous) == 0:
+            return None
+
+        column = previous.columns[0]
+
+        newest = self._timestamp_preprocessing(str(previous.loc[:, column].max()))
+        if datetime.now() - newest > self._compact_window:
+            return None
+
+        compact = pd.read_csv(self._datafeed(self._query(symbol, DAILY, "compact")))
+        if len(compact) == 0 or list(compact.columns) != list(previous.columns):
+            return None
+
+        oldest = compact.loc[:, column].min()
+
+        # without any overlap a gap would be left between both responses
+        if oldest > previous.loc[:, column].max():
+            return None
+
+        df = pd.concat(
+            [compact, previous.loc[previous.loc[:, column] < oldest]],
+            ignore_index=True,
+        )
+
+        fetch.fetcher().store(url, df.to_csv(index=False).encode("utf-8"))
+
         return df
 
 
-class Yahoo(DataSource):
+class Yahoo(AppendableSource):
+    _timestamp_formats = [
+        TimestampFormat(r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d", length=10),
+    ]
+
     def _timestamp_preprocessing(self, x: str) -> datetime:
         return datetime.strptime(x, "%Y-%m-%d")
 
@@ -250,7 +729,14 @@ class Yahoo(DataSource):
     def _read_data(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> pd.DataFrame:
-        df = pd.read_csv(self._localfile(self._url(start, end, symbol, DAILY)))
+        return self._read_file(
+            self._localfile(self._url(start, end, symbol, DAILY)), start, end
+        )
+
+    def _read_file(
+        self, src: Union[str, io.IOBase], start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        df = self._read_csv(src, start, end, ("Date",))
         df = df.drop("Adj Close", axis=1)
 
         return df
@@ -261,7 +747,13 @@ class Yahoo(DataSource):
         return df.rename(columns=cols)
 
 
-class StockCharts(DataSource):
+class StockCharts(AppendableSource):
+    _timestamp_formats = [
+        TimestampFormat(r"^\d{2}-\d{2}-\d{4}$", "%m-%d-%Y", length=10),
+    ]
+
+    _header_lines = 2
+
     def _timestamp_preprocessing(self, x: str) -> datetime:
         return datetime.strptime(x, "%m-%d-%Y")
 
@@ -273,15 +765,24 @@ class StockCharts(DataSource):
     def _read_data(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> pd.DataFrame:
-        with open(self._localfile(self._url(start, end, symbol, DAILY)), "r") as f:
-            lines = f.readlines()
-
-        content = "\n".join([re.subn(r"\s+", ",", l.strip())[0] for l in lines])
-        data = io.StringIO(content)
+        return self._read_file(
+            self._localfile(self._url(start, end, symbol, DAILY)), start, end
+        )
 
-        df = pd.read_csv(data)
+    def _read_file(
+        self, src: Union[str, io.IOBase], start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        # the row right below the column names is a line of dashes
+        df = self._read_csv(
+            src,
+            start,
+            end,
+            ("Date",),
+            sep=r"\s+",
+            engine="c",
+            skiprows=[1],
+        )
 
-        df = df.drop(0)
         df = df.drop("Day", axis=1)
 
         return df
@@ -293,6 +794,12 @@ class StockCharts(DataSource):
 
 
 class InvestingCom(DataSource):
+    _timestamp_formats = [
+        TimestampFormat(r"^[A-Z][a-z]{2} \d{2}, \d{4}$", "%b %d, %Y", length=12),
+    ]
+
+    _volume_suffixes = {"K": 1e3, "M": 1e6, "B": 1e9}
+
     def _timestamp_preprocessing(self, x: str) -> datetime:
         return datetime.strptime(x, "%b %d, %Y")
 
@@ -304,38 +811,42 @@ class InvestingCom(DataSource):
     def _read_data(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> pd.DataFrame:
-        df = pd.read_csv(self._localfile(self._url(start, end, symbol, DAILY)))
-        df = df.drop("Change %", axis=1)
-
-        df.loc[:, "Vol."] = df.loc[:, "Vol."].apply(
-            lambda x: 0 if x == "-" or type(x) is str else x
-        )
-
-        df.loc[:, "Price"] = df.loc[:, "Price"].apply(
-            lambda x: x.replace(",", "") if type(x) is str and "," in x else x
-        )
-
-        df.loc[:, "Open"] = df.loc[:, "Open"].apply(
-            lambda x: x.replace(",", "") if type(x) is str and "," in x else x
-        )
-
-        df.loc[:, "High"] = df.loc[:, "High"].apply(
-            lambda x: x.replace(",", "") if type(x) is str and "," in x else x
-        )
-
-        df.loc[:, "Low"] = df.loc[:, "Low"].apply(
-            lambda x: x.replace(",", "") if type(x) is str and "," in x else x
+        df = self._read_csv(
+            self._localfile(self._url(start, end, symbol, DAILY)),
+            start,
+            end,
+            ("Date",),
+            usecols=lambda c: c != "Change %",
+            thousands=",",
+            na_values=["-"],
+            dtype={
+                "Date": str,
+                "Price": np.float64,
+                "Open": np.float64,
+                "High": np.float64,
+                "Low": np.float64,
+                "Vol.": str,
+            },
         )
 
-        df.loc[:, ["Price", "Open", "High", "Low", "Vol."]] = df.loc[
-            :, ["Price", "Open", "High", "Low", "Vol."]
-        ].astype(np.float)
+        df["Vol."] = self._decode_volume(df.loc[:, "Vol."])
 
         selector = df.loc[:, "Open"] <= 0
         df.loc[selector, "Open"] = df.loc[selector, "Price"]
 
         return df
 
+    def _decode_volume(self, volume: pd.Series) -> pd.Series:
+        # 1.25K, 3.40M, 1.02B, or a dash when there is no volume at all
+        volume = volume.str.replace(",", "", regex=False)
+
+        scale = volume.str[-1].map(self._volume_suffixes).fillna(1.0)
+        number = pd.to_numeric(
+            volume.str.rstrip("".join(self._volume_suffixes)), errors="coerce"
+        )
+
+        return (number * scale).fillna(0.0)
+
     def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         cols = {k: k.lower() for k in df.columns}
         cols["Date"] = "timestamp"
@@ -345,6 +856,13 @@ class InvestingCom(DataSource):
 
 
 class CryptoData(DataSource):
+    _timestamp_formats = [
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", "%Y-%m-%d %H:%M:%S", length=19
+        ),
+        TimestampFormat(r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d", length=10),
+    ]
+
     def _timestamp_preprocessing(self, x: str) -> datetime:
         m = re.match(r"(\d{4}-\d{2}-\d{2})(\s\d{2}:\d{2}:\d{2})*", x)
         assert m is not None
@@ -362,8 +880,12 @@ class CryptoData(DataSource):
     def _read_data(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> pd.DataFrame:
-        df = pd.read_csv(
-            self._localfile(self._url(start, end, symbol, DAILY)), header=1
+        df = self._read_csv(
+            self._localfile(self._url(start, end, symbol, DAILY)),
+            start,
+            end,
+            ("date",),
+            header=1,
         )
         df = df.drop("unix", axis=1)
         df = df.drop("symbol", axis=1)
@@ -398,6 +920,15 @@ class CryptoData(DataSource):
 
 
 class CoinAPI(DataSource):
+    _timestamp_formats = [
+        TimestampFormat(
+            r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.0000000Z$",
+            "%Y-%m-%dT%H:%M:%S",
+            length=28,
+            width=19,
+        ),
+    ]
+
     def _timestamp_preprocessing(self, x: str) -> datetime:
         # 2020-12-02T00:00:00.0000000Z
         m = re.match(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})\.[0]+Z$", x)
@@ -417,28 +948,105 @@ class CoinAPI(DataSource):
         elif frequency == INTRADAY_60MINUTES:
             return os.path.join("coinapi", f"{symbol}@60m")
 
+    # bump whenever the layout of the consolidated pages changes
+    _consolidated_version = 1
+
+    def _consolidated_path(self, root: str) -> str:
+        home = os.getenv("HOME")
+        assert home is not None
+
+        return os.path.join(
+            home, "Documents", "data_cache", "coinapi", f"{os.path.basename(root)}.pkl"
+        )
+
+    def _read_page(self, path: str) -> pd.DataFrame:
+        return pd.read_json(path)
+
+    def _read_pages(self, root: str) -> Optional[pd.DataFrame]:
+        pages: Dict[str, Tuple[int, int]] = {}
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    pages[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+        if len(pages) == 0:
+            return None
+
+        path = self._consolidated_path(root)
+
+        consolidated = None
+        manifest: Dict[str, Tuple[int, int]] = {}
+        if os.path.exists(path):
+            try:
+                stored = pd.read_pickle(path)
+                if stored["version"] == self._consolidated_version:
+                    consolidated = stored["frame"]
+                    manifest = stored["pages"]
+            except (OSError, ValueError, KeyError, EOFError) as err:
+                pretty.color_print(
+                    colors.PAPER_AMBER_300,
+                    f"dropping unreadable consolidated pages {path}: {err}",
+                )
+
+        # consolidated pages that were modified or removed invalidate the
+        # whole consolidation, pages only ever get added in the usual case
+        if any(pages.get(name) != tuple(stat) for name, stat in manifest.items()):
+            consolidated = None
+            manifest = {}
+
+        added = sorted(name for name in pages.keys() if name not in manifest)
+        if len(added) == 0 and consolidated is not None:
+            return consolidated
+
+        with ThreadPoolExecutor() as executor:
+            frames = list(
+                executor.map(
+                    self._read_page, [os.path.join(root, name) for name in added]
+                )
+            )
+
+        if consolidated is not None:
+            frames.insert(0, consolidated)
+
+        # concatenate once, later pages win over earlier ones on overlaps
+        df = pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset="time_period_start", keep="last")
+        df = df.sort_values("time_period_start", ignore_index=True)
+
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pd.to_pickle(
+                {
+                    "version": self._consolidated_version,
+                    "pages": {name: pages[name] for name in sorted(pages.keys())},
+                    "frame": df,
+                },
+                tmp,
+            )
+            os.replace(tmp, path)
+        except OSError as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300,
+                f"unable to write consolidated pages {path}: {err}",
+            )
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        return df
+
     def _read_data(
         self, start: datetime, end: datetime, symbol: str, frequency: FREQUENCY
     ) -> pd.DataFrame:
 
         root = self._localfile(self._url(start, end, symbol, frequency))
 
-        files = os.listdir(root)
-        files.sort()
-
-        df = None
-        for f in files:
-            path = os.path.join(root, f)
-            if df is None:
-                df = pd.read_json(path)
-            else:
-                df = df.append(pd.read_json(path))
-
+        df = self._read_pages(root)
         if df is None:
             raise ValueError(f"no files for symbol: {symbol}")
 
-        assert df is not None
-
         assert (
             len(df.loc[:, "time_period_start"])
             == df.loc[:, "time_period_start"].nunique()
@@ -0,0 +1,67 @@
+import io
+import os
+import re
+import tempfile
+from unittest import mock
+
+import pandas as pd
+from Fun.data.barchart import BarchartContract
+from Fun.data.source import DAILY, EARLIEST, LATEST, ReadRequest, StockCharts
+from Fun.utils.benchmark import compare
+from Fun.utils.testing import random_quotes, write_barchart, write_stockcharts
+
+
+def stockcharts_lines(path: str) -> pd.DataFrame:
+    # the reader StockCharts used before parsing straight from the file
+    with open(path, "r") as f:
+        lines = f.readlines()
+
+    content = "\n".join([re.subn(r"\s+", ",", l.strip())[0] for l in lines])
+    df = pd.read_csv(io.StringIO(content))
+
+    df = df.drop(0)
+    return df.drop("Day", axis=1)
+
+
+if __name__ == "__main__":
+    src = StockCharts()
+
+    with tempfile.TemporaryDirectory() as home:
+        with mock.patch.dict(os.environ, {"HOME": home}):
+            # rvx style, every trading day since 1990
+            path = write_stockcharts(
+                home, "rvx", random_quotes(start="19900102", periods=8000)
+            )
+
+            compare(
+                "stockcharts, 8000 rows",
+                lambda: stockcharts_lines(path),
+                lambda: src._read_data(EARLIEST, LATEST, "rvx", 0),
+                repeat=5,
+                memory=True,
+            )
+
+            # a chain of quarterly contracts, roughly what a continuous
+            # contract over a decade reads
+            chain = BarchartContract()
+            requests = []
+            for i, year in enumerate(range(10, 20)):
+                for month in "hmuz":
+                    code = f"zn{month}{year:02d}"
+                    write_barchart(
+                        home,
+                        os.path.join("continuous", "zn"),
+                        code,
+                        random_quotes(start=f"20{year:02d}0101", periods=500, seed=i),
+                    )
+                    requests.append(ReadRequest(EARLIEST, LATEST, code, DAILY))
+
+            compare(
+                f"barchart contracts, {len(requests)} files, processes",
+                lambda: [
+                    chain.read(r.start, r.end, r.symbol, r.frequency, use_cache=False)
+                    for r in requests
+                ],
+                lambda: chain.read_many(requests, use_cache=False, processes=True),
+                repeat=3,
+            )
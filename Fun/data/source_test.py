@@ -1,19 +1,44 @@
 import os
 import unittest
 from datetime import datetime
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 from Fun.data.barchart import Barchart, BarchartContract
+from Fun.data.cache import FrameCache
 from Fun.data.source import (
+    COMPACT,
     DAILY,
+    EARLIEST,
+    FLOAT64,
+    LATEST,
+    MONTHLY,
     WEEKLY,
     CoinAPI,
+    DataSource,
     CryptoData,
     InvestingCom,
+    ReadRequest,
     StockCharts,
     Yahoo,
+    read_many,
+)
+from Fun.plotter.indicator import (
+    BollingerBand,
+    ExponentialMovingAverage,
+    SimpleMovingAverage,
 )
 from Fun.utils import colors, pretty
+from Fun.utils.testing import (
+    HomeTestCase,
+    parameterized,
+    random_quotes,
+    write_barchart,
+    write_coinapi,
+    write_stockcharts,
+    write_yahoo,
+)
 
 
 class TestSource(unittest.TestCase):
@@ -182,5 +207,292 @@ class TestSource(unittest.TestCase):
             )
 
 
+class TestReadRange(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        quotes = random_quotes(start="19900102", periods=8000)
+
+        write_yahoo(self._home.name, "spx", quotes)
+        # barchart historic files are written newest first
+        write_barchart(self._home.name, "barchart", "vix", quotes.iloc[::-1])
+        write_stockcharts(self._home.name, "rvx", quotes)
+
+    @parameterized(
+        [
+            {"source": Yahoo(), "symbol": "spx", "frequency": DAILY},
+            {"source": Yahoo(), "symbol": "spx", "frequency": WEEKLY},
+            {"source": Yahoo(), "symbol": "spx", "frequency": MONTHLY},
+            {"source": Barchart(), "symbol": "vix", "frequency": DAILY},
+            {"source": Barchart(), "symbol": "vix", "frequency": WEEKLY},
+            {"source": StockCharts(), "symbol": "rvx", "frequency": DAILY},
+        ]
+    )
+    def test_range(self, source, symbol, frequency):
+        DataSource._cache = FrameCache()
+        DataSource._cache.clear()
+
+        start = datetime(2005, 3, 9)
+        end = datetime(2005, 9, 9)
+
+        full = source.read(EARLIEST, LATEST, symbol, frequency, use_cache=False)
+
+        wstart, wend = source._window(start, end, frequency)
+        expected = full.loc[wstart:wend]
+
+        self.assertLessEqual(expected.index[0], start)
+        self.assertGreaterEqual(expected.index[-1], end.replace(day=1))
+
+        for use_cache in (False, True, True):
+            df = source.read(start, end, symbol, frequency, use_cache=use_cache)
+            self.assertTrue(expected.equals(df))
+
+        self.assertEqual(DataSource._cache.statistic()["hits"], 1)
+
+    def test_stockcharts(self):
+        df = StockCharts().read(EARLIEST, LATEST, "rvx", DAILY, use_cache=False)
+
+        expected = random_quotes(start="19900102", periods=8000)
+        columns = ["open", "high", "low", "close", "volume"]
+
+        self.assertTrue(df.index.equals(expected.index))
+        self.assertTrue(
+            (df.loc[:, columns] == expected.loc[:, columns]).all(axis=None)
+        )
+
+
+class TestInvestingCom(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        root = os.path.join(
+            self._home.name, "Documents", "data_source", "investing.com"
+        )
+        os.makedirs(root, exist_ok=True)
+
+        with open(os.path.join(root, "jniv.csv"), "w") as f:
+            f.write('"Date","Price","Open","High","Low","Vol.","Change %"\n')
+            f.write(
+                '"Jan 08, 2021","1,234.50","1,230.00","1,240.25","1,220.75","1.25K","0.50%"\n'
+            )
+            f.write('"Jan 07, 2021","20.10","0.00","21.00","19.50","-","-1.20%"\n')
+            f.write('"Jan 06, 2021","20.35","20.00","20.90","19.80","3.40M","0.10%"\n')
+            f.write('"Jan 05, 2021","20.31","20.10","20.50","20.00","1.02B","0.00%"\n')
+            f.write('"Jan 04, 2021","20.30","20.20","20.40","20.10","512","0.00%"\n')
+            f.write('"Dec 31, 2020","20.25","20.20","20.30","20.10","n/a","0.00%"\n')
+
+    def test_read(self):
+        df = InvestingCom().read(EARLIEST, LATEST, "jniv", DAILY, use_cache=False)
+
+        self.assertListEqual(
+            list(df.columns), ["close", "open", "high", "low", "volume"]
+        )
+        self.assertEqual(df.index[0], datetime(2020, 12, 31))
+        self.assertEqual(df.index[-1], datetime(2021, 1, 8))
+
+        self.assertListEqual(
+            df.loc[:, "volume"].tolist(), [0.0, 512.0, 1.02e9, 3.4e6, 0.0, 1250.0]
+        )
+
+        self.assertEqual(df.loc[datetime(2021, 1, 8), "close"], 1234.5)
+        self.assertEqual(df.loc[datetime(2021, 1, 8), "low"], 1220.75)
+
+        # missing opens fall back to the close
+        self.assertEqual(df.loc[datetime(2021, 1, 7), "open"], 20.1)
+
+
+class TestCoinAPIPages(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self._quotes = random_quotes(start="20180101", periods=900, freq="D")
+
+        for i in range(0, 600, 100):
+            write_coinapi(
+                self._home.name, "btc", f"{i:04d}", self._quotes.iloc[i : i + 100]
+            )
+
+    def _read(self, source):
+        return source.read(EARLIEST, LATEST, "btc", DAILY, use_cache=False)
+
+    def test_incremental(self):
+        source = CoinAPI()
+
+        with mock.patch.object(
+            CoinAPI, "_read_page", autospec=True, side_effect=CoinAPI._read_page
+        ) as page:
+            df = self._read(source)
+            self.assertEqual(page.call_count, 6)
+            self.assertEqual(len(df), 600)
+
+            self._read(source)
+            self.assertEqual(page.call_count, 6)
+
+            # overlapping pages are merged, the newest page wins
+            overlap = self._quotes.iloc[550:900].copy()
+            overlap.loc[:, "close"] = overlap.loc[:, "high"]
+            write_coinapi(self._home.name, "btc", "0600", overlap)
+
+            df = self._read(source)
+            self.assertEqual(page.call_count, 7)
+
+        self.assertEqual(len(df), 900)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertTrue(
+            (df.loc[:, "close"].values[550:] == overlap.loc[:, "high"].values).all()
+        )
+        self.assertTrue(
+            (
+                df.loc[:, "close"].values[:550]
+                == self._quotes.loc[:, "close"].values[:550]
+            ).all()
+        )
+
+    def test_modified(self):
+        source = CoinAPI()
+
+        self._read(source)
+
+        path = write_coinapi(self._home.name, "btc", "0000", self._quotes.iloc[:50])
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with mock.patch.object(
+            CoinAPI, "_read_page", autospec=True, side_effect=CoinAPI._read_page
+        ) as page:
+            df = self._read(source)
+            self.assertEqual(page.call_count, 6)
+
+        self.assertEqual(len(df), 550)
+
+
+class TestReadMany(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        for i, symbol in enumerate(("spx", "compq", "sml")):
+            write_yahoo(self._home.name, symbol, random_quotes(seed=i))
+
+        write_barchart(self._home.name, "barchart", "es", random_quotes(seed=3))
+
+    @parameterized([{"processes": False}, {"processes": True}])
+    def test_read_many(self, processes):
+        start = datetime(2001, 1, 1)
+        end = datetime(2003, 1, 1)
+
+        requests = [
+            ReadRequest(start, end, symbol, frequency)
+            for symbol in ("spx", "compq", "sml", "missing")
+            for frequency in (DAILY, WEEKLY)
+        ]
+
+        frames = Yahoo().read_many(requests, processes=processes)
+
+        self.assertEqual(len(frames), 6)
+        self.assertNotIn(ReadRequest(start, end, "missing", DAILY), frames)
+
+        for r, df in frames.items():
+            expected = Yahoo().read(r.start, r.end, r.symbol, r.frequency)
+            self.assertTrue(df.equals(expected))
+
+    @parameterized([{"processes": False}, {"processes": True}])
+    def test_error(self, processes):
+        request = ReadRequest(EARLIEST, LATEST, "spx", DAILY)
+
+        # a missing file is left out, a broken file is raised to the caller
+        path = os.path.join(
+            self._home.name, "Documents", "data_source", "yahoo", "spx.csv"
+        )
+        with open(path, "w") as f:
+            f.write("Date,Open\nnot a date,1.0\n")
+
+        with self.assertRaises(KeyError):
+            Yahoo().read_many([request], processes=processes)
+
+    def test_mixed_sources(self):
+        yahoo = Yahoo()
+        barchart = Barchart()
+
+        request = ReadRequest(EARLIEST, LATEST, "es", DAILY)
+
+        frames = read_many(
+            [
+                (barchart, request),
+                (yahoo, request),
+                (yahoo, ReadRequest(EARLIEST, LATEST, "spx", DAILY)),
+            ]
+        )
+
+        self.assertListEqual(
+            list(frames.keys()),
+            [(barchart, request), (yahoo, ReadRequest(EARLIEST, LATEST, "spx", DAILY))],
+        )
+        self.assertTrue(
+            frames[(barchart, request)].equals(
+                barchart.read(EARLIEST, LATEST, "es", DAILY)
+            )
+        )
+
+
+class TestDtypePolicy(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_yahoo(self._home.name, "spx", random_quotes(periods=3000))
+
+        quotes = random_quotes(start="20180101", periods=600, freq="D", seed=1)
+        quotes.loc[:, "volume"] /= 7.0
+        write_coinapi(self._home.name, "btc", "0000", quotes)
+
+    @parameterized([{"frequency": DAILY}, {"frequency": WEEKLY}])
+    def test_compact(self, frequency):
+        full = Yahoo().read(EARLIEST, LATEST, "spx", frequency)
+        compact = Yahoo(dtype_policy=COMPACT).read(EARLIEST, LATEST, "spx", frequency)
+
+        self.assertTrue((full.dtypes == np.float64).all())
+        self.assertTrue(pd.api.types.is_datetime64_dtype(compact.index))
+
+        for c in ("open", "high", "low", "close"):
+            self.assertEqual(compact.loc[:, c].dtype, np.float32)
+
+        self.assertEqual(compact.loc[:, "volume"].dtype, np.int32)
+
+        self.assertTrue(compact.index.equals(full.index))
+        self.assertTrue(np.allclose(compact.values, full.values, rtol=1e-6, atol=0))
+        self.assertLessEqual(
+            compact.memory_usage(index=False).sum(),
+            full.memory_usage(index=False).sum() / 2,
+        )
+
+        # the cache keeps the full precision frame for every policy
+        self.assertTrue(Yahoo().read(EARLIEST, LATEST, "spx", frequency).equals(full))
+
+    def test_fractional_volume(self):
+        full = CoinAPI().read(EARLIEST, LATEST, "btc", DAILY)
+        compact = CoinAPI(dtype_policy=COMPACT).read(EARLIEST, LATEST, "btc", DAILY)
+
+        self.assertEqual(compact.loc[:, "volume"].dtype, np.float32)
+        self.assertTrue(np.allclose(compact.values, full.values, rtol=1e-6, atol=0))
+
+    def test_indicators(self):
+        full = Yahoo(dtype_policy=FLOAT64).read(EARLIEST, LATEST, "spx", DAILY)
+        compact = Yahoo(dtype_policy=COMPACT).read(EARLIEST, LATEST, "spx", DAILY)
+
+        for indicator in (
+            lambda quotes: SimpleMovingAverage(n=20, quotes=quotes),
+            lambda quotes: ExponentialMovingAverage(n=20, quotes=quotes),
+            lambda quotes: BollingerBand(n=20, m=2.0, quotes=quotes),
+        ):
+            expected = indicator(full)._calculate()
+            calculated = indicator(compact)._calculate()
+
+            if isinstance(expected, pd.Series):
+                expected = [expected]
+                calculated = [calculated]
+
+            for e, c in zip(expected, calculated):
+                self.assertTrue(np.allclose(c, e, rtol=1e-5, atol=0, equal_nan=True))
+
+
 if __name__ == "__main__":
     unittest.main()
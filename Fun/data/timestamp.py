@@ -0,0 +1,94 @@
+import re
+from datetime import datetime, timedelta
+from typing import Callable, List, NamedTuple, Optional
+
+import pandas as pd
+
+
+class TimestampFormat(NamedTuple):
+    # regular expression a raw timestamp has to fully match
+    pattern: str
+    # format passed to pd.to_datetime
+    fmt: str
+    # when set, characters before `split` are parsed with `fmt` as the date
+    # and the remaining characters with `time_fmt` as the time of day
+    split: Optional[int] = None
+    time_fmt: Optional[str] = None
+    # exact length of every raw timestamp, None to skip the length check
+    length: Optional[int] = None
+    # only the first `width` characters are parsed, None to parse everything
+    width: Optional[int] = None
+    # shift applied after parsing
+    offset: timedelta = timedelta(0)
+    # drop the time of day after the shift
+    normalize: bool = False
+
+
+def sniff(
+    values: pd.Series, formats: List[TimestampFormat], samples: int = 16
+) -> Optional[TimestampFormat]:
+    if len(values) == 0:
+        return None
+
+    head = values.iloc[:samples].tolist()
+    tail = values.iloc[-samples:].tolist()
+
+    for f in formats:
+        regex = re.compile(f.pattern)
+        if all(type(x) is str and regex.match(x) is not None for x in head + tail):
+            return f
+
+    return None
+
+
+def _unique_to_datetime(values: pd.Series, fmt: str) -> pd.Series:
+    # dates and times of day repeat heavily in quotes files, parsing only the
+    # distinct values keeps strptime off the hot path
+    uniques = pd.unique(values.values)
+    parsed = pd.to_datetime(uniques, format=fmt, exact=True)
+    indexer = pd.Index(uniques).get_indexer(values.values)
+
+    return pd.Series(parsed[indexer], index=values.index)
+
+
+def convert(values: pd.Series, fmt: TimestampFormat) -> pd.Series:
+    if fmt.length is not None:
+        lengths = values.str.len()
+        if (lengths != fmt.length).any():
+            raise ValueError(f"mixed timestamp lengths for format: {fmt.fmt}")
+
+    if fmt.width is not None:
+        values = values.str.slice(0, fmt.width)
+
+    if fmt.split is not None and fmt.time_fmt is not None:
+        dates = _unique_to_datetime(values.str.slice(0, fmt.split), fmt.fmt)
+        times = _unique_to_datetime(values.str.slice(fmt.split), fmt.time_fmt)
+        converted = dates + (times - times.dt.normalize())
+    else:
+        converted = _unique_to_datetime(values, fmt.fmt)
+
+    if fmt.offset != timedelta(0):
+        converted = converted + fmt.offset
+
+    if fmt.normalize:
+        converted = converted.dt.normalize()
+
+    return converted
+
+
+def parse(
+    values: pd.Series,
+    formats: List[TimestampFormat],
+    fallback: Callable[[str], datetime],
+) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    fmt = sniff(values, formats)
+    if fmt is not None:
+        try:
+            return convert(values, fmt)
+        except (ValueError, TypeError):
+            pass
+
+    return values.apply(fallback)
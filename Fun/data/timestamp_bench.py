@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+from Fun.data import timestamp
+from Fun.data.barchart import Barchart
+from Fun.utils.benchmark import compare
+
+
+def intraday_timestamps(rows: int) -> pd.Series:
+    start = datetime(2010, 1, 4, 17, 0)
+    return pd.Series(
+        [(start + timedelta(minutes=15 * i)).strftime("%m/%d/%Y %H:%M") for i in range(rows)]
+    )
+
+
+def daily_timestamps(rows: int) -> pd.Series:
+    start = datetime(1990, 1, 2)
+    return pd.Series(
+        [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(rows)]
+    )
+
+
+if __name__ == "__main__":
+    src = Barchart()
+
+    for title, values in (
+        ("barchart historic 15 minutes, 200000 rows", intraday_timestamps(200000)),
+        ("barchart interactive daily, 10000 rows", daily_timestamps(10000)),
+    ):
+        compare(
+            title,
+            lambda: values.apply(src._timestamp_preprocessing),
+            lambda: timestamp.parse(
+                values, src._timestamp_formats, src._timestamp_preprocessing
+            ),
+            repeat=3,
+        )
@@ -0,0 +1,104 @@
+import unittest
+from datetime import datetime, timedelta
+
+import pandas as pd
+from Fun.data import timestamp
+from Fun.data.barchart import Barchart, BarchartOnDemand
+from Fun.data.source import (
+    AlphaVantage,
+    CoinAPI,
+    CryptoData,
+    InvestingCom,
+    StockCharts,
+    Yahoo,
+)
+from Fun.utils.testing import parameterized
+
+
+def _timestamps(fmt: str, rows: int = 200, step: timedelta = timedelta(hours=7)):
+    start = datetime(1998, 12, 30, 17, 0)
+    return pd.Series([(start + step * i).strftime(fmt) for i in range(rows)])
+
+
+class TestTimestamp(unittest.TestCase):
+    @parameterized(
+        [
+            {"source": Barchart(), "fmt": "%m/%d/%Y"},
+            {"source": Barchart(), "fmt": "%m/%d/%y"},
+            {"source": Barchart(), "fmt": "%m/%d/%Y %H:%M"},
+            {"source": Barchart(), "fmt": "%Y-%m-%d"},
+            {"source": Barchart(), "fmt": "%Y-%m-%d %H:%M:%S"},
+            {"source": Barchart(), "fmt": "%Y-%m-%dT%H:%M:%S-06:00"},
+            {"source": Barchart(), "fmt": "%Y-%m-%dT%H:%M:00Z"},
+            {"source": BarchartOnDemand(), "fmt": "%Y-%m-%dT%H:%M:%S-05:00"},
+            {"source": CoinAPI(), "fmt": "%Y-%m-%dT%H:%M:%S.0000000Z"},
+            {"source": CryptoData(), "fmt": "%Y-%m-%d %H:%M:%S"},
+            {"source": CryptoData(), "fmt": "%Y-%m-%d"},
+            {"source": InvestingCom(), "fmt": "%b %d, %Y"},
+            {"source": StockCharts(), "fmt": "%m-%d-%Y"},
+            {"source": AlphaVantage(), "fmt": "%Y-%m-%d"},
+            {"source": AlphaVantage(), "fmt": "%Y-%m-%d %H:%M:%S"},
+            {"source": Yahoo(), "fmt": "%Y-%m-%d"},
+        ]
+    )
+    def test_vectorized(self, source, fmt):
+        values = _timestamps(fmt)
+
+        self.assertIsNotNone(timestamp.sniff(values, source._timestamp_formats))
+
+        expected = pd.to_datetime(values.apply(source._timestamp_preprocessing))
+        parsed = timestamp.parse(
+            values, source._timestamp_formats, source._timestamp_preprocessing
+        )
+
+        self.assertTrue((expected == parsed).all())
+
+    def test_tradingview(self):
+        values = pd.Series(["2020-12-02T05:00:00Z", "2020-12-03T23:00:00Z"])
+
+        parsed = timestamp.parse(
+            values,
+            Barchart._timestamp_formats,
+            Barchart()._timestamp_preprocessing,
+        )
+
+        self.assertEqual(parsed.iloc[0], datetime(2020, 12, 1))
+        self.assertEqual(parsed.iloc[1], datetime(2020, 12, 3))
+
+    @parameterized(
+        [
+            {
+                "source": CryptoData(),
+                "values": ["2020-01-01", "2020-01-02 12:00:00", "2020-01-03"],
+            },
+            {
+                "source": Barchart(),
+                "values": ["01/02/2020", "01/03/20", "01/06/2020"],
+            },
+            {
+                "source": Barchart(),
+                "values": ["2020-01-02", "01/03/2020", "2020-01-06"],
+            },
+        ]
+    )
+    def test_mixed_fallback(self, source, values):
+        values = pd.Series(values)
+
+        expected = pd.to_datetime(values.apply(source._timestamp_preprocessing))
+        parsed = timestamp.parse(
+            values, source._timestamp_formats, source._timestamp_preprocessing
+        )
+
+        self.assertTrue((expected == pd.to_datetime(parsed)).all())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            timestamp.parse(
+                pd.Series(["yesterday"]),
+                Barchart._timestamp_formats,
+                Barchart()._timestamp_preprocessing,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
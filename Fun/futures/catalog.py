@@ -0,0 +1,168 @@
+import bisect
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from Fun.data.barchart import BarchartContractAggregated
+from Fun.data.source import EARLIEST, FREQUENCY, LATEST, DataSource
+
+_CONTRACT_CODE = re.compile(r"^(\w{2})([fghjkmnquvxz])(\d{2})$")
+_MONTH_CODES = "fghjkmnquvxz"
+
+# a directory changed this close to the last scan might still be changing
+# within the resolution of its mtime, it is scanned again the next time
+_RACY = 2.0
+
+
+def contract_key(code: str) -> Optional[int]:
+    # year * 100 + month of a barchart contract code, the same years
+    # Contract gives the code
+    match = _CONTRACT_CODE.match(code)
+    if match is None:
+        return None
+
+    year = 2000 + int(match.group(3))
+    if year > datetime.now().year + 1:
+        year -= 100
+
+    return year * 100 + _MONTH_CODES.index(match.group(2)) + 1
+
+
+class Listing(NamedTuple):
+    mtime: Optional[int]
+    scanned: float
+    # every file name of the directory without its extension
+    names: FrozenSet[str]
+    # parsed contract codes sorted by year and month
+    keys: List[int]
+    codes: List[str]
+
+
+_EMPTY = Listing(None, 0.0, frozenset(), [], [])
+
+
+class ContractCatalog:
+    def __init__(self, root: Optional[str] = None) -> None:
+        self._root = root
+
+        self._lock = threading.Lock()
+        self._listings: Dict[str, Listing] = {}
+
+        self._scans = 0
+
+    def root(self) -> str:
+        if self._root is not None:
+            return self._root
+
+        home = os.getenv("HOME")
+        assert home is not None
+
+        return os.path.join(home, "Documents", "data_source")
+
+    def directories(
+        self, src: DataSource, code: str, frequency: FREQUENCY
+    ) -> List[str]:
+        # the directories a contract of the source is read from, finer bars
+        # first for the sources building their bars from them
+        sources: List[Tuple[DataSource, FREQUENCY]] = []
+        if isinstance(src, BarchartContractAggregated):
+            sources.extend(src._finer_sources())
+
+        sources.append((src, frequency))
+
+        return [
+            os.path.join(
+                self.root(), os.path.dirname(s._url(EARLIEST, LATEST, code, f))
+            )
+            for s, f in sources
+        ]
+
+    def _scan(self, directory: str, mtime: int, previous: Listing) -> Listing:
+        names = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    names.add(os.path.splitext(entry.name)[0])
+
+        # only the names new to the directory are parsed
+        known = dict(zip(previous.codes, previous.keys))
+
+        parsed = []
+        for name in names:
+            key = known.get(name)
+            if key is None:
+                key = contract_key(name)
+
+            if key is not None:
+                parsed.append((key, name))
+
+        parsed.sort()
+
+        return Listing(
+            mtime,
+            time.time(),
+            frozenset(names),
+            [k for k, _ in parsed],
+            [c for _, c in parsed],
+        )
+
+    def listing(self, directory: str) -> Listing:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return _EMPTY
+
+        with self._lock:
+            cached = self._listings.get(directory, _EMPTY)
+
+        if cached.mtime == mtime and cached.scanned - mtime / 1e9 > _RACY:
+            return cached
+
+        listing = self._scan(directory, mtime, cached)
+
+        with self._lock:
+            self._listings[directory] = listing
+            self._scans += 1
+
+        return listing
+
+    def exists(self, src: DataSource, code: str, frequency: FREQUENCY) -> bool:
+        return any(
+            code in self.listing(d).names
+            for d in self.directories(src, code, frequency)
+        )
+
+    def between(
+        self,
+        src: DataSource,
+        symbol: str,
+        frequency: FREQUENCY,
+        start: datetime,
+        end: datetime,
+    ) -> List[str]:
+        # every contract of the symbol on disk expiring from the month of
+        # start through the month of end, oldest first
+        lo = start.year * 100 + start.month
+        hi = end.year * 100 + end.month
+
+        codes = set()
+        for d in self.directories(src, symbol, frequency):
+            listing = self.listing(d)
+
+            i = bisect.bisect_left(listing.keys, lo)
+            j = bisect.bisect_right(listing.keys, hi)
+
+            codes.update(c for c in listing.codes[i:j] if c.startswith(symbol))
+
+        return sorted(codes, key=lambda c: (contract_key(c), c))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+    def statistic(self) -> Dict[str, int]:
+        with self._lock:
+            return {"directories": len(self._listings), "scans": self._scans}
@@ -0,0 +1,180 @@
+import os
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from Fun.data import source
+from Fun.data.barchart import (
+    BarchartContract,
+    BarchartContract15Minutes,
+    BarchartContract60Minutes,
+)
+from Fun.data.source import DAILY, INTRADAY_15MINUTES, INTRADAY_60MINUTES
+from Fun.futures import catalog
+from Fun.futures.catalog import ContractCatalog, contract_key
+from Fun.futures.contract import BARCHART, FINANCIAL_CONTRACT_MONTHS, contract_list
+from Fun.utils.testing import HomeTestCase, parameterized, random_quotes, write_barchart
+
+# quarterly es contracts from march 2019 to march 2021
+EXPIRATIONS = {
+    f"es{m}{y:02d}": f"20{y:02d}{n:02d}15"
+    for y in (19, 20, 21)
+    for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+    if (y, n) <= (21, 3)
+}
+
+
+class TestContractCatalog(HomeTestCase):
+    _cache_capacity = 0
+
+    def setUp(self):
+        super().setUp()
+
+        for code in EXPIRATIONS.keys():
+            self._write(code)
+
+    def _write(self, code, directory="es", intraday=False):
+        return write_barchart(
+            self._home.name,
+            os.path.join("continuous", directory),
+            code,
+            random_quotes(periods=20, freq="H" if intraday else "B"),
+            intraday=intraday,
+        )
+
+    def _directory(self):
+        return os.path.join(
+            self._home.name, "Documents", "data_source", "continuous", "es"
+        )
+
+    def _settle(self):
+        # a directory changed long enough ago to be trusted
+        past = time.time() - 60
+        os.utime(self._directory(), (past, past))
+
+    @parameterized(
+        [
+            {"code": "esh20", "key": 202003},
+            {"code": "esz99", "key": 199912},
+            {"code": "clf21", "key": 202101},
+            {"code": "esh2020", "key": None},
+            {"code": "readme", "key": None},
+        ]
+    )
+    def test_contract_key(self, code, key):
+        self.assertEqual(contract_key(code), key)
+
+    def test_between(self):
+        c = ContractCatalog()
+
+        self.assertEqual(
+            c.between(
+                BarchartContract(),
+                "es",
+                DAILY,
+                datetime(2019, 6, 1),
+                datetime(2020, 3, 31),
+            ),
+            ["esm19", "esu19", "esz19", "esh20"],
+        )
+
+        self.assertEqual(
+            c.between(
+                BarchartContract(),
+                "es",
+                DAILY,
+                datetime(2030, 1, 1),
+                datetime(2031, 1, 1),
+            ),
+            [],
+        )
+
+        self.assertEqual(
+            c.between(
+                BarchartContract(),
+                "nq",
+                DAILY,
+                datetime(2019, 1, 1),
+                datetime(2021, 1, 1),
+            ),
+            [],
+        )
+
+    def test_refresh(self):
+        self._settle()
+
+        c = ContractCatalog()
+
+        self.assertFalse(c.exists(BarchartContract(), "esm21", DAILY))
+        self.assertTrue(c.exists(BarchartContract(), "esh21", DAILY))
+        self.assertEqual(c.statistic()["scans"], 1)
+
+        # an unchanged directory is never scanned again
+        self.assertTrue(c.exists(BarchartContract(), "esz20", DAILY))
+        self.assertEqual(c.statistic()["scans"], 1)
+
+        # a new contract moved in the way the download does it, only the new
+        # name is parsed
+        path = self._write("esm21", directory="incoming")
+        os.rename(path, os.path.join(self._directory(), "esm21.csv"))
+
+        with mock.patch.object(
+            catalog, "contract_key", wraps=catalog.contract_key
+        ) as keys:
+            self.assertTrue(c.exists(BarchartContract(), "esm21", DAILY))
+
+        self.assertEqual(c.statistic()["scans"], 2)
+        self.assertEqual([call.args[0] for call in keys.call_args_list], ["esm21"])
+
+        os.remove(os.path.join(self._directory(), "esh19.csv"))
+        self.assertFalse(c.exists(BarchartContract(), "esh19", DAILY))
+
+    def test_finer(self):
+        self._write("esh21", directory="es@15m", intraday=True)
+
+        c = ContractCatalog()
+
+        # hourly bars are built from the 15 minutes bars
+        self.assertTrue(
+            c.exists(BarchartContract60Minutes(), "esh21", INTRADAY_60MINUTES)
+        )
+        self.assertFalse(
+            c.exists(BarchartContract60Minutes(), "esz20", INTRADAY_60MINUTES)
+        )
+        self.assertTrue(
+            c.exists(BarchartContract15Minutes(), "esh21", INTRADAY_15MINUTES)
+        )
+
+    def test_contract_list(self):
+        # the chain ends at the first missing contract without trying to read
+        # anything past it
+        with mock.patch.object(
+            source, "_read_request", wraps=source._read_request
+        ) as reads, mock.patch.object(
+            ContractCatalog,
+            "between",
+            autospec=True,
+            side_effect=ContractCatalog.between,
+        ) as between, mock.patch.object(
+            ContractCatalog, "exists", autospec=True, side_effect=ContractCatalog.exists
+        ) as exists:
+            cs = contract_list(
+                start=datetime(2017, 1, 1),
+                end=datetime(2021, 1, 15),
+                symbol="es",
+                months=FINANCIAL_CONTRACT_MONTHS,
+                fmt=BARCHART,
+            )
+
+        self.assertEqual([c.code() for c in cs][-1], "esh19")
+        self.assertEqual(len(cs), 9)
+        self.assertEqual(reads.call_count, len(cs))
+
+        # the whole chain is found with a single lookup
+        self.assertEqual(between.call_count, 1)
+        self.assertEqual(exists.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,22 +1,31 @@
+import hashlib
 import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from Fun.data.barchart import (
     Barchart,
+    BarchartContract,
     BarchartContract15Minutes,
     BarchartContract30Minutes,
     BarchartContract60Minutes,
 )
+from Fun.data.cache import file_signature
 from Fun.data.source import (
     DAILY,
+    DTYPE_POLICY,
+    FLOAT64,
     FREQUENCY,
     INTRADAY_15MINUTES,
     INTRADAY_30MINUTES,
     INTRADAY_60MINUTES,
     MONTHLY,
     WEEKLY,
+    DataSource,
+    ReadRequest,
+    apply_dtype_policy,
     daily_to_monthly,
     daily_to_weekly,
 )
@@ -28,19 +37,180 @@ from Fun.futures.contract import (
     FINANCIAL_CONTRACT_MONTHS,
     Contract,
     contract_list,
+    existing_contracts,
+    read_contracts,
 )
 from Fun.futures.rolling import (
+    ADJUSTMENT_METHOD,
     DIFFERENCE,
     RATIO,
     FirstOfMonth,
     LastNTradingDays,
     RollingMethod,
     VolumeAndOpenInterest,
+    apply_adjustment,
+    neutral_adjustment,
 )
-from Fun.utils import colors, pretty
+from Fun.futures.schedule import SCHEDULE_VERSION, RollSchedule
+from Fun.utils import colors, pretty, timing
+
+PRICES = ("open", "high", "low", "close")
+
+
+def segments(
+    rolling_dates: List[datetime],
+) -> List[Tuple[datetime, Optional[datetime]]]:
+    # the span every contract makes up in the link, from its lower bound up
+    # to the rolling date into the newer contract, the front contract runs on
+    # without any upper bound
+
+    # rows before any later rolling date never make it into the link
+    lower = list(rolling_dates)
+    for i in range(len(lower) - 2, -1, -1):
+        lower[i] = max(lower[i], lower[i + 1])
+
+    return [
+        (lower[i], rolling_dates[i - 1] if i > 0 else None)
+        for i in range(len(rolling_dates))
+    ]
+
+
+def slices(
+    frames: List[Optional[pd.DataFrame]], rolling_dates: List[datetime]
+) -> List[Optional[pd.DataFrame]]:
+    # the rows every contract makes up in the link, sorted, a contract left
+    # unread as None stays None
+    assert len(frames) == len(rolling_dates)
+
+    parts: List[Optional[pd.DataFrame]] = []
+    for (lower, upper), df in zip(segments(rolling_dates), frames):
+        if df is None:
+            parts.append(None)
+            continue
+
+        index = df.index
+
+        if index.is_monotonic_increasing:
+            lo = index.searchsorted(pd.Timestamp(lower), side="left")
+            hi = len(index)
+            if upper is not None:
+                hi = index.searchsorted(pd.Timestamp(upper), side="left")
+
+            parts.append(df.iloc[lo:hi])
+        else:
+            selector = index >= lower
+            if upper is not None:
+                selector &= index < upper
+
+            parts.append(df.loc[selector].sort_index())
+
+    return parts
+
+
+class ContinuousSeries:
+    # the unadjusted link together with the contract every row comes from,
+    # any adjustment is applied to every price of the link at once and only
+    # when it is asked for, the frames handed out are never modified in place
+    def __init__(
+        self,
+        frames: List[Optional[pd.DataFrame]],
+        rolling_dates: List[datetime],
+        rolls: Callable[[ADJUSTMENT_METHOD], List[Optional[float]]],
+        finish: Callable[[pd.DataFrame], pd.DataFrame] = lambda df: df,
+    ) -> None:
+        parts = slices(frames, rolling_dates)
+
+        # oldest contract first, the link comes out sorted with a single copy
+        kept = [i for i in range(len(parts) - 1, -1, -1) if parts[i] is not None]
+        assert len(kept) > 0
+
+        link = pd.concat([parts[i] for i in kept])
+        contracts = np.repeat(kept, [len(parts[i]) for i in kept])
+
+        if not link.index.is_monotonic_increasing:
+            order = link.index.argsort()
+            link = link.iloc[order]
+            contracts = contracts[order]
+
+        self._link = link
+        self._contracts = contracts
+
+        self._prices = [c for c in link.columns if c in PRICES]
+        assert len({link.loc[:, c].dtype for c in self._prices}) <= 1
+
+        # every price of the link in a single block, one row per column
+        self._block = np.vstack([link.loc[:, c].values for c in self._prices])
+
+        self._rolls = rolls
+        self._finish = finish
+
+        self._adjustments: Dict[ADJUSTMENT_METHOD, np.ndarray] = {}
+        self._materialized: Dict[ADJUSTMENT_METHOD, pd.DataFrame] = {}
+
+    def raw(self) -> pd.DataFrame:
+        return self._link
+
+    def contracts(self) -> np.ndarray:
+        # the position in the chain of the contract every row comes from, the
+        # front contract is 0
+        return self._contracts
+
+    def adjustments(self, adjustment_method: ADJUSTMENT_METHOD) -> np.ndarray:
+        # the adjustment accumulated up to every contract of the chain
+        adjustments = self._adjustments.get(adjustment_method)
+        if adjustments is None:
+            neutral = neutral_adjustment(adjustment_method)
+
+            adjustments = np.array(
+                [
+                    a if a is not None else neutral
+                    for a in self._rolls(adjustment_method)
+                ],
+                dtype=np.float64,
+            )
+            self._adjustments[adjustment_method] = adjustments
+
+        return adjustments
+
+    def materialize(self, adjustment_method: ADJUSTMENT_METHOD) -> pd.DataFrame:
+        df = self._materialized.get(adjustment_method)
+        if df is not None:
+            return df
+
+        with timing.span("materialize", adjustment=adjustment_method):
+            factors = self.adjustments(adjustment_method)[self._contracts]
+
+            # a neutral adjustment leaves the prices of the front contract
+            # exactly as they are
+            block = apply_adjustment(
+                self._block,
+                factors.astype(self._block.dtype)[np.newaxis, :],
+                adjustment_method,
+            )
+
+            data = {c: self._link.loc[:, c].values for c in self._link.columns}
+            for i, c in enumerate(self._prices):
+                data[c] = block[i]
+
+            df = self._finish(
+                pd.DataFrame(data, index=self._link.index, columns=self._link.columns)
+            )
+
+        self._materialized[adjustment_method] = df
+
+        return df
 
 
 class ContinuousContract:
+    _schedule: RollSchedule = RollSchedule()
+
+    def __init__(self, dtype_policy: DTYPE_POLICY = FLOAT64) -> None:
+        self._dtype_policy = dtype_policy
+
+    @classmethod
+    def schedule(cls) -> RollSchedule:
+        return cls._schedule
+
     @classmethod
     def _default_contract_months(cls, symbol: str) -> CONTRACT_MONTHS:
         months: CONTRACT_MONTHS
@@ -99,86 +269,280 @@ class ContinuousContract:
             # return FirstOfMonth(adjustment_method=RATIO)
             # return LastNTradingDays(offset=2, adjustment_method=RATIO)
 
-    def _read_intraday_contract(
+    def _rolling_dates(
+        self,
+        contracts: List[Contract],
+        rolling_method: RollingMethod,
+        hour: Optional[int] = None,
+    ) -> Tuple[List[datetime], List[Optional[float]]]:
+        # the rolling date into every contract together with the adjustment
+        # accumulated up to it, the front contract is never adjusted
+        rolling_dates = []
+        adjustments: List[Optional[float]] = [None]
+
+        for roll in self._schedule.rolls(contracts, rolling_method):
+            rolling_method.accumulate(roll.adjustment)
+
+            rolling_dates.append(roll.date)
+            adjustments.append(rolling_method.adjustment())
+
+        p = contracts[-1].previous_contract(read_data=False)
+        rolling_dates.append(datetime(year=p.year(), month=p.month(), day=1))
+
+        if hour is not None:
+            rolling_dates = [r.replace(hour=hour) for r in rolling_dates]
+
+        return rolling_dates, adjustments
+
+    def _chain(
         self,
         start: datetime,
         end: datetime,
         symbol: str,
         frequency: FREQUENCY,
-        daily_contracts: List[Contract],
-        contract_months: Optional[CONTRACT_MONTHS] = None,
-        rolling_method: Optional[RollingMethod] = None,
-    ) -> pd.DataFrame:
+        contract_months: CONTRACT_MONTHS,
+        read_data: bool = True,
+    ) -> List[Contract]:
+        intraday = frequency in (
+            INTRADAY_15MINUTES,
+            INTRADAY_30MINUTES,
+            INTRADAY_60MINUTES,
+        )
 
-        assert contract_months is not None
-        assert rolling_method is not None
+        with timing.span("contracts"):
+            # an intraday link needs nothing but the daily rolls, the daily
+            # contracts are only checked to be there
+            cs = existing_contracts(
+                contract_list(
+                    start=start,
+                    end=end,
+                    symbol=symbol,
+                    months=contract_months,
+                    fmt=BARCHART,
+                    read_data=False,
+                    src=BarchartContract(dtype_policy=self._dtype_policy),
+                )
+            )
 
-        src: Barchart = BarchartContract60Minutes()
+            if read_data and not intraday:
+                cs = read_contracts(cs)
+
+        if len(cs) == 0:
+            raise ValueError("empty contract list")
+
+        return cs
+
+    def _intraday_requests(
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        daily_contracts: List[Contract],
+        rolling_dates: List[datetime],
+        contract_months: CONTRACT_MONTHS,
+        window: Optional[Tuple[datetime, datetime]] = None,
+    ) -> List[Optional[Tuple[DataSource, ReadRequest]]]:
+        src: Barchart = BarchartContract60Minutes(dtype_policy=self._dtype_policy)
 
         if frequency == INTRADAY_30MINUTES:
-            src = BarchartContract30Minutes()
+            src = BarchartContract30Minutes(dtype_policy=self._dtype_policy)
 
         if frequency == INTRADAY_15MINUTES:
-            src = BarchartContract15Minutes()
+            src = BarchartContract15Minutes(dtype_policy=self._dtype_policy)
 
-        hourly_contracts = contract_list(
+        intraday_contracts = contract_list(
             start=start,
             end=end,
             symbol=symbol,
             months=contract_months,
             fmt=BARCHART,
-            read_data=True,
+            read_data=False,
             src=src,
             frequency=frequency,
+        )[: len(daily_contracts)]
+
+        # only the contracts with a span in the window are read at all
+        requests: List[Optional[Tuple[DataSource, ReadRequest]]] = []
+        for c, (lower, upper) in zip(intraday_contracts, segments(rolling_dates)):
+            if window is not None and (
+                lower > window[1] or (upper is not None and upper <= window[0])
+            ):
+                requests.append(None)
+            else:
+                requests.append((c.source(), c.read_request()))
+
+        return requests
+
+    def _intraday_frames(
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        daily_contracts: List[Contract],
+        rolling_dates: List[datetime],
+        contract_months: CONTRACT_MONTHS,
+        window: Optional[Tuple[datetime, datetime]] = None,
+    ) -> List[Optional[pd.DataFrame]]:
+        requests = self._intraday_requests(
+            start=start,
+            end=end,
+            symbol=symbol,
+            frequency=frequency,
+            daily_contracts=daily_contracts,
+            rolling_dates=rolling_dates,
+            contract_months=contract_months,
+            window=window,
         )
 
-        daily_length = len(daily_contracts)
+        with timing.span("contracts"):
+            frames = Contract.cache().read_many(r for r in requests if r is not None)
+
+        # a contract within the window is never skipped, the link would have
+        # a gap in the middle
+        missing = [r for r in requests if r is not None and r not in frames]
+        if len(missing) > 0:
+            msg = (
+                f"unable to read {', '.join(r.symbol.upper() for _, r in missing)} "
+                "within the window"
+            )
+            pretty.color_print(colors.PAPER_RED_400, msg)
+            raise FileNotFoundError(msg)
+
+        if len(frames) == 0:
+            msg = f"no {symbol.upper()} contract within the window"
+            pretty.color_print(colors.PAPER_AMBER_300, msg)
+            raise ValueError(msg)
+
+        return [frames[r] if r is not None else None for r in requests]
+
+    def _finish(
+        self, link: pd.DataFrame, symbol: str, frequency: FREQUENCY
+    ) -> pd.DataFrame:
+        if frequency in (INTRADAY_15MINUTES, INTRADAY_30MINUTES, INTRADAY_60MINUTES):
+            return apply_dtype_policy(link, self._dtype_policy)
+
+        if frequency == WEEKLY:
+            link = daily_to_weekly(link, key=f"continuous_{symbol}")
+        elif frequency == MONTHLY:
+            link = daily_to_monthly(link, key=f"continuous_{symbol}")
+
+        length = len(link)
+
+        na = link.isna().any(axis=1)
+        if na.any():
+            pretty.color_print(
+                colors.PAPER_AMBER_300,
+                f"dropping {len(link.loc[na])} rows containing nan from {symbol.upper()}",
+            )
+
+            dropped_length = len(link.loc[na])
+
+            link = link.dropna()
+
+            assert length == len(link) + dropped_length
 
-        split_hour = 16
+        return apply_dtype_policy(link, self._dtype_policy)
 
-        rolling_date = rolling_method.rolling_date(
-            daily_contracts[1], daily_contracts[0]
+    def _series(
+        self,
+        cs: List[Contract],
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        contract_months: CONTRACT_MONTHS,
+        rolling_method: RollingMethod,
+        window: Optional[Tuple[datetime, datetime]] = None,
+        rolling: Optional[Tuple[List[datetime], List[Optional[float]]]] = None,
+    ) -> ContinuousSeries:
+        intraday = frequency in (
+            INTRADAY_15MINUTES,
+            INTRADAY_30MINUTES,
+            INTRADAY_60MINUTES,
         )
 
-        rolling_date = rolling_date.replace(hour=split_hour)
+        split_hour = 16 if intraday else None
 
-        link: pd.DataFrame
-        for i in range(daily_length):
-            df = hourly_contracts[i].dataframe()
-            if i == 0:
-                link = df.loc[df.index >= rolling_date].sort_index(ascending=False)
-                continue
-            else:
-                part = df.loc[(df.index < rolling_date)].sort_index(ascending=False)
+        # the daily rolls come out of the schedule, a daily contract is only
+        # read for a roll the schedule does not have yet
+        if rolling is None:
+            rolling = self._rolling_dates(
+                cs,
+                rolling_method.with_adjustment(rolling_method.adjustment_method()),
+                hour=split_hour,
+            )
+
+        rolling_dates, adjustments = rolling
+
+        def rolls(adjustment_method: ADJUSTMENT_METHOD) -> List[Optional[float]]:
+            if adjustment_method == rolling_method.adjustment_method():
+                return adjustments
+
+            # the rolling dates never depend on the way they are adjusted
+            dates, others = self._rolling_dates(
+                cs, rolling_method.with_adjustment(adjustment_method), hour=split_hour
+            )
+            assert dates == rolling_dates
 
-                columns = ["open", "high", "low", "close"]
-                part.loc[:, columns] = rolling_method.adjust(part.loc[:, columns])
+            return others
 
-                link = link.loc[link.index >= rolling_date].append(part)
+        frames: List[Optional[pd.DataFrame]]
+        if intraday:
+            frames = self._intraday_frames(
+                start=start,
+                end=end,
+                symbol=symbol,
+                frequency=frequency,
+                daily_contracts=cs,
+                rolling_dates=rolling_dates,
+                contract_months=contract_months,
+                window=window,
+            )
+        else:
+            frames = [c.dataframe() for c in cs]
 
-                if i + 1 < daily_length:
-                    rolling_date = rolling_method.rolling_date(
-                        daily_contracts[i + 1], daily_contracts[i]
-                    )
-                else:
-                    p = daily_contracts[i].previous_contract(read_data=False)
-                    rolling_date = datetime(
-                        year=p.year(), month=p.month(), day=1, hour=split_hour
-                    )
-                    # p = daily_contracts[i].previous_contract(read_data=True)
-                    # rolling_date = rolling_method.rolling_date(
-                    # p, daily_contracts[i]
-                    # )
+        return ContinuousSeries(
+            frames,
+            rolling_dates,
+            rolls,
+            finish=lambda link: self._finish(link, symbol, frequency),
+        )
 
-                rolling_date = rolling_date.replace(hour=split_hour)
+    def series(
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        contract_months: Optional[CONTRACT_MONTHS] = None,
+        rolling_method: Optional[RollingMethod] = None,
+        window: Optional[Tuple[datetime, datetime]] = None,
+    ) -> ContinuousSeries:
+        # the link before any adjustment, every adjustment method of the
+        # rolling method is materialized from it without reading again
+        assert re.match(r"^\w+$", symbol) is not None
 
-        link = link.loc[link.index >= rolling_date]
+        if contract_months is None:
+            contract_months = self._default_contract_months(symbol)
 
-        assert link is not None
+        if rolling_method is None:
+            rolling_method = self._default_rolling_method(symbol)
 
-        link = link.sort_index()
+        with timing.span("continuous", symbol=symbol, frequency=frequency):
+            cs = self._chain(start, end, symbol, frequency, contract_months)
 
-        return link
+            return self._series(
+                cs,
+                start=start,
+                end=end,
+                symbol=symbol,
+                frequency=frequency,
+                contract_months=contract_months,
+                rolling_method=rolling_method,
+                window=window,
+            )
 
     def read(
         self,
@@ -188,6 +552,30 @@ class ContinuousContract:
         frequency: FREQUENCY,
         contract_months: Optional[CONTRACT_MONTHS] = None,
         rolling_method: Optional[RollingMethod] = None,
+        window: Optional[Tuple[datetime, datetime]] = None,
+    ) -> pd.DataFrame:
+        # an intraday link only reads the contracts with a span overlapping
+        # the window, the whole chain from start to end is read without one
+        with timing.span("continuous", symbol=symbol, frequency=frequency):
+            return self._read(
+                start=start,
+                end=end,
+                symbol=symbol,
+                frequency=frequency,
+                contract_months=contract_months,
+                rolling_method=rolling_method,
+                window=window,
+            )
+
+    def _read(
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: str,
+        frequency: FREQUENCY,
+        contract_months: Optional[CONTRACT_MONTHS] = None,
+        rolling_method: Optional[RollingMethod] = None,
+        window: Optional[Tuple[datetime, datetime]] = None,
     ) -> pd.DataFrame:
 
         assert re.match(r"^\w+$", symbol) is not None
@@ -206,86 +594,112 @@ class ContinuousContract:
         if rolling_method is None:
             rolling_method = self._default_rolling_method(symbol)
 
-        cs = contract_list(
-            start=start,
-            end=end,
-            symbol=symbol,
-            months=contract_months,
-            fmt=BARCHART,
-            read_data=True,
+        # the chain is only listed, a link found in the cache reads nothing
+        cs = self._chain(
+            start, end, symbol, frequency, contract_months, read_data=False
         )
 
-        cs_length = len(cs)
+        if len(cs) == 1:
+            return cs[0].dataframe().copy()
 
-        if cs_length == 0:
-            raise ValueError("empty contract list")
-        elif cs_length == 1:
-            return cs[0].dataframe()
-
-        if (
-            frequency == INTRADAY_15MINUTES
-            or frequency == INTRADAY_30MINUTES
-            or frequency == INTRADAY_60MINUTES
-        ):
-            return self._read_intraday_contract(
+        intraday = frequency in (
+            INTRADAY_15MINUTES,
+            INTRADAY_30MINUTES,
+            INTRADAY_60MINUTES,
+        )
+
+        rolling = None
+        requests = None
+        if intraday:
+            rolling = self._rolling_dates(
+                cs,
+                rolling_method.with_adjustment(rolling_method.adjustment_method()),
+                hour=16,
+            )
+
+            requests = self._intraday_requests(
                 start=start,
                 end=end,
                 symbol=symbol,
                 frequency=frequency,
                 daily_contracts=cs,
+                rolling_dates=rolling[0],
                 contract_months=contract_months,
-                rolling_method=rolling_method,
+                window=window,
             )
 
-        rolling_date = rolling_method.rolling_date(cs[1], cs[0])
-
-        link: pd.DataFrame
-        for i in range(cs_length):
-            df = cs[i].dataframe()
-            if i == 0:
-                link = df.loc[df.index >= rolling_date].sort_index(ascending=False)
-                continue
-            else:
-                part = df.loc[(df.index < rolling_date)].sort_index(ascending=False)
+        key, signature = self._link_key(cs, symbol, frequency, rolling_method, requests)
 
-                columns = ["open", "high", "low", "close"]
-                part.loc[:, columns] = rolling_method.adjust(part.loc[:, columns])
+        if signature is not None:
+            with timing.span("cache") as span:
+                df = DataSource.cache().load(key, signature)
+                span.set(hit=df is not None)
 
-                link = link.loc[link.index >= rolling_date].append(part)
+            if df is not None:
+                return df
 
-                if i + 1 < cs_length:
-                    rolling_date = rolling_method.rolling_date(cs[i + 1], cs[i])
-                else:
-                    p = cs[i].previous_contract(read_data=False)
-                    rolling_date = datetime(year=p.year(), month=p.month(), day=1)
+        length = len(cs)
+        if not intraday:
+            cs = read_contracts(cs)
 
-        link = link.loc[link.index >= rolling_date]
+            if len(cs) == 1:
+                return cs[0].dataframe().copy()
 
-        assert link is not None
+        series = self._series(
+            cs,
+            start=start,
+            end=end,
+            symbol=symbol,
+            frequency=frequency,
+            contract_months=contract_months,
+            rolling_method=rolling_method,
+            window=window,
+            rolling=rolling,
+        )
 
-        link = link.sort_index()
+        link = series.materialize(rolling_method.adjustment_method())
 
-        if frequency == WEEKLY:
-            link = daily_to_weekly(link)
-        elif frequency == MONTHLY:
-            link = daily_to_monthly(link)
+        # a chain cut short by a contract unable to read is never cached
+        if signature is not None and len(cs) == length:
+            with timing.span("store"):
+                DataSource.cache().store(key, signature, link)
 
-        length = len(link)
+        return link
 
-        na = link.isna().any(axis=1)
-        if na.any():
-            pretty.color_print(
-                colors.PAPER_AMBER_300,
-                f"dropping {len(link.loc[na])} rows containing nan from {symbol.upper()}",
-            )
+    def _link_key(
+        self,
+        cs: List[Contract],
+        symbol: str,
+        frequency: FREQUENCY,
+        rolling_method: RollingMethod,
+        requests: Optional[List[Optional[Tuple[DataSource, ReadRequest]]]] = None,
+    ) -> Tuple[str, Optional[str]]:
+        # a finished link depends on nothing but the contracts it is made of,
+        # the way they roll and the files they are read from, an intraday
+        # link on the contracts read for its window as well
+        loaded = [r for r in requests if r is not None] if requests is not None else []
+
+        description = (
+            f"version={SCHEDULE_VERSION}|{rolling_method.describe()}"
+            f"|{self._dtype_policy}|{','.join(c.code() for c in cs)}"
+            f"|{','.join(request.symbol for _, request in loaded)}"
+        )
+        digest = hashlib.sha1(description.encode("utf-8")).hexdigest()[:16]
 
-            dropped_length = len(link.loc[na])
+        key = f"continuous_{symbol}_{frequency}_{digest}"
 
-            link = link.dropna()
+        files: List[str] = []
+        for src, request in [(c.source(), c.read_request()) for c in cs] + loaded:
+            fs = src.source_files(request.symbol, request.frequency)
+            if fs is None:
+                return key, None
 
-            assert length == len(link) + dropped_length
+            files.extend(fs)
 
-        return link
+        try:
+            return key, file_signature(files)
+        except FileNotFoundError:
+            return key, None
 
 
 if __name__ == "__main__":
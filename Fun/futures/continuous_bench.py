@@ -0,0 +1,104 @@
+import os
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+from Fun.data.barchart import BarchartContract60Minutes
+from Fun.data.cache import FrameCache
+from Fun.data.source import INTRADAY_60MINUTES, DataSource
+from Fun.futures.continuous import ContinuousContract, ContinuousSeries
+from Fun.futures.contract import BARCHART, FINANCIAL_CONTRACT_MONTHS, contract_list
+from Fun.futures.rolling import apply_adjustment
+from Fun.utils.benchmark import compare
+from Fun.utils.testing import write_contracts
+
+
+def quadratic_stitch(frames, rolling_dates, adjustments, rolling_method):
+    # the link as ContinuousContract used to build it, copying everything
+    # linked so far for every contract
+    columns = ["open", "high", "low", "close"]
+
+    df = frames[0]
+    link = df.loc[df.index >= rolling_dates[0]].sort_index(ascending=False)
+
+    for i in range(1, len(frames)):
+        df = frames[i]
+
+        part = df.loc[(df.index < rolling_dates[i - 1])].sort_index(ascending=False)
+        part.loc[:, columns] = apply_adjustment(
+            part.loc[:, columns], adjustments[i], rolling_method.adjustment_method()
+        )
+
+        link = pd.concat([link.loc[link.index >= rolling_dates[i - 1]], part])
+
+    link = link.loc[link.index >= rolling_dates[-1]]
+
+    return link.sort_index()
+
+
+if __name__ == "__main__":
+    # quarterly zn contracts from june 2011 to march 2021
+    expirations = {
+        f"zn{m}{y:02d}": f"20{y:02d}{n:02d}15"
+        for y in range(11, 22)
+        for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+        if (11, 6) <= (y, n) <= (21, 3)
+    }
+
+    start = datetime(2011, 9, 1)
+    end = datetime(2021, 1, 15)
+
+    with tempfile.TemporaryDirectory() as home:
+        with mock.patch.dict(os.environ, {"HOME": home}):
+            DataSource._cache = FrameCache(capacity=0)
+
+            write_contracts(home, "zn", expirations)
+            write_contracts(home, "zn", expirations, periods=2400, minutes=60)
+
+            c = ContinuousContract()
+
+            cs = contract_list(start, end, "zn", FINANCIAL_CONTRACT_MONTHS, BARCHART)
+            assert len(cs) == 40
+
+            rolling_method = c._default_rolling_method("zn")
+            rolling_dates, adjustments = c._rolling_dates(cs, rolling_method)
+
+            frames = [x.dataframe() for x in cs]
+
+            compare(
+                "zn, 40 daily contracts",
+                lambda: quadratic_stitch(
+                    frames, rolling_dates, adjustments, rolling_method
+                ),
+                lambda: ContinuousSeries(
+                    frames, rolling_dates, lambda m: adjustments
+                ).materialize(rolling_method.adjustment_method()),
+                repeat=10,
+            )
+
+            hourly = [
+                x.dataframe()
+                for x in contract_list(
+                    start,
+                    end,
+                    "zn",
+                    FINANCIAL_CONTRACT_MONTHS,
+                    BARCHART,
+                    src=BarchartContract60Minutes(),
+                    frequency=INTRADAY_60MINUTES,
+                )
+            ]
+
+            hourly_dates = [r.replace(hour=16) for r in rolling_dates]
+
+            compare(
+                "zn, 40 hourly contracts",
+                lambda: quadratic_stitch(
+                    hourly, hourly_dates, adjustments, rolling_method
+                ),
+                lambda: ContinuousSeries(
+                    hourly, hourly_dates, lambda m: adjustments
+                ).materialize(rolling_method.adjustment_method()),
+                repeat=5,
+            )
@@ -1,14 +1,21 @@
+import os
 import unittest
 from datetime import datetime
+from unittest import mock
 
 import numpy as np
-from Fun.data.source import DAILY
-from Fun.futures.continuous import ContinuousContract
+import pandas as pd
+from Fun.data.barchart import BarchartContract, BarchartContract60Minutes
+from Fun.data import source
+from Fun.data.source import COMPACT, DAILY, FLOAT64, INTRADAY_60MINUTES, WEEKLY
+from Fun.futures.continuous import ContinuousContract, ContinuousSeries
 from Fun.futures.contract import (
     ALL_CONTRACT_MONTHS,
     BARCHART,
     EVEN_CONTRACT_MONTHS,
     FINANCIAL_CONTRACT_MONTHS,
+    Contract,
+    ContractCache,
     contract_list,
 )
 from Fun.futures.rolling import (
@@ -18,8 +25,37 @@ from Fun.futures.rolling import (
     NO_ADJUSTMENT,
     RATIO,
     VolumeAndOpenInterest,
+    apply_adjustment,
 )
-from Fun.utils.testing import parameterized
+from Fun.utils.testing import (
+    HomeTestCase,
+    parameterized,
+    random_quotes,
+    write_contracts,
+)
+
+
+def _quadratic_stitch(frames, rolling_dates, adjustments, rolling_method):
+    # the link as ContinuousContract used to build it, copying everything
+    # linked so far for every contract
+    columns = ["open", "high", "low", "close"]
+
+    df = frames[0]
+    link = df.loc[df.index >= rolling_dates[0]].sort_index(ascending=False)
+
+    for i in range(1, len(frames)):
+        df = frames[i]
+
+        part = df.loc[(df.index < rolling_dates[i - 1])].sort_index(ascending=False)
+        part.loc[:, columns] = apply_adjustment(
+            part.loc[:, columns], adjustments[i], rolling_method.adjustment_method()
+        )
+
+        link = pd.concat([link.loc[link.index >= rolling_dates[i - 1]], part])
+
+    link = link.loc[link.index >= rolling_dates[-1]]
+
+    return link.sort_index()
 
 
 class TestContinuousContract(unittest.TestCase):
@@ -391,5 +427,384 @@ class TestContinuousContract(unittest.TestCase):
             )
 
 
+# quarterly es contracts from march 2019 to march 2021
+EXPIRATIONS = {
+    f"es{m}{y:02d}": f"20{y:02d}{n:02d}15"
+    for y in (19, 20, 21)
+    for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+    if (y, n) <= (21, 3)
+}
+
+
+class TestDtypePolicy(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+
+    @parameterized(
+        [
+            {"adjustment_method": RATIO, "frequency": DAILY},
+            {"adjustment_method": DIFFERENCE, "frequency": DAILY},
+            {"adjustment_method": RATIO, "frequency": WEEKLY},
+        ]
+    )
+    def test_adjustment(self, adjustment_method, frequency):
+        def read(dtype_policy):
+            return ContinuousContract(dtype_policy=dtype_policy).read(
+                start=datetime(2019, 6, 1),
+                end=datetime(2021, 1, 15),
+                symbol="es",
+                frequency=frequency,
+                rolling_method=VolumeAndOpenInterest(
+                    backup=LastNTradingDays(adjustment_method=adjustment_method),
+                    adjustment_method=adjustment_method,
+                ),
+            )
+
+        full = read(FLOAT64)
+        compact = read(COMPACT)
+
+        self.assertEqual(compact.loc[:, "close"].dtype, np.float32)
+        self.assertEqual(compact.loc[:, "volume"].dtype, np.int32)
+
+        self.assertTrue(compact.index.equals(full.index))
+        self.assertTrue(np.allclose(compact.values, full.values, rtol=1e-5, atol=0))
+
+
+class TestLink(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+        write_contracts(self._home.name, "es", EXPIRATIONS, periods=2400, minutes=60)
+
+    @parameterized(
+        [
+            {"adjustment_method": RATIO, "frequency": DAILY},
+            {"adjustment_method": DIFFERENCE, "frequency": DAILY},
+            {"adjustment_method": NO_ADJUSTMENT, "frequency": DAILY},
+            {"adjustment_method": RATIO, "frequency": INTRADAY_60MINUTES},
+            {"adjustment_method": DIFFERENCE, "frequency": INTRADAY_60MINUTES},
+        ]
+    )
+    def test_equivalence(self, adjustment_method, frequency):
+        start = datetime(2019, 6, 1)
+        end = datetime(2021, 1, 15)
+
+        def rolling_method():
+            return VolumeAndOpenInterest(
+                backup=LastNTradingDays(adjustment_method=adjustment_method),
+                adjustment_method=adjustment_method,
+            )
+
+        c = ContinuousContract()
+
+        df = c.read(
+            start=start,
+            end=end,
+            symbol="es",
+            frequency=frequency,
+            rolling_method=rolling_method(),
+        )
+
+        cs = contract_list(
+            start,
+            end,
+            "es",
+            FINANCIAL_CONTRACT_MONTHS,
+            BARCHART,
+            src=BarchartContract(),
+        )
+
+        hour = None
+        frames = [x.dataframe() for x in cs]
+
+        if frequency == INTRADAY_60MINUTES:
+            hour = 16
+            frames = [
+                x.dataframe()
+                for x in contract_list(
+                    start,
+                    end,
+                    "es",
+                    FINANCIAL_CONTRACT_MONTHS,
+                    BARCHART,
+                    src=BarchartContract60Minutes(),
+                    frequency=frequency,
+                )
+            ]
+
+        method = rolling_method()
+        rolling_dates, adjustments = c._rolling_dates(cs, method, hour=hour)
+
+        self.assertGreater(len(cs), 3)
+        self.assertTrue(
+            df.equals(_quadratic_stitch(frames, rolling_dates, adjustments, method))
+        )
+
+    def test_overlapping_rolling_dates(self):
+        frames = [
+            random_quotes(start="20200101", periods=300, freq="D", seed=i)
+            for i in range(6)
+        ]
+
+        # a rolling date after the one of a newer contract trims the rows of
+        # every newer contract linked before
+        rolling_dates = [
+            datetime(2020, 9, 1),
+            datetime(2020, 7, 1),
+            datetime(2020, 8, 1),
+            datetime(2020, 3, 1),
+            datetime(2020, 4, 1),
+            datetime(2020, 1, 15),
+        ]
+        adjustments = [None, 1.5, 2.0, 0.5, 1.25, 3.0]
+
+        method = VolumeAndOpenInterest(adjustment_method=RATIO)
+
+        def link():
+            return ContinuousSeries(
+                frames, rolling_dates, lambda adjustment_method: adjustments
+            ).materialize(RATIO)
+
+        linked = link()
+
+        self.assertTrue(
+            linked.equals(_quadratic_stitch(frames, rolling_dates, adjustments, method))
+        )
+
+        # an unsorted contract gives the same link as a sorted one
+        frames[2] = frames[2].iloc[::-1]
+        self.assertTrue(link().equals(linked))
+
+
+class TestIntradayWindow(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+        write_contracts(self._home.name, "es", EXPIRATIONS, periods=2400, minutes=60)
+
+    @parameterized(
+        [
+            {"adjustment_method": RATIO},
+            {"adjustment_method": DIFFERENCE},
+        ]
+    )
+    def test_window(self, adjustment_method):
+        start = datetime(2019, 6, 1)
+        end = datetime(2021, 1, 15)
+
+        def read(window=None):
+            return ContinuousContract().read(
+                start=start,
+                end=end,
+                symbol="es",
+                frequency=INTRADAY_60MINUTES,
+                rolling_method=VolumeAndOpenInterest(
+                    backup=LastNTradingDays(adjustment_method=adjustment_method),
+                    adjustment_method=adjustment_method,
+                ),
+                window=window,
+            )
+
+        full = read()
+
+        Contract._cache = ContractCache()
+
+        window = (datetime(2021, 1, 11), datetime(2021, 1, 15, 16))
+
+        with mock.patch.object(
+            source, "_read_request", wraps=source._read_request
+        ) as reads:
+            df = read(window=window)
+
+        sources = [type(call.args[0]) for call in reads.call_args_list]
+
+        # the rolls come out of the schedule without a single daily contract
+        self.assertNotIn(BarchartContract, sources)
+        self.assertEqual(sources, [BarchartContract60Minutes])
+
+        self.assertTrue(df.equals(full.loc[df.index[0] : df.index[-1]]))
+
+        self.assertLessEqual(df.index[0], window[0])
+        self.assertTrue(full.loc[window[0] : window[1]].index.isin(df.index).all())
+        self.assertLess(len(df), len(full))
+
+    def test_missing_within_window(self):
+        os.remove(
+            os.path.join(
+                self._home.name,
+                "Documents",
+                "data_source",
+                "continuous",
+                "es@60m",
+                "esh21.csv",
+            )
+        )
+
+        with self.assertRaises(FileNotFoundError):
+            ContinuousContract().read(
+                start=datetime(2019, 6, 1),
+                end=datetime(2021, 1, 15),
+                symbol="es",
+                frequency=INTRADAY_60MINUTES,
+                window=(datetime(2021, 1, 11), datetime(2021, 1, 15, 16)),
+            )
+
+    def test_window_outside_chain(self):
+        with self.assertRaises(ValueError):
+            ContinuousContract().read(
+                start=datetime(2019, 6, 1),
+                end=datetime(2021, 1, 15),
+                symbol="es",
+                frequency=INTRADAY_60MINUTES,
+                window=(datetime(2010, 1, 1), datetime(2010, 2, 1)),
+            )
+
+
+class TestContinuousSeries(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+        write_contracts(self._home.name, "es", EXPIRATIONS, periods=2400, minutes=60)
+
+    @parameterized(
+        [
+            {"frequency": DAILY, "dtype_policy": FLOAT64},
+            {"frequency": WEEKLY, "dtype_policy": FLOAT64},
+            {"frequency": INTRADAY_60MINUTES, "dtype_policy": FLOAT64},
+            {"frequency": DAILY, "dtype_policy": COMPACT},
+            {"frequency": INTRADAY_60MINUTES, "dtype_policy": COMPACT},
+        ]
+    )
+    def test_materialize(self, frequency, dtype_policy):
+        start = datetime(2019, 6, 1)
+        end = datetime(2021, 1, 15)
+
+        def rolling_method(adjustment_method):
+            return VolumeAndOpenInterest(
+                backup=LastNTradingDays(adjustment_method=adjustment_method),
+                adjustment_method=adjustment_method,
+            )
+
+        c = ContinuousContract(dtype_policy)
+
+        series = c.series(
+            start=start,
+            end=end,
+            symbol="es",
+            frequency=frequency,
+            rolling_method=rolling_method(RATIO),
+        )
+
+        for adjustment_method in (RATIO, DIFFERENCE, NO_ADJUSTMENT, RATIO):
+            df = c.read(
+                start=start,
+                end=end,
+                symbol="es",
+                frequency=frequency,
+                rolling_method=rolling_method(adjustment_method),
+            )
+
+            materialized = series.materialize(adjustment_method)
+
+            self.assertTrue(materialized.equals(df))
+            self.assertEqual(list(materialized.dtypes), list(df.dtypes))
+
+    def test_flip(self):
+        series = ContinuousContract().series(
+            start=datetime(2019, 6, 1),
+            end=datetime(2021, 1, 15),
+            symbol="es",
+            frequency=DAILY,
+        )
+
+        ratio = series.materialize(RATIO)
+
+        # another adjustment never reads a contract file again
+        with mock.patch.object(
+            source, "_read_request", wraps=source._read_request
+        ) as reads:
+            difference = series.materialize(DIFFERENCE)
+            raw = series.materialize(NO_ADJUSTMENT)
+
+        self.assertEqual(reads.call_count, 0)
+
+        self.assertIs(series.materialize(RATIO), ratio)
+        self.assertIs(series.materialize(DIFFERENCE), difference)
+
+        self.assertTrue(raw.equals(series.raw()))
+
+        front = series.contracts() == 0
+        self.assertTrue(front.any() and not front.all())
+        self.assertTrue(ratio.loc[front].equals(difference.loc[front]))
+        self.assertFalse(ratio.loc[~front, "close"].equals(raw.loc[~front, "close"]))
+
+
+class TestLinkCache(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+        write_contracts(self._home.name, "es", EXPIRATIONS, periods=2400, minutes=60)
+
+    def _read(self, frequency, window=None):
+        return ContinuousContract().read(
+            start=datetime(2019, 6, 1),
+            end=datetime(2021, 1, 15),
+            symbol="es",
+            frequency=frequency,
+            window=window,
+        )
+
+    @parameterized(
+        [
+            {"frequency": DAILY, "window": None},
+            {"frequency": WEEKLY, "window": None},
+            {
+                "frequency": INTRADAY_60MINUTES,
+                "window": (datetime(2021, 1, 11), datetime(2021, 1, 15, 16)),
+            },
+        ]
+    )
+    def test_hit(self, frequency, window):
+        built = self._read(frequency, window=window)
+
+        Contract._cache = ContractCache()
+
+        # a link up to date in the quote cache never reads a contract
+        with mock.patch.object(
+            source, "_read_request", wraps=source._read_request
+        ) as reads:
+            cached = self._read(frequency, window=window)
+
+        self.assertEqual(reads.call_count, 0)
+
+        self.assertTrue(cached.equals(built))
+        self.assertEqual(list(cached.dtypes), list(built.dtypes))
+
+    def test_changed_contract(self):
+        built = self._read(DAILY)
+
+        path = os.path.join(
+            self._home.name, "Documents", "data_source", "continuous", "es", "esz20.csv"
+        )
+        future = os.stat(path).st_mtime + 60
+        os.utime(path, (future, future))
+
+        Contract._cache = ContractCache()
+
+        with mock.patch.object(
+            source, "_read_request", wraps=source._read_request
+        ) as reads:
+            df = self._read(DAILY)
+
+        self.assertGreater(reads.call_count, 0)
+        self.assertTrue(df.equals(built))
+
+
 if __name__ == "__main__":
     unittest.main()
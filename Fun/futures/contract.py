@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import os
 import re
 from datetime import datetime
-from typing import List, NewType, Tuple
+from typing import Dict, Hashable, Iterable, List, NewType, Optional, Tuple
 
 import pandas as pd
 from Fun.data.barchart import BarchartContract, Barchart
-from Fun.data.source import DAILY, DataSource, FREQUENCY
+from Fun.data.cache import file_signature
+from Fun.data.source import (
+    DAILY,
+    DataSource,
+    FREQUENCY,
+    ReadRequest,
+    read_many,
+)
+from Fun.futures.catalog import ContractCatalog, contract_key
 from Fun.utils import colors, pretty
+from Fun.utils.lru import MemoryLRU
 
 CONTRACT_MONTHS = NewType("CONTRACT_MONTHS", str)
 
@@ -28,10 +38,125 @@ BARCHART = CODE_FORMAT(0)
 QUANDL = CODE_FORMAT(1)
 
 
+# parsing contracts is bound by the cpu, the misses of a chain at least this
+# long are parsed in worker processes when there is more than one cpu to run
+# them on, below it the start of the workers costs more than it saves
+_PARALLEL_READS = 8
+
+
+def _frame_size(entry: Tuple[str, pd.DataFrame]) -> int:
+    return int(entry[1].memory_usage(index=True, deep=False).sum())
+
+
+class ContractCache:
+    # parsed contracts shared by every chain, rolling method and chart of the
+    # process, the frames are never modified in place
+    def __init__(self, capacity: int = 512 * 1024 * 1024) -> None:
+        self._lru = MemoryLRU(capacity, sizeof=_frame_size)
+
+    def _key(self, src: DataSource, request: ReadRequest) -> Hashable:
+        return (
+            request.symbol,
+            type(src).__name__.lower(),
+            request.frequency,
+            src.dtype_policy(),
+        )
+
+    def _signature(self, src: DataSource, request: ReadRequest) -> Optional[str]:
+        files = src.source_files(request.symbol, request.frequency)
+        if files is None:
+            return None
+
+        return file_signature(files)
+
+    def _lookup(
+        self, src: DataSource, request: ReadRequest
+    ) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        try:
+            signature = self._signature(src, request)
+        except FileNotFoundError:
+            return None, None
+
+        if signature is None:
+            return None, None
+
+        entry = self._lru.get(
+            self._key(src, request), valid=lambda e: e[0] == signature
+        )
+
+        return signature, entry[1] if entry is not None else None
+
+    def read(self, src: DataSource, request: ReadRequest) -> pd.DataFrame:
+        signature, df = self._lookup(src, request)
+        if df is not None:
+            return df
+
+        df = src.read(
+            start=request.start,
+            end=request.end,
+            symbol=request.symbol,
+            frequency=request.frequency,
+        )
+
+        # remote sources have nothing to invalidate against
+        if signature is not None:
+            self._lru.put(self._key(src, request), (signature, df))
+
+        return df
+
+    def read_many(
+        self, requests: Iterable[Tuple[DataSource, ReadRequest]]
+    ) -> Dict[Tuple[DataSource, ReadRequest], pd.DataFrame]:
+        frames = {}
+        signatures = {}
+
+        for src, request in requests:
+            signature, df = self._lookup(src, request)
+
+            if df is not None:
+                frames[(src, request)] = df
+            else:
+                signatures[(src, request)] = signature
+
+        # only the contracts missing or changed on disk are parsed again
+        workers = min(len(signatures), os.cpu_count() or 1)
+        processes = workers > 1 and len(signatures) >= _PARALLEL_READS
+
+        for (src, request), df in read_many(
+            signatures.keys(),
+            max_workers=workers if processes else None,
+            processes=processes,
+        ).items():
+            signature = signatures[(src, request)]
+            if signature is not None:
+                self._lru.put(self._key(src, request), (signature, df))
+
+            frames[(src, request)] = df
+
+        return frames
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def statistic(self) -> Dict[str, int]:
+        return self._lru.statistic()
+
+
 class Contract:
+    _cache: ContractCache = ContractCache()
+    _catalog: ContractCatalog = ContractCatalog()
+
     _barchart_format: str = r"^(\w{2})([fghjkmnquvxz])(\d{2})$"
     _quandl_format: str = r"^([\d\w]+)([fghjkmnquvxz])(\d{4})$"
 
+    @classmethod
+    def cache(cls) -> ContractCache:
+        return cls._cache
+
+    @classmethod
+    def catalog(cls) -> ContractCatalog:
+        return cls._catalog
+
     @classmethod
     def _front_month_search(
         cls,
@@ -195,19 +320,48 @@ class Contract:
         self._year = year
         self._month = month
 
+        self._df: Optional[pd.DataFrame] = None
+
         if read_data:
             self.read_data()
 
     # def read_data(self, src=BarchartContract()) -> None:
     def read_data(self) -> None:
-        self._df = self._src.read(
+        self._df = self._cache.read(self._src, self.read_request())
+
+        assert self._df is not None
+
+    def read_request(self) -> ReadRequest:
+        return ReadRequest(
             start=datetime(1776, 7, 4),
             end=datetime.now(),
             symbol=self._code,
             frequency=self._frequency,
         )
 
-        assert self._df is not None
+    def source(self) -> DataSource:
+        return self._src
+
+    def remote(self) -> bool:
+        request = self.read_request()
+
+        try:
+            files = self._src.source_files(request.symbol, request.frequency)
+        except FileNotFoundError:
+            # a local source missing the file of the contract
+            return False
+
+        return files is None
+
+    def exists(self) -> bool:
+        # remote sources only find out by reading
+        if self.remote():
+            return True
+
+        return self._catalog.exists(self._src, self._code, self._frequency)
+
+    def set_dataframe(self, df: pd.DataFrame) -> None:
+        self._df = df
 
     def code(self) -> str:
         return self._code
@@ -222,6 +376,10 @@ class Contract:
         return self._month
 
     def dataframe(self) -> pd.DataFrame:
+        # contracts listed without their data are read on first use
+        if self._df is None:
+            self.read_data()
+
         assert self._df is not None
         return self._df
 
@@ -356,34 +514,87 @@ def contract_list(
     src: DataSource = BarchartContract(),
     frequency: FREQUENCY = DAILY,
 ) -> List[Contract]:
-    try:
-        cur = Contract.front_month(
-            symbol=symbol,
-            months=months,
-            fmt=fmt,
-            time=end,
-            read_data=read_data,
-            src=src,
-            frequency=frequency,
-        )
-    except FileNotFoundError:
-        msg = "empty contract list"
-        pretty.color_print(colors.PAPER_AMBER_300, msg)
-        raise ValueError(msg)
+    cur = Contract.front_month(
+        symbol=symbol,
+        months=months,
+        fmt=fmt,
+        time=end,
+        read_data=False,
+        src=src,
+        frequency=frequency,
+    )
 
     contracts = [cur]
     while not (
         (cur.year() * 10000 + cur.month() * 100)
         < (start.year * 10000 + start.month * 100)
     ):
+        cur = cur.previous_contract(read_data=False)
+        contracts.append(cur)
 
-        try:
-            cur = cur.previous_contract(read_data=read_data)
-            contracts.append(cur)
-        except FileNotFoundError as err:
-            pretty.color_print(colors.PAPER_AMBER_300, str(err))
+    if not read_data:
+        return contracts
+
+    # the chain ends at the first contract without a file, every file before
+    # it is parsed concurrently
+    return read_contracts(existing_contracts(contracts))
+
+
+def read_contracts(contracts: List[Contract]) -> List[Contract]:
+    # the data of every contract read at once, the chain ends at the first
+    # contract unable to read
+    requests = [(c.source(), c.read_request()) for c in contracts]
+    frames = Contract.cache().read_many(requests)
+
+    for i, request in enumerate(requests):
+        df = frames.get(request)
+
+        if df is None:
+            if i == 0:
+                msg = "empty contract list"
+                pretty.color_print(colors.PAPER_AMBER_300, msg)
+                raise ValueError(msg)
+
+            contracts = contracts[:i]
             break
 
+        contracts[i].set_dataframe(df)
+
     assert len(contracts) != 0
 
     return contracts
+
+
+def existing_contracts(contracts: List[Contract]) -> List[Contract]:
+    # the chain ends at the first contract without any file, the same place
+    # reading the data would end it without parsing a single file
+    if len(contracts) == 0 or contracts[0].remote():
+        return contracts
+
+    front = contracts[0]
+    back = contracts[-1]
+
+    # every code of the chain on disk is looked up at once
+    found = set(
+        Contract.catalog().between(
+            front.source(),
+            front.symbol(),
+            front.read_request().frequency,
+            datetime(back.year(), back.month(), 1),
+            datetime(front.year(), front.month(), 1),
+        )
+    )
+
+    for i, c in enumerate(contracts):
+        # codes the catalog does not parse, such as quandl codes, are probed
+        if c.code() in found or (contract_key(c.code()) is None and c.exists()):
+            continue
+
+        if i == 0:
+            msg = "empty contract list"
+            pretty.color_print(colors.PAPER_AMBER_300, msg)
+            raise ValueError(msg)
+
+        return contracts[:i]
+
+    return contracts
@@ -1,16 +1,23 @@
+import os
 import unittest
 from datetime import datetime
+from unittest import mock
 
+from Fun.data.barchart import BarchartContract, BarchartOnDemand
+from Fun.data.source import DAILY
+from Fun.futures import contract
 from Fun.futures.contract import (
     ALL_CONTRACT_MONTHS,
     BARCHART,
     Contract,
+    ContractCache,
     EVEN_CONTRACT_MONTHS,
     FINANCIAL_CONTRACT_MONTHS,
     QUANDL,
     contract_list,
+    existing_contracts,
 )
-from Fun.utils.testing import parameterized
+from Fun.utils.testing import HomeTestCase, parameterized, random_quotes, write_barchart
 
 
 class TestContract(unittest.TestCase):
@@ -862,5 +869,207 @@ class TestContract(unittest.TestCase):
                 )
 
 
+class TestContractChain(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        for i, code in enumerate(("esh21", "esz20", "esu20")):
+            write_barchart(
+                self._home.name,
+                os.path.join("continuous", "es"),
+                code,
+                random_quotes(start="20200101", periods=300, seed=i),
+            )
+
+    def test_chain(self):
+        cs = contract_list(
+            start=datetime(2020, 6, 1),
+            end=datetime(2021, 1, 15),
+            symbol="es",
+            months=FINANCIAL_CONTRACT_MONTHS,
+            fmt=BARCHART,
+        )
+
+        # the chain ends in front of the first contract without a file
+        self.assertListEqual([c.code() for c in cs], ["esh21", "esz20", "esu20"])
+
+        for c in cs:
+            expected = Contract(
+                code=c.code(), months=FINANCIAL_CONTRACT_MONTHS, src=BarchartContract()
+            ).dataframe()
+
+            self.assertTrue(c.dataframe().equals(expected))
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            contract_list(
+                start=datetime(2020, 6, 1),
+                end=datetime(2021, 6, 15),
+                symbol="es",
+                months=FINANCIAL_CONTRACT_MONTHS,
+                fmt=BARCHART,
+            )
+
+    def test_remote(self):
+        c = Contract(
+            code="esm21",
+            months=FINANCIAL_CONTRACT_MONTHS,
+            read_data=False,
+            src=BarchartOnDemand(),
+        )
+
+        # remote sources only find out by reading
+        self.assertTrue(c.remote())
+        self.assertTrue(c.exists())
+
+        self.assertListEqual(existing_contracts([c]), [c])
+
+    def test_unreadable(self):
+        read = BarchartContract.read
+
+        def broken(src, start, end, symbol, frequency, use_cache=True):
+            if symbol == "esz20":
+                raise KeyError("close")
+
+            return read(src, start, end, symbol, frequency, use_cache=use_cache)
+
+        # only a contract without a file ends the chain, any other error of a
+        # contract is never taken for the end of it
+        with mock.patch.object(Contract, "_cache", ContractCache()):
+            with mock.patch.object(
+                BarchartContract, "read", autospec=True, side_effect=broken
+            ):
+                with self.assertRaises(KeyError):
+                    contract_list(
+                        start=datetime(2020, 6, 1),
+                        end=datetime(2021, 1, 15),
+                        symbol="es",
+                        months=FINANCIAL_CONTRACT_MONTHS,
+                        fmt=BARCHART,
+                    )
+
+
+class TestContractCache(HomeTestCase):
+    _cache_capacity = 0
+
+    def setUp(self):
+        super().setUp()
+
+        self._paths = {}
+        for i, code in enumerate(("esh21", "esz20", "esu20")):
+            self._paths[code] = write_barchart(
+                self._home.name,
+                os.path.join("continuous", "es"),
+                code,
+                random_quotes(start="20200101", periods=300, seed=i),
+            )
+
+    def _chain(self):
+        return contract_list(
+            start=datetime(2020, 6, 1),
+            end=datetime(2021, 1, 15),
+            symbol="es",
+            months=FINANCIAL_CONTRACT_MONTHS,
+            fmt=BARCHART,
+        )
+
+    def _reads(self, func):
+        with mock.patch.object(
+            BarchartContract,
+            "read",
+            autospec=True,
+            side_effect=BarchartContract.read,
+        ) as read:
+            result = func()
+
+        # contracts without a file are tried every time, only parsed files count
+        symbols = [
+            call.kwargs["symbol"] if "symbol" in call.kwargs else call.args[3]
+            for call in read.call_args_list
+        ]
+
+        return [s for s in symbols if s in self._paths], result
+
+    def test_hit(self):
+        reads, first = self._reads(self._chain)
+        self.assertListEqual(sorted(reads), ["esh21", "esu20", "esz20"])
+
+        # the chain, its neighbours and single contracts all share the cache
+        reads, second = self._reads(self._chain)
+        self.assertListEqual(reads, [])
+
+        reads, previous = self._reads(lambda: second[0].previous_contract())
+        self.assertListEqual(reads, [])
+
+        for a, b in zip(first, second):
+            self.assertIs(a.dataframe(), b.dataframe())
+
+        self.assertIs(previous.dataframe(), first[1].dataframe())
+
+    @parameterized(
+        [
+            {"cpus": 1, "processes": False},
+            {"cpus": 2, "processes": True},
+            {"cpus": None, "processes": False},
+        ]
+    )
+    def test_processes(self, cpus, processes):
+        Contract._cache = ContractCache()
+
+        with mock.patch.object(contract, "_PARALLEL_READS", 3), mock.patch.object(
+            contract.os, "cpu_count", return_value=cpus
+        ), mock.patch.object(
+            contract, "read_many", wraps=contract.read_many
+        ) as read_many:
+            cs = self._chain()
+
+        # a chain long enough is parsed in worker processes on more than one cpu
+        self.assertEqual(read_many.call_args.kwargs["processes"], processes)
+        self.assertEqual(
+            read_many.call_args.kwargs["max_workers"], 2 if processes else None
+        )
+
+        for c in cs:
+            expected = BarchartContract().read(
+                datetime(1776, 7, 4), datetime.now(), c.code(), DAILY, use_cache=False
+            )
+            self.assertTrue(c.dataframe().equals(expected))
+
+    def test_invalidate(self):
+        self._chain()
+
+        write_barchart(
+            self._home.name,
+            os.path.join("continuous", "es"),
+            "esz20",
+            random_quotes(start="20200101", periods=200, seed=9),
+        )
+        stat = os.stat(self._paths["esz20"])
+        os.utime(
+            self._paths["esz20"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9)
+        )
+
+        reads, cs = self._reads(self._chain)
+
+        self.assertListEqual(reads, ["esz20"])
+        self.assertEqual(len(cs[1].dataframe()), 200)
+
+    def test_capacity(self):
+        size = int(
+            Contract(code="esh21", months=FINANCIAL_CONTRACT_MONTHS)
+            .dataframe()
+            .memory_usage(index=True, deep=False)
+            .sum()
+        )
+
+        Contract._cache = ContractCache(capacity=size * 2)
+
+        self._chain()
+
+        statistic = Contract.cache().statistic()
+        self.assertEqual(statistic["entries"], 2)
+        self.assertEqual(statistic["evictions"], 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,137 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from Fun.data.source import (
+    DAILY,
+    FREQUENCY,
+    INTRADAY_15MINUTES,
+    INTRADAY_30MINUTES,
+    INTRADAY_60MINUTES,
+    MONTHLY,
+    WEEKLY,
+    DataSource,
+)
+from Fun.futures.continuous import ContinuousContract
+from Fun.futures.contract import Contract
+from Fun.utils import colors, pretty
+
+FREQUENCIES = (
+    DAILY,
+    WEEKLY,
+    MONTHLY,
+    INTRADAY_60MINUTES,
+    INTRADAY_30MINUTES,
+    INTRADAY_15MINUTES,
+)
+
+# the span of the default chart range of CandleSticksPreset, the preset reads
+# 500 days more on both sides of it
+_CHART_DAYS: Dict[FREQUENCY, int] = {
+    INTRADAY_15MINUTES: 1,
+    INTRADAY_30MINUTES: 2,
+    INTRADAY_60MINUTES: 7,
+    DAILY: 31 * 6,
+    WEEKLY: 365 * 3,
+    MONTHLY: 365 * 12,
+}
+
+_EXTENDED_DAYS = 500
+
+
+class PrebuildReport(NamedTuple):
+    symbol: str
+    seconds: float
+    # contracts read or found in the memory of the worker for every frequency
+    contracts: int
+    # links built or found up to date in the quote cache
+    built: List[FREQUENCY]
+    failed: List[FREQUENCY]
+    quote_hits: int
+    quote_stores: int
+
+
+def chart_read(
+    dtime: datetime, frequency: FREQUENCY
+) -> Tuple[datetime, datetime, Optional[Tuple[datetime, datetime]]]:
+    # start, end and window of the link CandleSticksPreset reads for a chart
+    # of the default range ending at dtime
+    etime = dtime
+    stime = etime - timedelta(days=_CHART_DAYS[frequency])
+
+    window = None
+    if frequency in (INTRADAY_15MINUTES, INTRADAY_30MINUTES, INTRADAY_60MINUTES):
+        etime = etime.replace(hour=16)
+        window = (stime - timedelta(days=14), etime + timedelta(days=14))
+
+    exstime = stime - timedelta(days=_EXTENDED_DAYS)
+    exetime = min(etime + timedelta(days=_EXTENDED_DAYS), datetime.now())
+
+    return exstime, exetime, window
+
+
+def prebuild_symbol(
+    symbol: str,
+    frequencies: Sequence[FREQUENCY] = FREQUENCIES,
+    dtime: Optional[datetime] = None,
+) -> PrebuildReport:
+    # every link of the symbol the charts of dtime read, a link already up to
+    # date in the quote cache reads no contract at all
+    if dtime is None:
+        dtime = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    contracts = Contract.cache().statistic()
+    quotes = DataSource.cache().statistic()
+
+    start = time.perf_counter()
+
+    built = []
+    failed = []
+    for frequency in frequencies:
+        s, e, window = chart_read(dtime, frequency)
+
+        try:
+            ContinuousContract().read(
+                start=s, end=e, symbol=symbol, frequency=frequency, window=window
+            )
+        except (FileNotFoundError, ValueError) as err:
+            failed.append(frequency)
+            pretty.color_print(
+                colors.PAPER_RED_400, f"{symbol.upper()} ({frequency}): {err}"
+            )
+        else:
+            built.append(frequency)
+
+    seconds = time.perf_counter() - start
+
+    after = Contract.cache().statistic()
+    stored = DataSource.cache().statistic()
+
+    return PrebuildReport(
+        symbol=symbol,
+        seconds=seconds,
+        contracts=(after["hits"] + after["misses"])
+        - (contracts["hits"] + contracts["misses"]),
+        built=built,
+        failed=failed,
+        quote_hits=stored["hits"] - quotes["hits"],
+        quote_stores=stored["stores"] - quotes["stores"],
+    )
+
+
+def prebuild(
+    symbols: Sequence[str],
+    frequencies: Sequence[FREQUENCY] = FREQUENCIES,
+    dtime: Optional[datetime] = None,
+    max_workers: Optional[int] = None,
+) -> List[PrebuildReport]:
+    # every symbol is built in a worker process of its own, the links end up
+    # in the quote cache on disk shared with the charts
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(prebuild_symbol, symbol, frequencies, dtime)
+            for symbol in symbols
+        ]
+
+        return [future.result() for future in futures]
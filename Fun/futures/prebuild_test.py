@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from Fun.data import source
+from Fun.data.source import DAILY, INTRADAY_15MINUTES, INTRADAY_60MINUTES, WEEKLY
+from Fun.futures.continuous import ContinuousContract
+from Fun.futures.contract import Contract, ContractCache
+from Fun.futures.prebuild import chart_read, prebuild, prebuild_symbol
+from Fun.utils.testing import HomeTestCase, write_contracts
+
+TODAY = datetime.combine(datetime.now().date(), datetime.min.time())
+
+# quarterly es contracts from three years ago up to the one trading today
+EXPIRATIONS = {
+    f"es{m}{y % 100:02d}": f"{y}{n:02d}15"
+    for y in range(TODAY.year - 3, TODAY.year + 2)
+    for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+    if datetime(y, n, 15) <= datetime(TODAY.year + 1, TODAY.month, 1)
+}
+
+FREQUENCIES = (DAILY, WEEKLY, INTRADAY_60MINUTES)
+
+
+class TestPrebuild(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_contracts(self._home.name, "es", EXPIRATIONS)
+        write_contracts(self._home.name, "es", EXPIRATIONS, periods=2400, minutes=60)
+
+    def test_prebuild_symbol(self):
+        report = prebuild_symbol("es", FREQUENCIES + (INTRADAY_15MINUTES,))
+
+        self.assertEqual(report.symbol, "es")
+        self.assertEqual(report.built, list(FREQUENCIES))
+        self.assertEqual(report.failed, [INTRADAY_15MINUTES])
+        self.assertGreater(report.contracts, 0)
+        self.assertGreater(report.quote_stores, 0)
+
+        Contract._cache = ContractCache()
+
+        # the charts of the day find every link in the quote cache
+        with mock.patch.object(
+            source, "_read_request", wraps=source._read_request
+        ) as reads:
+            for frequency in FREQUENCIES:
+                start, end, window = chart_read(TODAY, frequency)
+
+                ContinuousContract().read(
+                    start=start,
+                    end=end,
+                    symbol="es",
+                    frequency=frequency,
+                    window=window,
+                )
+
+        self.assertEqual(reads.call_count, 0)
+
+        report = prebuild_symbol("es", FREQUENCIES)
+
+        self.assertEqual(report.contracts, 0)
+        self.assertEqual(report.quote_stores, 0)
+
+    def test_prebuild(self):
+        reports = prebuild(["es", "nq"], (DAILY,), max_workers=2)
+
+        self.assertEqual([r.symbol for r in reports], ["es", "nq"])
+        self.assertEqual([r.built for r in reports], [[DAILY], []])
+        self.assertEqual([r.failed for r in reports], [[], [DAILY]])
+
+        # the links built by the workers are shared on disk
+        report = prebuild_symbol("es", (DAILY,))
+
+        self.assertEqual(report.contracts, 0)
+        self.assertEqual(report.quote_hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
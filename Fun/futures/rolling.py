@@ -1,10 +1,12 @@
+import copy
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
-from typing import NewType, cast
+from typing import Any, Dict, NewType, Optional, Tuple, cast
 
+import numpy as np
 import pandas as pd
 from Fun.futures.contract import Contract
-from Fun.utils import colors, pretty
+from Fun.utils import colors, pretty, timing
 
 ADJUSTMENT_METHOD = NewType("ADJUSTMENT_METHOD", int)
 
@@ -13,62 +15,165 @@ DIFFERENCE = ADJUSTMENT_METHOD(1)
 NO_ADJUSTMENT = ADJUSTMENT_METHOD(2)
 
 
+def neutral_adjustment(adjustment_method: ADJUSTMENT_METHOD) -> float:
+    if adjustment_method == RATIO:
+        return 1.0
+    elif adjustment_method in (DIFFERENCE, NO_ADJUSTMENT):
+        return 0.0
+    else:
+        raise ValueError("invalid adjustment method")
+
+
+def apply_adjustment(
+    x: Any, adjustment: Any, adjustment_method: ADJUSTMENT_METHOD
+) -> Any:
+    if adjustment_method == RATIO:
+        return x * adjustment
+    elif adjustment_method == DIFFERENCE:
+        return x + adjustment
+    elif adjustment_method == NO_ADJUSTMENT:
+        return x
+    else:
+        raise ValueError("invalid adjustment method")
+
+
+class AlignedPair:
+    # the rows the front and the back contract both traded on, joined once in
+    # the order of the front contract with every column pulled out as
+    # contiguous arrays of the same length
+    def __init__(self, front: Contract, back: Contract) -> None:
+        self._fdf = front.dataframe()
+        self._bdf = back.dataframe()
+
+        positions = self._bdf.index.get_indexer(self._fdf.index)
+
+        self._front = np.flatnonzero(positions >= 0)
+        self._back = positions[self._front]
+
+        self._index = self._fdf.index.take(self._front)
+
+        self._columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def index(self) -> pd.DatetimeIndex:
+        return self._index
+
+    def last(self) -> datetime:
+        # the last row of the front contract, traded by the back one or not
+        return cast(datetime, self._fdf.index[-1])
+
+    def column(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._columns.get(name)
+        if arrays is None:
+            arrays = (
+                self._fdf.loc[:, name].values.take(self._front),
+                self._bdf.loc[:, name].values.take(self._back),
+            )
+            self._columns[name] = arrays
+
+        return arrays
+
+    def position(self, dt: datetime) -> Optional[int]:
+        try:
+            return int(self._index.get_loc(dt))
+        except KeyError:
+            return None
+
+    def nearest(self, dt: datetime) -> Optional[int]:
+        # the last row both contracts traded on up to dt, the first one after
+        # it without any before
+        if len(self._index) == 0:
+            return None
+
+        i = int(self._index.searchsorted(dt, side="right")) - 1
+
+        return max(i, 0)
+
+
 class RollingMethod(metaclass=ABCMeta):
     def __init__(self, adjustment_method: ADJUSTMENT_METHOD = RATIO) -> None:
 
         assert adjustment_method in (RATIO, DIFFERENCE, NO_ADJUSTMENT)
 
         self._adjustment_method = adjustment_method
-
-        if adjustment_method == RATIO:
-            self._adjustment = 1.0
-        elif adjustment_method == DIFFERENCE:
-            self._adjustment = 0.0
-        elif adjustment_method == NO_ADJUSTMENT:
-            self._adjustment = 0.0
-        else:
-            raise ValueError("invalid adjustment method")
+        self._adjustment = neutral_adjustment(adjustment_method)
 
     @abstractmethod
-    def _rolling_date(self, front: Contract, back: Contract) -> datetime:
+    def _rolling_date(
+        self, front: Contract, back: Contract, pair: AlignedPair
+    ) -> datetime:
         raise NotImplementedError
 
-    def rolling_date(self, front: Contract, back: Contract) -> datetime:
-        rolling_date = self._rolling_date(front, back)
+    def adjustment_method(self) -> ADJUSTMENT_METHOD:
+        return self._adjustment_method
+
+    def with_adjustment(self, adjustment_method: ADJUSTMENT_METHOD) -> "RollingMethod":
+        # the same rolling dates adjusted another way, nothing accumulated yet
+        assert adjustment_method in (RATIO, DIFFERENCE, NO_ADJUSTMENT)
 
-        bdf = back.dataframe()
-        fdf = front.dataframe()
+        method = copy.copy(self)
+        method._adjustment_method = adjustment_method
+        method._adjustment = neutral_adjustment(adjustment_method)
 
+        return method
+
+    def describe(self) -> str:
+        # identifies the method and its parameters, rolls computed by methods
+        # with the same description are interchangeable
+        return f"{type(self).__name__.lower()}(adjustment={self._adjustment_method})"
+
+    def roll(self, front: Contract, back: Contract) -> Tuple[datetime, float]:
+        # the rolling date of a single pair with the adjustment of that roll
+        # alone, nothing accumulates
+        with timing.span("rolling_date", front=front.code(), back=back.code()):
+            pair = AlignedPair(front, back)
+
+            rolling_date = self._rolling_date(front, back, pair)
+
+            if self._adjustment_method == NO_ADJUSTMENT:
+                return rolling_date, 0.0
+
+            # a rolling date one of the contracts did not trade on is adjusted
+            # by the closes of the nearest day both traded on
+            i = pair.position(rolling_date)
+            if i is None:
+                i = pair.nearest(rolling_date)
+
+            if i is None:
+                msg = f"{front.code()} and {back.code()} never traded on the same day"
+                pretty.color_print(colors.PAPER_RED_400, msg)
+                raise ValueError(msg)
+
+            fclose, bclose = pair.column("close")
+
+            adjustment = 0.0
+            if self._adjustment_method == RATIO:
+                adjustment = bclose[i] / fclose[i]
+            elif self._adjustment_method == DIFFERENCE:
+                adjustment = bclose[i] - fclose[i]
+            else:
+                raise ValueError("invalid adjustment method")
+
+            return rolling_date, float(adjustment)
+
+    def accumulate(self, adjustment: float) -> None:
         if self._adjustment_method == RATIO:
-            self._adjustment *= (
-                bdf.loc[bdf.index == rolling_date, "close"]
-                / fdf.loc[fdf.index == rolling_date, "close"]
-            ).iloc[0]
+            self._adjustment *= adjustment
         elif self._adjustment_method == DIFFERENCE:
-            self._adjustment += (
-                bdf.loc[bdf.index == rolling_date, "close"]
-                - fdf.loc[fdf.index == rolling_date, "close"]
-            ).iloc[0]
+            self._adjustment += adjustment
         elif self._adjustment_method == NO_ADJUSTMENT:
             pass
         else:
             raise ValueError("invalid adjustment method")
 
+    def rolling_date(self, front: Contract, back: Contract) -> datetime:
+        rolling_date, adjustment = self.roll(front, back)
+        self.accumulate(adjustment)
+
         return rolling_date
 
     def adjustment(self) -> float:
         return self._adjustment
 
-    def adjust(self, df: pd.DataFrame) -> pd.DataFrame:
-        if self._adjustment_method == RATIO:
-            return df * self._adjustment
-        elif self._adjustment_method == DIFFERENCE:
-            return df + self._adjustment
-        elif self._adjustment_method == NO_ADJUSTMENT:
-            return df
-        else:
-            raise ValueError("invalid adjustment method")
-
 
 class LastNTradingDays(RollingMethod):
     def __init__(
@@ -79,13 +184,23 @@ class LastNTradingDays(RollingMethod):
         super().__init__(adjustment_method)
         self._offset = 4
 
-    def _rolling_date(self, front: Contract, back: Contract) -> datetime:
+    def describe(self) -> str:
+        return (
+            f"{type(self).__name__.lower()}"
+            f"(adjustment={self._adjustment_method},offset={self._offset})"
+        )
+
+    def _rolling_date(
+        self, front: Contract, back: Contract, pair: AlignedPair
+    ) -> datetime:
         n = -self._offset if self._offset != 0 else 0
         return cast(datetime, front.dataframe().index[n].to_pydatetime())
 
 
 class FirstOfMonth(RollingMethod):
-    def _rolling_date(self, front: Contract, back: Contract) -> datetime:
+    def _rolling_date(
+        self, front: Contract, back: Contract, pair: AlignedPair
+    ) -> datetime:
         df = front.dataframe()
         selector = (df.index.month == df.index[-1].month) & (
             (df.index[-1] - df.index).days < 90
@@ -105,27 +220,20 @@ class VolumeAndOpenInterest(RollingMethod):
         super().__init__(adjustment_method)
         self._backup = backup
 
-    def _rolling_date(self, front: Contract, back: Contract) -> datetime:
-        fdf = front.dataframe()
-        bdf = back.dataframe()
-
-        volume = (
-            (
-                bdf.loc[bdf.index.isin(fdf.index), "volume"]
-                >= fdf.loc[fdf.index.isin(bdf.index), "volume"]
-            )
-            & (bdf.loc[bdf.index.isin(fdf.index), "volume"] != 0)
-            & (fdf.loc[fdf.index.isin(bdf.index), "volume"] != 0)
+    def describe(self) -> str:
+        return (
+            f"{type(self).__name__.lower()}"
+            f"(adjustment={self._adjustment_method},backup={self._backup.describe()})"
         )
 
-        interest = (
-            (
-                bdf.loc[bdf.index.isin(fdf.index), "open interest"]
-                >= fdf.loc[fdf.index.isin(bdf.index), "open interest"]
-            )
-            & (bdf.loc[bdf.index.isin(fdf.index), "open interest"] != 0)
-            & (fdf.loc[fdf.index.isin(bdf.index), "open interest"] != 0)
-        )
+    def _rolling_date(
+        self, front: Contract, back: Contract, pair: AlignedPair
+    ) -> datetime:
+        fvolume, bvolume = pair.column("volume")
+        finterest, binterest = pair.column("open interest")
+
+        volume = (bvolume >= fvolume) & (bvolume != 0) & (fvolume != 0)
+        interest = (binterest >= finterest) & (binterest != 0) & (finterest != 0)
 
         union = None
         if volume.any() and interest.any():
@@ -141,24 +249,26 @@ class VolumeAndOpenInterest(RollingMethod):
                 ", use backup rolling method instead",
             )
 
-            return cast(datetime, self._backup.rolling_date(front, back))
+            return self._backup._rolling_date(front, back, pair)
 
         assert union is not None
 
-        selector = (fdf.index.isin(bdf.index)) & ((fdf.index[-1] - fdf.index).days < 90)
+        # only the last 90 days of the front contract qualify
+        index = pair.index()
+        union &= (pair.last() - index).days < 90
 
-        cross = fdf.loc[selector].loc[union]
+        cross = np.flatnonzero(union)
         if len(cross) == 0:
             pretty.color_print(
                 colors.PAPER_AMBER_300,
                 f"no valid intersection in contracts {front.code().upper()} and {back.code().upper()}"
                 ", use backup rolling method instead",
             )
-            return cast(datetime, self._backup.rolling_date(front, back))
+            return self._backup._rolling_date(front, back, pair)
 
         return cast(
             datetime,
-            cross.index[0].to_pydatetime(),
+            index[cross[0]].to_pydatetime(),
         )
 
 
@@ -0,0 +1,122 @@
+import os
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+from Fun.data.cache import FrameCache
+from Fun.data.source import DataSource
+from Fun.futures.continuous import ContinuousContract
+from Fun.futures.contract import (
+    ALL_CONTRACT_MONTHS,
+    BARCHART,
+    FINANCIAL_CONTRACT_MONTHS,
+    contract_list,
+)
+from Fun.futures.rolling import RATIO
+from Fun.utils.benchmark import compare
+from Fun.utils.testing import write_contracts
+
+
+def isin_roll(rolling_method, front, back):
+    # the roll as VolumeAndOpenInterest used to compute it, aligning both
+    # contracts with isin for every column
+    fdf = front.dataframe()
+    bdf = back.dataframe()
+
+    volume = (
+        (
+            bdf.loc[bdf.index.isin(fdf.index), "volume"]
+            >= fdf.loc[fdf.index.isin(bdf.index), "volume"]
+        )
+        & (bdf.loc[bdf.index.isin(fdf.index), "volume"] != 0)
+        & (fdf.loc[fdf.index.isin(bdf.index), "volume"] != 0)
+    )
+
+    interest = (
+        (
+            bdf.loc[bdf.index.isin(fdf.index), "open interest"]
+            >= fdf.loc[fdf.index.isin(bdf.index), "open interest"]
+        )
+        & (bdf.loc[bdf.index.isin(fdf.index), "open interest"] != 0)
+        & (fdf.loc[fdf.index.isin(bdf.index), "open interest"] != 0)
+    )
+
+    union = None
+    if volume.any() and interest.any():
+        union = volume & interest
+    elif volume.any():
+        union = volume
+    elif interest.any():
+        union = interest
+
+    rolling_date = None
+    if union is not None:
+        selector = (fdf.index.isin(bdf.index)) & ((fdf.index[-1] - fdf.index).days < 90)
+
+        cross = fdf.loc[selector].loc[union]
+        if len(cross) > 0:
+            rolling_date = cross.index[0].to_pydatetime()
+
+    if rolling_date is None:
+        rolling_date = rolling_method._backup.rolling_date(front, back)
+
+    if rolling_method._adjustment_method == RATIO:
+        adjustment = (
+            bdf.loc[bdf.index == rolling_date, "close"]
+            / fdf.loc[fdf.index == rolling_date, "close"]
+        ).iloc[0]
+    else:
+        adjustment = (
+            bdf.loc[bdf.index == rolling_date, "close"]
+            - fdf.loc[fdf.index == rolling_date, "close"]
+        ).iloc[0]
+
+    return rolling_date, float(adjustment)
+
+
+if __name__ == "__main__":
+    # quarterly es contracts and monthly cl contracts from 2000 to 2021
+    chains = {
+        "es": (
+            FINANCIAL_CONTRACT_MONTHS,
+            {
+                f"es{m}{y:02d}": f"20{y:02d}{n:02d}15"
+                for y in range(0, 22)
+                for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+            },
+        ),
+        "cl": (
+            ALL_CONTRACT_MONTHS,
+            {
+                f"cl{m}{y:02d}": f"20{y:02d}{n:02d}20"
+                for y in range(0, 22)
+                for n, m in enumerate(ALL_CONTRACT_MONTHS, start=1)
+            },
+        ),
+    }
+
+    start = datetime(2000, 3, 1)
+    end = datetime(2021, 6, 1)
+
+    with tempfile.TemporaryDirectory() as home:
+        with mock.patch.dict(os.environ, {"HOME": home}):
+            DataSource._cache = FrameCache(capacity=0)
+
+            for symbol, (months, expirations) in chains.items():
+                write_contracts(home, symbol, expirations)
+
+                cs = contract_list(start, end, symbol, months, BARCHART)
+                pairs = list(zip(cs[1:], cs[:-1]))
+
+                rolling_method = ContinuousContract._default_rolling_method(symbol)
+
+                assert [isin_roll(rolling_method, f, b) for f, b in pairs] == [
+                    rolling_method.roll(f, b) for f, b in pairs
+                ]
+
+                compare(
+                    f"{symbol}, {len(pairs)} rolls",
+                    lambda: [isin_roll(rolling_method, f, b) for f, b in pairs],
+                    lambda: [rolling_method.roll(f, b) for f, b in pairs],
+                    repeat=5,
+                )
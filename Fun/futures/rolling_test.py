@@ -1,6 +1,8 @@
 import unittest
 from datetime import datetime
 
+import numpy as np
+from Fun.data.source import COMPACT, apply_dtype_policy
 from Fun.futures.contract import (
     ALL_CONTRACT_MONTHS,
     BARCHART,
@@ -8,8 +10,72 @@ from Fun.futures.contract import (
     EVEN_CONTRACT_MONTHS,
     FINANCIAL_CONTRACT_MONTHS,
 )
-from Fun.futures.rolling import FirstOfMonth, LastNTradingDays, VolumeAndOpenInterest
-from Fun.utils.testing import parameterized
+from Fun.futures.rolling import (
+    DIFFERENCE,
+    RATIO,
+    AlignedPair,
+    FirstOfMonth,
+    LastNTradingDays,
+    VolumeAndOpenInterest,
+)
+from Fun.utils.testing import parameterized, random_quotes
+
+
+def _isin_roll(rolling_method, front, back):
+    # the roll as VolumeAndOpenInterest used to compute it, aligning both
+    # contracts with isin for every column
+    fdf = front.dataframe()
+    bdf = back.dataframe()
+
+    volume = (
+        (
+            bdf.loc[bdf.index.isin(fdf.index), "volume"]
+            >= fdf.loc[fdf.index.isin(bdf.index), "volume"]
+        )
+        & (bdf.loc[bdf.index.isin(fdf.index), "volume"] != 0)
+        & (fdf.loc[fdf.index.isin(bdf.index), "volume"] != 0)
+    )
+
+    interest = (
+        (
+            bdf.loc[bdf.index.isin(fdf.index), "open interest"]
+            >= fdf.loc[fdf.index.isin(bdf.index), "open interest"]
+        )
+        & (bdf.loc[bdf.index.isin(fdf.index), "open interest"] != 0)
+        & (fdf.loc[fdf.index.isin(bdf.index), "open interest"] != 0)
+    )
+
+    union = None
+    if volume.any() and interest.any():
+        union = volume & interest
+    elif volume.any():
+        union = volume
+    elif interest.any():
+        union = interest
+
+    rolling_date = None
+    if union is not None:
+        selector = (fdf.index.isin(bdf.index)) & ((fdf.index[-1] - fdf.index).days < 90)
+
+        cross = fdf.loc[selector].loc[union]
+        if len(cross) > 0:
+            rolling_date = cross.index[0].to_pydatetime()
+
+    if rolling_date is None:
+        rolling_date = rolling_method._backup.rolling_date(front, back)
+
+    if rolling_method._adjustment_method == RATIO:
+        adjustment = (
+            bdf.loc[bdf.index == rolling_date, "close"]
+            / fdf.loc[fdf.index == rolling_date, "close"]
+        ).iloc[0]
+    else:
+        adjustment = (
+            bdf.loc[bdf.index == rolling_date, "close"]
+            - fdf.loc[fdf.index == rolling_date, "close"]
+        ).iloc[0]
+
+    return rolling_date, float(adjustment)
 
 
 class TestRolling(unittest.TestCase):
@@ -152,5 +218,115 @@ class TestRolling(unittest.TestCase):
         )
 
 
+class TestAlignedPair(unittest.TestCase):
+    def _pair(self, seed, dtype_policy=None):
+        front = Contract("esh20", FINANCIAL_CONTRACT_MONTHS, read_data=False)
+        back = Contract("esm20", FINANCIAL_CONTRACT_MONTHS, read_data=False)
+
+        fdf = random_quotes(start="20190601", periods=200, seed=seed)
+        bdf = random_quotes(start="20190901", periods=200, seed=seed + 1)
+
+        # a few days only one of the contracts traded on
+        bdf = bdf.drop(bdf.index[[3, 40, 41, 150]])
+
+        if dtype_policy is not None:
+            fdf = apply_dtype_policy(fdf, dtype_policy)
+            bdf = apply_dtype_policy(bdf, dtype_policy)
+
+        front.set_dataframe(fdf)
+        back.set_dataframe(bdf)
+
+        return front, back
+
+    def test_align(self):
+        front, back = self._pair(0)
+
+        fdf = front.dataframe()
+        bdf = back.dataframe()
+
+        pair = AlignedPair(front, back)
+
+        self.assertTrue(pair.index().equals(fdf.index[fdf.index.isin(bdf.index)]))
+
+        f, b = pair.column("close")
+        self.assertTrue(np.array_equal(f, fdf.loc[pair.index(), "close"].values))
+        self.assertTrue(np.array_equal(b, bdf.loc[pair.index(), "close"].values))
+
+        self.assertEqual(pair.position(pair.index()[5]), 5)
+        self.assertIsNone(pair.position(fdf.index[0]))
+
+    @parameterized(
+        [
+            {"adjustment_method": RATIO, "columns": ()},
+            {"adjustment_method": DIFFERENCE, "columns": ()},
+            {"adjustment_method": RATIO, "columns": ("volume",)},
+            {"adjustment_method": RATIO, "columns": ("open interest",)},
+            {"adjustment_method": RATIO, "columns": ("volume", "open interest")},
+            {"adjustment_method": DIFFERENCE, "columns": ("volume", "open interest")},
+        ]
+    )
+    def test_equivalence(self, adjustment_method, columns):
+        for seed in range(8):
+            for dtype_policy in (None, COMPACT):
+                front, back = self._pair(seed, dtype_policy)
+
+                # zeros leave the crossover to the other column or the backup
+                for c in columns:
+                    front.dataframe()[c] = 0
+
+                def rolling_method():
+                    return VolumeAndOpenInterest(
+                        backup=LastNTradingDays(adjustment_method=adjustment_method),
+                        adjustment_method=adjustment_method,
+                    )
+
+                self.assertEqual(
+                    rolling_method().roll(front, back),
+                    _isin_roll(rolling_method(), front, back),
+                )
+
+    @parameterized(
+        [
+            {"adjustment_method": RATIO},
+            {"adjustment_method": DIFFERENCE},
+        ]
+    )
+    def test_untraded_rolling_date(self, adjustment_method):
+        front, back = self._pair(0)
+
+        fdf = front.dataframe()
+        bdf = back.dataframe()
+
+        rolling_method = LastNTradingDays(offset=4, adjustment_method=adjustment_method)
+
+        # the back contract did not trade on the rolling date, nor the day
+        # before it
+        rolling_date = fdf.index[-4]
+        back.set_dataframe(bdf.drop([rolling_date, fdf.index[-5]]))
+
+        date, adjustment = rolling_method.roll(front, back)
+
+        self.assertEqual(date, rolling_date)
+
+        nearest = fdf.index[-6]
+        if adjustment_method == RATIO:
+            expected = bdf.loc[nearest, "close"] / fdf.loc[nearest, "close"]
+        else:
+            expected = bdf.loc[nearest, "close"] - fdf.loc[nearest, "close"]
+
+        self.assertTrue(np.isfinite(adjustment))
+        self.assertAlmostEqual(adjustment, expected)
+
+    def test_never_traded_together(self):
+        front, back = self._pair(0)
+
+        back.set_dataframe(
+            random_quotes(start="20300101", periods=50, seed=1),
+        )
+
+        with self.assertRaises(ValueError):
+            FirstOfMonth().roll(front, back)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from Fun.data.cache import file_signature
+from Fun.futures.contract import Contract
+from Fun.futures.rolling import RollingMethod
+from Fun.utils import colors, pretty
+
+# bump whenever the way a roll is computed changes
+SCHEDULE_VERSION = 2
+
+
+class Roll(NamedTuple):
+    # rolling out of the front contract into the back contract
+    front: str
+    back: str
+    date: datetime
+    # the adjustment of this roll alone, ratio or difference of the closes
+    adjustment: float
+
+
+class RollSchedule:
+    def __init__(self, root: Optional[str] = None) -> None:
+        self._root = root
+
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+        self._hits = 0
+        self._misses = 0
+
+    def root(self) -> str:
+        if self._root is not None:
+            return self._root
+
+        home = os.getenv("HOME")
+        assert home is not None
+
+        return os.path.join(home, "Documents", "data_cache", "schedules")
+
+    def path(self, contract: Contract, rolling_method: RollingMethod) -> str:
+        src = contract.source()
+
+        description = (
+            f"version={SCHEDULE_VERSION}|{rolling_method.describe()}"
+            f"|{src.dtype_policy()}"
+        )
+        digest = hashlib.sha1(description.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(
+            self.root(),
+            type(src).__name__.lower(),
+            f"{contract.symbol()}_{digest}.json",
+        )
+
+    def _signature(self, front: Contract, back: Contract) -> Optional[str]:
+        files: List[str] = []
+
+        for c in (front, back):
+            request = c.read_request()
+
+            fs = c.source().source_files(request.symbol, request.frequency)
+            if fs is None:
+                return None
+
+            files.extend(fs)
+
+        return file_signature(files)
+
+    def _load(self, path: str) -> Dict[str, Any]:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        with self._lock:
+            cached = self._tables.get(path)
+
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r") as f:
+                table = json.load(f)["rolls"]
+        except (OSError, ValueError, KeyError) as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300, f"dropping unreadable schedule {path}: {err}"
+            )
+            return {}
+
+        with self._lock:
+            self._tables[path] = (mtime, table)
+
+        return table
+
+    def _store(
+        self, path: str, rolling_method: RollingMethod, table: Dict[str, Any]
+    ) -> None:
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            with open(tmp, "w") as f:
+                json.dump(
+                    {"method": rolling_method.describe(), "rolls": table},
+                    f,
+                    indent=2,
+                    sort_keys=True,
+                )
+
+            os.replace(tmp, path)
+        except OSError as err:
+            pretty.color_print(
+                colors.PAPER_AMBER_300, f"unable to write schedule {path}: {err}"
+            )
+            return
+
+        with self._lock:
+            self._tables[path] = (os.stat(path).st_mtime_ns, table)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def rolls(
+        self, contracts: List[Contract], rolling_method: RollingMethod
+    ) -> List[Roll]:
+        # contracts run from the newest one back to the oldest one, rolls[i]
+        # rolls out of contracts[i + 1] into contracts[i]
+        if len(contracts) < 2:
+            return []
+
+        path = self.path(contracts[0], rolling_method)
+        table = dict(self._load(path))
+
+        changed = False
+        rolls = []
+
+        for i in range(1, len(contracts)):
+            front = contracts[i]
+            back = contracts[i - 1]
+
+            key = f"{front.code()}|{back.code()}"
+            signature = self._signature(front, back)
+
+            row = table.get(key)
+            if row is not None and signature is not None and row[0] == signature:
+                self._count("_hits")
+
+                rolls.append(
+                    Roll(
+                        front.code(),
+                        back.code(),
+                        datetime.fromisoformat(row[1]),
+                        row[2],
+                    )
+                )
+                continue
+
+            # only pairs with a contract file changed since are computed again
+            self._count("_misses")
+
+            date, adjustment = rolling_method.roll(front, back)
+            rolls.append(Roll(front.code(), back.code(), date, adjustment))
+
+            if signature is not None:
+                table[key] = [signature, date.isoformat(), adjustment]
+                changed = True
+
+        if changed:
+            self._store(path, rolling_method, table)
+
+        return rolls
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+    def statistic(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
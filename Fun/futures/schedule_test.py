@@ -0,0 +1,137 @@
+import os
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from Fun.futures.contract import BARCHART, FINANCIAL_CONTRACT_MONTHS, contract_list
+from Fun.futures.rolling import (
+    DIFFERENCE,
+    RATIO,
+    FirstOfMonth,
+    LastNTradingDays,
+    VolumeAndOpenInterest,
+)
+from Fun.futures.schedule import RollSchedule
+from Fun.utils.testing import (
+    HomeTestCase,
+    parameterized,
+    random_quotes,
+    write_barchart,
+    write_contracts,
+)
+
+# quarterly es contracts from march 2019 to march 2021
+EXPIRATIONS = {
+    f"es{m}{y:02d}": f"20{y:02d}{n:02d}15"
+    for y in (19, 20, 21)
+    for m, n in (("h", 3), ("m", 6), ("u", 9), ("z", 12))
+    if (y, n) <= (21, 3)
+}
+
+
+class TestRollSchedule(HomeTestCase):
+    _cache_capacity = 0
+
+    def setUp(self):
+        super().setUp()
+
+        self._paths = dict(
+            zip(
+                sorted(EXPIRATIONS.keys()),
+                write_contracts(self._home.name, "es", EXPIRATIONS),
+            )
+        )
+
+    def _chain(self):
+        return contract_list(
+            start=datetime(2019, 6, 1),
+            end=datetime(2021, 1, 15),
+            symbol="es",
+            months=FINANCIAL_CONTRACT_MONTHS,
+            fmt=BARCHART,
+        )
+
+    def _rolls(self, schedule, rolling_method):
+        with mock.patch.object(
+            VolumeAndOpenInterest,
+            "_rolling_date",
+            autospec=True,
+            side_effect=VolumeAndOpenInterest._rolling_date,
+        ) as rolling_date:
+            rolls = schedule.rolls(self._chain(), rolling_method)
+
+        return rolling_date.call_count, rolls
+
+    @parameterized([{"adjustment_method": RATIO}, {"adjustment_method": DIFFERENCE}])
+    def test_reuse(self, adjustment_method):
+        def rolling_method():
+            return VolumeAndOpenInterest(
+                backup=FirstOfMonth(adjustment_method=adjustment_method),
+                adjustment_method=adjustment_method,
+            )
+
+        cs = self._chain()
+
+        expected = rolling_method()
+        dates = [expected.rolling_date(cs[i], cs[i - 1]) for i in range(1, len(cs))]
+
+        computed, rolls = self._rolls(RollSchedule(), rolling_method())
+        self.assertEqual(computed, len(cs) - 1)
+
+        # a new schedule only has the file on disk to go by
+        computed, reused = self._rolls(RollSchedule(), rolling_method())
+        self.assertEqual(computed, 0)
+
+        self.assertListEqual(rolls, reused)
+        self.assertListEqual([r.date for r in reused], dates)
+
+        accumulated = rolling_method()
+        for r in reused:
+            accumulated.accumulate(r.adjustment)
+
+        self.assertEqual(accumulated.adjustment(), expected.adjustment())
+
+    def test_invalidate(self):
+        schedule = RollSchedule()
+
+        self._rolls(schedule, VolumeAndOpenInterest())
+
+        path = self._paths["esz19"]
+        write_barchart(
+            self._home.name,
+            os.path.join("continuous", "es"),
+            "esz19",
+            random_quotes(start="20190301", periods=190, seed=9),
+        )
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        # only the rolls into and out of the changed contract
+        computed, _ = self._rolls(schedule, VolumeAndOpenInterest())
+        self.assertEqual(computed, 2)
+
+        computed, _ = self._rolls(schedule, VolumeAndOpenInterest())
+        self.assertEqual(computed, 0)
+
+    def test_methods(self):
+        schedule = RollSchedule()
+        cs = self._chain()
+
+        ratio = VolumeAndOpenInterest(adjustment_method=RATIO)
+        difference = VolumeAndOpenInterest(adjustment_method=DIFFERENCE)
+        days = LastNTradingDays(adjustment_method=RATIO)
+
+        paths = {schedule.path(cs[0], m) for m in (ratio, difference, days)}
+        self.assertEqual(len(paths), 3)
+
+        schedule.rolls(cs, ratio)
+        schedule.rolls(cs, difference)
+
+        self.assertTrue(os.path.exists(schedule.path(cs[0], ratio)))
+        self.assertTrue(os.path.exists(schedule.path(cs[0], difference)))
+
+        self.assertEqual(schedule.statistic()["misses"], 2 * (len(cs) - 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
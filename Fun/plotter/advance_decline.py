@@ -1,7 +1,5 @@
-from datetime import datetime
-
 import pandas as pd
-from Fun.data.cumulative import BarchartCumulativeSum
+from Fun.data import registry, shared
 from Fun.data.source import FREQUENCY
 from Fun.plotter.plotter import LinePlotter
 from Fun.utils import colors
@@ -14,13 +12,12 @@ class AdvanceDeclineSource:
 
         self._ad_symbol = None
 
-        src = BarchartCumulativeSum()
-
-        if self._symbol in ("es", "spx", "spxew"):
-            self._ad_symbol = "addn" if not volume_diff else "avdn"
+        src = registry.source("cumulative")
 
-        elif self._symbol in ("nq", "ndx", "ndxew"):
-            self._ad_symbol = "addq" if not volume_diff else "avdq"
+        breadth = registry.lookup(self._symbol).breadth
+        if breadth is not None:
+            self._ad_symbol = breadth.issues if not volume_diff else breadth.volume
+            src = registry.source(breadth.source)
 
         self._src = src
 
@@ -51,12 +48,13 @@ class AdvanceDeclineLine(AdvanceDeclineSource, LinePlotter):
         self._height_ratio = height_ratio
 
         if self._ad_symbol is not None and self._src is not None:
-            self._ad_quotes = self._src.read(
-                    start=datetime.strptime("19000101", "%Y%m%d"),
-                    end=datetime.now(),
-                    symbol=self._ad_symbol,
-                    frequency=self._frequency,
-            ).loc[self._quotes.index[0]: self._quotes.index[-1]]
+            self._ad_quotes = shared.read(
+                    self._src,
+                    self._ad_symbol,
+                    self._frequency,
+                    start=self._quotes.index[0],
+                    end=self._quotes.index[-1],
+            )
 
     def plot(self, ax: axes.Axes) -> None:
         if self._ad_symbol is None or self._ad_quotes is None:
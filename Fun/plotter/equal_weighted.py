@@ -1,8 +1,6 @@
-from datetime import datetime
-
 import pandas as pd
-from Fun.data.barchart import Barchart
-from Fun.data.source import FREQUENCY, Yahoo
+from Fun.data import registry, shared
+from Fun.data.source import FREQUENCY
 from Fun.plotter.plotter import LinePlotter
 from Fun.utils import colors
 from matplotlib import axes
@@ -13,16 +11,12 @@ class EqualWeightedSource:
         self._symbol = symbol
 
         self._ew_symbol = None
-        src = Barchart()
+        src = registry.source("barchart")
 
-        if self._symbol in ("es", "spx"):
-            self._ew_symbol = "spxew"
-        elif self._symbol in ("nq", "ndx"):
-            self._ew_symbol = "ndxew"
-            src = Yahoo()
-        elif self._symbol in ("qr", "sml", "vle"):
-            self._ew_symbol = "smlew"
-            src = Barchart()
+        companion = registry.lookup(self._symbol).equal_weighted
+        if companion is not None:
+            self._ew_symbol = companion.symbol
+            src = registry.source(companion.source)
 
         self._src = src
 
@@ -52,12 +46,13 @@ class EqualWeightedRelativeStrength(EqualWeightedSource, LinePlotter):
         self._height_ratio = height_ratio
 
         if self._ew_symbol is not None and self._src is not None:
-            self._ew_quotes = self._src.read(
-                start=datetime.strptime("19000101", "%Y%m%d"),
-                end=datetime.now(),
-                symbol=self._ew_symbol,
-                frequency=self._frequency,
-            ).loc[self._quotes.index[0] : self._quotes.index[-1]]
+            self._ew_quotes = shared.read(
+                self._src,
+                self._ew_symbol,
+                self._frequency,
+                start=self._quotes.index[0],
+                end=self._quotes.index[-1],
+            )
 
     def plot(self, ax: axes.Axes) -> None:
         if self._ew_symbol is None or self._ew_quotes is None:
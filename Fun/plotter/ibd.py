@@ -1,8 +1,8 @@
-from datetime import datetime, timedelta
-from typing import Dict, List, NewType, Optional
+from typing import List, NewType, Optional
 
 import numpy as np
 import pandas as pd
+from Fun.data import shared
 from Fun.data.source import DAILY, FREQUENCY, Yahoo
 from Fun.plotter.plotter import TextPlotter
 from Fun.utils import colors, pretty
@@ -15,20 +15,6 @@ NEUTRAL = DAY_ACTION(2)
 
 
 class DistributionsDay(TextPlotter):
-    _dataframes = None
-
-    @classmethod
-    def _get_dataframes(cls) -> Optional[Dict[str, pd.DataFrame]]:
-        return cls._dataframes
-
-    @classmethod
-    def _init_dataframes(cls) -> None:
-        cls._dataframes = {}
-
-    @classmethod
-    def _add_dataframe(cls, key: str, dataframe: pd.DataFrame) -> None:
-        cls._dataframes[key] = dataframe
-
     def __init__(
             self,
             quotes: pd.DataFrame,
@@ -77,31 +63,23 @@ class DistributionsDay(TextPlotter):
 
         src = Yahoo()
 
-        if self._get_dataframes() is None or (
-                self._get_dataframes() is not None and len(self._get_dataframes().keys()) == 0):
-
-            print("init dataframes")
-
-            if self._get_dataframes() is None:
-                self._init_dataframes()
-
-            for symbol in self._reference_symbols:
-                self._add_dataframe(
-                        symbol,
-                        src.read(
-                                start=datetime.strptime("19000101", "%Y%m%d"),
-                                end=datetime.utcnow() + timedelta(days=2),
-                                symbol=symbol,
-                                frequency=self._frequency,
-                        ).loc[self._quotes.index[0]: self._quotes.index[-1]],
-                )
+        self._dataframes = {
+            symbol: shared.read(
+                    src,
+                    symbol,
+                    self._frequency,
+                    start=self._quotes.index[0],
+                    end=self._quotes.index[-1],
+            )
+            for symbol in self._reference_symbols
+        }
 
     def plot(self, ax: axes.Axes) -> None:
         if self._frequency != DAILY:
             return
 
         assert ax is not None
-        assert self._get_dataframes() is not None
+        assert self._dataframes is not None
 
         counts = {}
 
@@ -112,7 +90,7 @@ class DistributionsDay(TextPlotter):
             labels = []
             action = NEUTRAL
             color = self._invalid_distribution_color
-            for key, quotes in self._get_dataframes().items():
+            for key, quotes in self._dataframes.items():
                 index = self._quotes.index[x]
                 if index not in quotes.index:
                     pretty.color_print(
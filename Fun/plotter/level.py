@@ -1,4 +1,3 @@
-from datetime import datetime
 from typing import Optional
 
 import numpy as np
@@ -6,6 +5,7 @@ import pandas as pd
 from matplotlib import axes
 from matplotlib import font_manager as fm
 
+from Fun.data import shared
 from Fun.data.source import FREQUENCY
 from Fun.plotter.plotter import Plotter
 from Fun.plotter.volatility import VolatilitySource
@@ -60,12 +60,13 @@ class Level(VolatilitySource, Plotter):
 
         self._vix_quotes = None
         if self._vix_symbol is not None and self._src is not None:
-            self._vix_quotes = self._src.read(
-                start=datetime.strptime("19000101", "%Y%m%d"),
-                end=datetime.now(),
-                symbol=self._vix_symbol,
-                frequency=self._frequency,
-            ).loc[self._quotes.index[0] : self._quotes.index[-1]]
+            self._vix_quotes = shared.read(
+                self._src,
+                self._vix_symbol,
+                self._frequency,
+                start=self._quotes.index[0],
+                end=self._quotes.index[-1],
+            )
 
     def plot(self, ax: axes.Axes) -> None:
 
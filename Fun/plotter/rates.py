@@ -1,7 +1,6 @@
-from datetime import datetime
-
 # import numpy as np
 import pandas as pd
+from Fun.data import shared
 from Fun.data.barchart import Barchart
 from Fun.data.source import DAILY, FREQUENCY, MONTHLY, WEEKLY
 from Fun.plotter.plotter import Plotter
@@ -37,12 +36,13 @@ class InterestRatesSummary(Plotter):
 
         src = Barchart()
 
-        self._short_rates = src.read(
-            start=datetime.strptime("19000101", "%Y%m%d"),
-            end=datetime.now(),
-            symbol="ustm3",
-            frequency=self._frequency,
-        ).loc[self._quotes.index[0] : self._quotes.index[-1]]
+        self._short_rates = shared.read(
+            src,
+            "ustm3",
+            self._frequency,
+            start=self._quotes.index[0],
+            end=self._quotes.index[-1],
+        )
 
         # self._medium_rates = src.read(
         #     start=datetime.strptime("19000101", "%Y%m%d"),
@@ -51,12 +51,13 @@ class InterestRatesSummary(Plotter):
         #     frequency=self._frequency,
         # ).loc[self._quotes.index[0] : self._quotes.index[-1]]
 
-        self._long_rates = src.read(
-            start=datetime.strptime("19000101", "%Y%m%d"),
-            end=datetime.now(),
-            symbol="usty10",
-            frequency=self._frequency,
-        ).loc[self._quotes.index[0] : self._quotes.index[-1]]
+        self._long_rates = shared.read(
+            src,
+            "usty10",
+            self._frequency,
+            start=self._quotes.index[0],
+            end=self._quotes.index[-1],
+        )
 
     def plot(self, ax: axes.Axes) -> None:
 
@@ -1,5 +1,3 @@
-from datetime import datetime
-
 # from typing import Optional
 
 # import numpy as np
@@ -8,7 +6,8 @@ from matplotlib import axes
 
 # from matplotlib import font_manager as fm
 
-from Fun.data.source import FREQUENCY, DataSource, InvestingCom, StockCharts, Yahoo
+from Fun.data import registry, shared
+from Fun.data.source import FREQUENCY, DataSource
 from Fun.plotter.plotter import LinePlotter
 from Fun.utils import colors
 
@@ -18,37 +17,12 @@ class VolatilitySource:
         self._symbol = symbol
 
         self._vix_symbol = None
-        src: DataSource = Yahoo()
-
-        if self._symbol in ("es", "spx"):
-            self._vix_symbol = "vix"
-        elif self._symbol in ("nq", "ndx"):
-            self._vix_symbol = "vxn"
-        elif self._symbol in ("rut", "qr", "sml", "vle"):
-            self._vix_symbol = "rvx"
-            src = StockCharts()
-        elif self._symbol in ("np", "nl", "no", "nikk"):
-            self._vix_symbol = "jniv"
-            src = InvestingCom()
-        elif self._symbol in ("fx", "ezu"):
-            self._vix_symbol = "vstx"
-            src = InvestingCom()
-        elif self._symbol == "hsi":
-            self._vix_symbol = "vhsi"
-            src = InvestingCom()
-        elif self._symbol == "fxi":
-            self._vix_symbol = "vxfxi"
-            src = InvestingCom()
-        elif self._symbol == "cl":
-            self._vix_symbol = "ovx"
-        elif self._symbol == "gc":
-            self._vix_symbol = "gvz"
-        elif self._symbol in ("zn", "zt", "zf", "zb", "ge"):
-            self._vix_symbol = "vix"
-        elif self._symbol == "tj":
-            self._vix_symbol = "jniv"
-        elif self._symbol == "gg":
-            self._vix_symbol = "vstx"
+        src: DataSource = registry.source("yahoo")
+
+        companion = registry.lookup(self._symbol).volatility
+        if companion is not None:
+            self._vix_symbol = companion.symbol
+            src = registry.source(companion.source)
 
         self._src = src
 
@@ -78,12 +52,13 @@ class VolatilitySummary(VolatilitySource, LinePlotter):
         self._height_ratio = height_ratio
 
         if self._vix_symbol is not None and self._src is not None:
-            self._vix_quotes = self._src.read(
-                start=datetime.strptime("19000101", "%Y%m%d"),
-                end=datetime.now(),
-                symbol=self._vix_symbol,
-                frequency=self._frequency,
-            ).loc[self._quotes.index[0] : self._quotes.index[-1]]
+            self._vix_quotes = shared.read(
+                self._src,
+                self._vix_symbol,
+                self._frequency,
+                start=self._quotes.index[0],
+                end=self._quotes.index[-1],
+            )
 
     def plot(self, ax: axes.Axes) -> None:
         if self._vix_symbol is None or self._vix_quotes is None:
@@ -142,12 +117,13 @@ class VolatilityRealBodyContraction(VolatilitySource, LinePlotter):
         self._height_ratio = height_ratio
 
         if self._vix_symbol is not None and self._src is not None:
-            self._vix_quotes = self._src.read(
-                start=datetime.strptime("19000101", "%Y%m%d"),
-                end=datetime.now(),
-                symbol=self._vix_symbol,
-                frequency=self._frequency,
-            ).loc[self._quotes.index[0] : self._quotes.index[-1]]
+            self._vix_quotes = shared.read(
+                self._src,
+                self._vix_symbol,
+                self._frequency,
+                start=self._quotes.index[0],
+                end=self._quotes.index[-1],
+            )
 
     def plot(self, ax: axes.Axes) -> None:
         if self._vix_symbol is None or self._vix_quotes is None:
@@ -0,0 +1,57 @@
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from Fun.utils import colors, pretty
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def compare(
+    title: str,
+    baseline: Callable[[], Any],
+    candidate: Callable[[], Any],
+    repeat: int = 5,
+    memory: bool = False,
+) -> float:
+    b = measure(baseline, repeat=repeat)
+    c = measure(candidate, repeat=repeat)
+
+    speedup = b / c if c > 0 else float("inf")
+
+    pretty.color_print(colors.PAPER_CYAN_300, title)
+    pretty.color_print(colors.PAPER_AMBER_300, f"baseline: {b * 1000.0:.3f} ms")
+    pretty.color_print(colors.PAPER_LIGHT_GREEN_300, f"candidate: {c * 1000.0:.3f} ms")
+    pretty.color_print(colors.PAPER_LIGHT_BLUE_300, f"speedup: {speedup:.2f}x")
+
+    if memory:
+        mb = peak_memory(baseline) / 1024.0 / 1024.0
+        mc = peak_memory(candidate) / 1024.0 / 1024.0
+
+        pretty.color_print(colors.PAPER_AMBER_300, f"baseline peak: {mb:.2f} MiB")
+        pretty.color_print(
+            colors.PAPER_LIGHT_GREEN_300, f"candidate peak: {mc:.2f} MiB"
+        )
+
+    return speedup
@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class MemoryLRU:
+    def __init__(
+        self,
+        capacity: int,
+        sizeof: Callable[[Any], int] = lambda _: 1,
+    ) -> None:
+        assert capacity >= 0
+
+        self._capacity = capacity
+        self._sizeof = sizeof
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(
+        self, key: Hashable, valid: Optional[Callable[[Any], bool]] = None
+    ) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            # outdated values are dropped and reported as misses
+            if entry is not None and valid is not None and not valid(entry[0]):
+                del self._entries[key]
+                self._size -= entry[1]
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+
+            # a value larger than the whole budget is never kept
+            if size > self._capacity:
+                return
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            while self._size > self._capacity:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self._evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def statistic(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
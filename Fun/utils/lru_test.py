@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from Fun.utils.lru import MemoryLRU
+
+
+class TestMemoryLRU(unittest.TestCase):
+    def test_eviction(self):
+        lru = MemoryLRU(10, sizeof=len)
+
+        lru.put("a", "xxxx")
+        lru.put("b", "xxxx")
+
+        self.assertEqual(lru.get("a"), "xxxx")
+
+        # b is the least recently used entry
+        lru.put("c", "xxxx")
+
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), "xxxx")
+        self.assertEqual(lru.get("c"), "xxxx")
+
+        statistic = lru.statistic()
+        self.assertEqual(statistic["hits"], 3)
+        self.assertEqual(statistic["misses"], 1)
+        self.assertEqual(statistic["evictions"], 1)
+        self.assertEqual(statistic["size"], 8)
+
+    def test_oversized(self):
+        lru = MemoryLRU(3, sizeof=len)
+
+        lru.put("a", "xxxx")
+
+        self.assertEqual(len(lru), 0)
+        self.assertEqual(lru.statistic()["size"], 0)
+
+    def test_valid(self):
+        lru = MemoryLRU(10)
+
+        lru.put("a", 1)
+
+        self.assertIsNone(lru.get("a", valid=lambda x: x == 2))
+        self.assertIsNone(lru.peek("a"))
+        self.assertEqual(lru.statistic()["misses"], 1)
+
+    def test_threads(self):
+        lru = MemoryLRU(64)
+
+        def work(n):
+            for i in range(1000):
+                lru.put((n, i % 100), i)
+                lru.get((n, (i * 7) % 100))
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        statistic = lru.statistic()
+        self.assertEqual(statistic["entries"], 64)
+        self.assertEqual(statistic["size"], 64)
+        self.assertEqual(statistic["hits"] + statistic["misses"], 8000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,23 @@
 import functools
-from typing import Any, Dict, List
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest import mock
+from urllib.parse import parse_qsl, urlsplit
 
+import numpy as np
+import pandas as pd
+from Fun.data.cache import FrameCache
+from Fun.data.source import DataSource
+from Fun.futures.catalog import ContractCatalog
+from Fun.futures.contract import Contract, ContractCache
 from Fun.utils import colors, pretty
 
 
@@ -27,3 +44,349 @@ def parameterized(sets: List[Dict[str, Any]]):
         return wrapper_testing
 
     return testing
+
+
+class HomeTestCase(unittest.TestCase):
+    # every test runs in a temporary HOME of its own, with empty quote,
+    # contract and catalog caches in place of the shared ones
+    _environ: Dict[str, str] = {}
+
+    # the size of the quote cache, None for the default
+    _cache_capacity: Optional[int] = None
+
+    def setUp(self) -> None:
+        self._home = tempfile.TemporaryDirectory()
+        self.addCleanup(self._home.cleanup)
+
+        self._patch(
+            mock.patch.dict(os.environ, {"HOME": self._home.name, **self._environ})
+        )
+
+        cache = FrameCache()
+        if self._cache_capacity is not None:
+            cache = FrameCache(capacity=self._cache_capacity)
+
+        self._patch(mock.patch.object(DataSource, "_cache", cache))
+        self._patch(mock.patch.object(Contract, "_cache", ContractCache()))
+        self._patch(mock.patch.object(Contract, "_catalog", ContractCatalog()))
+
+    def _patch(self, patcher: Any) -> None:
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+def random_quotes(
+    start: str = "20000103",
+    periods: int = 1000,
+    freq: str = "B",
+    seed: int = 0,
+) -> pd.DataFrame:
+    rand = np.random.RandomState(seed)
+
+    index = pd.date_range(
+        datetime.strptime(start, "%Y%m%d"), periods=periods, freq=freq
+    )
+
+    close = 100.0 * np.exp(np.cumsum(rand.normal(0, 0.01, periods)))
+    opens = close * np.exp(rand.normal(0, 0.005, periods))
+    high = np.maximum(opens, close) * np.exp(np.abs(rand.normal(0, 0.005, periods)))
+    low = np.minimum(opens, close) * np.exp(-np.abs(rand.normal(0, 0.005, periods)))
+
+    df = pd.DataFrame(
+        {
+            "open": np.round(opens, 2),
+            "high": np.round(high, 2),
+            "low": np.round(low, 2),
+            "close": np.round(close, 2),
+            "volume": rand.randint(1, 100000, periods).astype(np.float64),
+            "open interest": rand.randint(1, 100000, periods).astype(np.float64),
+        },
+        index=index,
+    )
+
+    df.index.name = "timestamp"
+
+    return df
+
+
+def write_yahoo(root: str, symbol: str, df: pd.DataFrame) -> str:
+    path = os.path.join(root, "Documents", "data_source", "yahoo", f"{symbol}.csv")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    out = pd.DataFrame(
+        {
+            "Date": df.index.strftime("%Y-%m-%d"),
+            "Open": df.loc[:, "open"].values,
+            "High": df.loc[:, "high"].values,
+            "Low": df.loc[:, "low"].values,
+            "Close": df.loc[:, "close"].values,
+            "Adj Close": df.loc[:, "close"].values,
+            "Volume": df.loc[:, "volume"].values,
+        }
+    )
+
+    out.to_csv(path, index=False)
+
+    return path
+
+
+def write_barchart(
+    root: str, directory: str, symbol: str, df: pd.DataFrame, intraday: bool = False
+) -> str:
+    path = os.path.join(root, "Documents", "data_source", directory, f"{symbol}.csv")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fmt = "%m/%d/%Y %H:%M" if intraday else "%m/%d/%Y"
+
+    out = pd.DataFrame(
+        {
+            "Time": df.index.strftime(fmt),
+            "Open": df.loc[:, "open"].values,
+            "High": df.loc[:, "high"].values,
+            "Low": df.loc[:, "low"].values,
+            "Last": df.loc[:, "close"].values,
+            "Change": 0.0,
+            "%Chg": "0.00%",
+            "Volume": df.loc[:, "volume"].values,
+            "Open Int": df.loc[:, "open interest"].values,
+        }
+    )
+
+    with open(path, "w") as f:
+        f.write(out.to_csv(index=False))
+        f.write('"Downloaded from Barchart.com as of 01-05-2021 04:32pm CST"\n')
+
+    return path
+
+
+def write_coinapi(
+    root: str, directory: str, page: str, df: pd.DataFrame, period: str = "1DAY"
+) -> str:
+    path = os.path.join(
+        root, "Documents", "data_source", "coinapi", directory, f"{page}.json"
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fmt = "%Y-%m-%dT%H:%M:%S.0000000Z"
+    ends = df.index + pd.tseries.frequencies.to_offset(period.replace("DAY", "D"))
+
+    out = pd.DataFrame(
+        {
+            "time_period_start": df.index.strftime(fmt),
+            "time_period_end": ends.strftime(fmt),
+            "time_open": df.index.strftime(fmt),
+            "time_close": ends.strftime(fmt),
+            "price_open": df.loc[:, "open"].values,
+            "price_high": df.loc[:, "high"].values,
+            "price_low": df.loc[:, "low"].values,
+            "price_close": df.loc[:, "close"].values,
+            "volume_traded": df.loc[:, "volume"].values,
+            "trades_count": df.loc[:, "volume"].values.astype(np.int64),
+        }
+    )
+
+    out.to_json(path, orient="records")
+
+    return path
+
+
+def write_stockcharts(root: str, symbol: str, df: pd.DataFrame) -> str:
+    path = os.path.join(
+        root, "Documents", "data_source", "stockcharts", f"{symbol}.txt"
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    columns = ("Day", "Date", "Open", "High", "Low", "Close", "Volume")
+    widths = (6, 10, 10, 10, 10, 10, 12)
+
+    with open(path, "w") as f:
+        f.write("  ".join(c.rjust(w) for c, w in zip(columns, widths)) + "\n")
+        f.write("  ".join("-" * w for w in widths) + "\n")
+
+        for t, row in df.iterrows():
+            values = (
+                t.strftime("%a"),
+                t.strftime("%m-%d-%Y"),
+                f"{row['open']:.2f}",
+                f"{row['high']:.2f}",
+                f"{row['low']:.2f}",
+                f"{row['close']:.2f}",
+                f"{int(row['volume'])}",
+            )
+            f.write("  ".join(v.rjust(w) for v, w in zip(values, widths)) + "\n")
+
+    return path
+
+
+def write_contracts(
+    root: str,
+    symbol: str,
+    expirations: Dict[str, str],
+    periods: int = 190,
+    seed: int = 0,
+    minutes: Optional[int] = None,
+) -> List[str]:
+    # one barchart file per contract, each trading for the given number of
+    # business days, or bars of the given minutes, up to its expiration with
+    # its own price level
+    paths = []
+
+    for i, (code, expiration) in enumerate(sorted(expirations.items())):
+        if minutes is None:
+            start = pd.bdate_range(end=expiration, periods=periods)[0]
+            df = random_quotes(
+                start=start.strftime("%Y%m%d"), periods=periods, seed=seed + i
+            )
+        else:
+            start = pd.Timestamp(expiration) - pd.Timedelta(minutes=minutes * periods)
+            df = random_quotes(
+                start=start.strftime("%Y%m%d"),
+                periods=periods,
+                freq=f"{minutes}min",
+                seed=seed + i,
+            )
+
+        df.loc[:, ["open", "high", "low", "close"]] *= 1.0 + 0.01 * i
+
+        directory = symbol if minutes is None else f"{symbol}@{minutes}m"
+
+        paths.append(
+            write_barchart(
+                root,
+                os.path.join("continuous", directory),
+                code,
+                df,
+                intraday=minutes is not None,
+            )
+        )
+
+    return paths
+
+
+def alphavantage_csv(df: pd.DataFrame) -> bytes:
+    # alpha vantage answers with the newest row first
+    out = pd.DataFrame(
+        {
+            "timestamp": df.index.strftime("%Y-%m-%d"),
+            "open": df.loc[:, "open"].values,
+            "high": df.loc[:, "high"].values,
+            "low": df.loc[:, "low"].values,
+            "close": df.loc[:, "close"].values,
+            "volume": df.loc[:, "volume"].values,
+        }
+    )
+
+    return out.iloc[::-1].to_csv(index=False).encode("utf-8")
+
+
+class StandInServer:
+    # a local http server answering with fixtures, with etag and
+    # last-modified revalidation, so remote sources can be exercised offline
+    def __init__(
+        self,
+        fixtures: Callable[[str, Dict[str, str]], Optional[bytes]],
+        failures: int = 0,
+    ) -> None:
+        self._fixtures = fixtures
+
+        # the first requests are answered with a server error
+        self._failures = failures
+
+        self._lock = threading.Lock()
+        self._requests: List[Tuple[str, Dict[str, str], int]] = []
+
+        self._last_modified = formatdate(time.time(), usegmt=True)
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StandInServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                params = dict(parse_qsl(parts.query))
+
+                status, body = server._answer(parts.path, params, self.headers)
+
+                self.send_response(status)
+                if status in (200, 304):
+                    self.send_header("ETag", server._etag(body))
+                    self.send_header("Last-Modified", server._last_modified)
+
+                self.send_header(
+                    "Content-Length", str(len(body) if status == 200 else 0)
+                )
+                self.end_headers()
+
+                if status == 200:
+                    self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        assert self._server is not None and self._thread is not None
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def url(self, path: str = "/") -> str:
+        assert self._server is not None
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def _etag(self, body: bytes) -> str:
+        return f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def _answer(
+        self, path: str, params: Dict[str, str], headers: Any
+    ) -> Tuple[int, bytes]:
+        with self._lock:
+            failing = self._failures > 0
+            if failing:
+                self._failures -= 1
+
+        body = b""
+
+        if failing:
+            status = 503
+        else:
+            fixture = self._fixtures(path, params)
+
+            if fixture is None:
+                status = 404
+            else:
+                body = fixture
+
+                if headers.get("If-None-Match") == self._etag(body):
+                    status = 304
+                elif (
+                    headers.get("If-None-Match") is None
+                    and headers.get("If-Modified-Since") == self._last_modified
+                ):
+                    status = 304
+                else:
+                    status = 200
+
+        with self._lock:
+            self._requests.append((path, params, status))
+
+        return status, body
+
+    def requests(self) -> List[Tuple[str, Dict[str, str], int]]:
+        with self._lock:
+            return list(self._requests)
@@ -0,0 +1,209 @@
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, TextIO
+
+# upper bounds of the histogram buckets in milliseconds, the last bucket
+# takes everything slower
+BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+
+class Span:
+    def __init__(self, name: str, attributes: Dict[str, Any]) -> None:
+        self._name = name
+        self._attributes = attributes
+
+        self._timestamp = 0.0
+        self._start = 0.0
+        self._duration = 0.0
+
+        self._children: List[Span] = []
+
+    def name(self) -> str:
+        return self._name
+
+    def duration(self) -> float:
+        return self._duration
+
+    def children(self) -> List["Span"]:
+        return self._children
+
+    def set(self, **attributes: Any) -> None:
+        self._attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self._name,
+            "timestamp": self._timestamp,
+            "duration": round(self._duration * 1000.0, 3),
+            "attributes": {k: str(v) for k, v in self._attributes.items()},
+            "children": [c.to_dict() for c in self._children],
+        }
+
+
+class _NoSpan:
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        self.maximum = max(self.maximum, ms)
+        self.buckets[bisect.bisect_left(BUCKETS, ms)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b:g}ms" for b in BUCKETS] + [f">{BUCKETS[-1]:g}ms"]
+
+        return {
+            "count": self.count,
+            "total": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count > 0 else 0.0,
+            "max": round(self.maximum, 3),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class _ActiveSpan:
+    def __init__(self, recorder: "Recorder", span: Span) -> None:
+        self._recorder = recorder
+        self._span = span
+
+    def __enter__(self) -> Span:
+        self._recorder._push(self._span)
+        return self._span
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        if exc_type is not None:
+            self._span.set(error=exc_type.__name__)
+
+        self._recorder._pop(self._span)
+
+
+class Recorder:
+    def __init__(self, capacity: int = 64) -> None:
+        self._enabled = False
+        self._log: Optional[TextIO] = None
+
+        self._local = threading.local()
+
+        self._lock = threading.Lock()
+        self._trees: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._histograms: Dict[str, _Histogram] = {}
+
+    def enable(self, log: Optional[TextIO] = None) -> None:
+        self._log = log
+        self._enabled = True
+
+    def disable(self) -> None:
+        self._enabled = False
+        self._log = None
+
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        # a disabled recorder hands out one shared span doing nothing at all
+        if not self._enabled:
+            return _NO_SPAN
+
+        return _ActiveSpan(self, Span(name, attributes))
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+
+        return stack
+
+    def _push(self, span: Span) -> None:
+        stack = self._stack()
+
+        if len(stack) > 0:
+            stack[-1]._children.append(span)
+
+        stack.append(span)
+
+        span._timestamp = time.time()
+        span._start = time.perf_counter()
+
+    def _pop(self, span: Span) -> None:
+        span._duration = time.perf_counter() - span._start
+
+        stack = self._stack()
+        assert len(stack) > 0 and stack[-1] is span
+
+        stack.pop()
+
+        with self._lock:
+            histogram = self._histograms.get(span._name)
+            if histogram is None:
+                histogram = _Histogram()
+                self._histograms[span._name] = histogram
+
+            histogram.add(span._duration * 1000.0)
+
+        # only the outermost span of a thread makes up a timing tree
+        if len(stack) > 0:
+            return
+
+        tree = span.to_dict()
+
+        with self._lock:
+            self._trees.append(tree)
+
+        if self._log is not None:
+            self._log.write(json.dumps(tree) + "\n")
+            self._log.flush()
+
+    def trees(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._trees)
+
+    def histogram(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {k: v.to_dict() for k, v in sorted(self._histograms.items())}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._trees.clear()
+            self._histograms.clear()
+
+
+_recorder = Recorder()
+
+# FUN_TIMING=1 records spans, FUN_TIMING=log also writes every timing tree
+# as a json line to stderr
+if os.getenv("FUN_TIMING") == "log":
+    _recorder.enable(log=sys.stderr)
+elif os.getenv("FUN_TIMING") is not None:
+    _recorder.enable()
+
+
+def recorder() -> Recorder:
+    return _recorder
+
+
+def span(name: str, **attributes: Any) -> Any:
+    return _recorder.span(name, **attributes)
@@ -0,0 +1,130 @@
+import io
+import json
+import threading
+import unittest
+from datetime import datetime
+
+from Fun.data.source import DAILY, WEEKLY, Yahoo
+from Fun.utils import timing
+from Fun.utils.testing import HomeTestCase, random_quotes, write_yahoo
+
+
+def _names(tree):
+    return [tree["name"]] + [n for c in tree["children"] for n in _names(c)]
+
+
+class TestTiming(unittest.TestCase):
+    def test_disabled(self):
+        recorder = timing.Recorder()
+
+        with recorder.span("read") as span:
+            span.set(hit=True)
+
+        self.assertIs(recorder.span("read"), recorder.span("parse"))
+        self.assertListEqual(recorder.trees(), [])
+        self.assertDictEqual(recorder.histogram(), {})
+
+    def test_tree(self):
+        log = io.StringIO()
+
+        recorder = timing.Recorder()
+        recorder.enable(log=log)
+
+        with recorder.span("request", symbol="es"):
+            for _ in range(2):
+                with recorder.span("read") as span:
+                    span.set(hit=False)
+                    with recorder.span("parse"):
+                        pass
+
+        trees = recorder.trees()
+        self.assertEqual(len(trees), 1)
+
+        tree = trees[0]
+        self.assertEqual(tree["attributes"], {"symbol": "es"})
+        self.assertListEqual(
+            _names(tree), ["request", "read", "parse", "read", "parse"]
+        )
+        self.assertEqual(tree["children"][0]["attributes"], {"hit": "False"})
+        self.assertGreaterEqual(
+            tree["duration"], sum(c["duration"] for c in tree["children"])
+        )
+
+        self.assertDictEqual(json.loads(log.getvalue()), tree)
+
+        histogram = recorder.histogram()
+        self.assertListEqual(list(histogram.keys()), ["parse", "read", "request"])
+        self.assertEqual(histogram["read"]["count"], 2)
+        self.assertEqual(sum(histogram["parse"]["buckets"].values()), 2)
+
+    def test_error(self):
+        recorder = timing.Recorder()
+        recorder.enable()
+
+        with self.assertRaises(ValueError):
+            with recorder.span("read"):
+                raise ValueError("missing")
+
+        self.assertEqual(recorder.trees()[0]["attributes"], {"error": "ValueError"})
+
+        # the stack is unwound, the next span is a tree of its own
+        with recorder.span("render"):
+            pass
+
+        self.assertEqual(len(recorder.trees()), 2)
+
+    def test_threads(self):
+        recorder = timing.Recorder()
+        recorder.enable()
+
+        def work():
+            with recorder.span("request"):
+                with recorder.span("read"):
+                    pass
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        trees = recorder.trees()
+        self.assertEqual(len(trees), 8)
+        for tree in trees:
+            self.assertListEqual(_names(tree), ["request", "read"])
+
+
+class TestReadTiming(HomeTestCase):
+    def setUp(self):
+        super().setUp()
+
+        write_yahoo(self._home.name, "spx", random_quotes())
+
+        timing.recorder().clear()
+        timing.recorder().enable()
+
+    def tearDown(self):
+        timing.recorder().disable()
+        timing.recorder().clear()
+
+    def test_read(self):
+        start = datetime(1900, 1, 1)
+        end = datetime(2100, 1, 1)
+
+        Yahoo().read(start, end, "spx", WEEKLY)
+        Yahoo().read(start, end, "spx", DAILY, use_cache=False)
+
+        parsed, uncached = timing.recorder().trees()
+
+        self.assertEqual(parsed["attributes"]["symbol"], "spx")
+        self.assertListEqual(
+            _names(parsed),
+            ["read", "cache", "read_data", "timestamp", "resample", "nan", "store"],
+        )
+        self.assertListEqual(
+            _names(uncached), ["read", "read_data", "timestamp", "nan"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
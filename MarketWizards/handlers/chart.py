@@ -21,6 +21,7 @@ from Fun.plotter.plotter import Plotter
 from Fun.plotter.records import LeverageRecords
 from Fun.plotter.stop import StopOrder
 from Fun.trading.agent import TradingAgent
+from Fun.utils import timing
 
 
 class ChartHandler:
@@ -317,6 +318,15 @@ class ChartHandler:
         return preset.chart_range()
 
     def response(self) -> Any:
+        with timing.span(
+            "request",
+            function=self._function,
+            symbol=self._symbol,
+            frequency=self._frequency,
+        ):
+            return self._response()
+
+    def _response(self) -> Any:
         if self._function == "simple":
             buf = self._function_simple()
         elif self._function == "slice":
@@ -4,7 +4,7 @@ import traceback
 from flask import Flask
 from flask_cors import cross_origin
 
-from Fun.utils import colors, pretty
+from Fun.utils import colors, pretty, timing
 from MarketWizards.handlers.chart import ChartHandler
 from MarketWizards.handlers.trade import TradeHandler
 
@@ -58,6 +58,18 @@ def trade_statistic():
         return {"error": f"{type(err)}: {err}"}
 
 
+@app.route("/service/timing", methods=["GET"])
+@cross_origin(allow_headers=["Content-Type"])
+def timing_report():
+    # empty unless the server runs with FUN_TIMING set
+    recorder = timing.recorder()
+
+    return {
+        "requests": recorder.trees(),
+        "histogram": recorder.histogram(),
+    }
+
+
 if __name__ == "__main__":
     # app.run(debug=True, threaded=True, host="192.168.0.11")
     app.run(debug=True, threaded=True)